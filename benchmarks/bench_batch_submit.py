@@ -0,0 +1,110 @@
+"""Benchmark: per-request submissions vs POST /submissions/batch.
+
+Usage:
+    uv run python benchmarks/bench_batch_submit.py --attempts 500 --questions 20
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from quli_quiz.api import models
+from quli_quiz.api.database import Base, get_db
+from quli_quiz.api.main import app
+
+
+def seed_quiz(session_factory, num_questions: int) -> int:
+    """Store a quiz directly through the ORM and return its ID."""
+    db = session_factory()
+    try:
+        quiz = models.QuizModel(topic="Bench", config={"topic": "Bench"})
+        db.add(quiz)
+        db.flush()
+        for position in range(num_questions):
+            question = models.QuestionModel(
+                content_hash=f"bench-{position}",
+                question_text=f"Question {position}?",
+                question_type="multiple_choice",
+                options=["A1", "A2", "A3", "A4"],
+                correct_answer="A2",
+                difficulty="medium",
+            )
+            db.add(question)
+            db.flush()
+            db.add(
+                models.QuizQuestionLink(quiz_id=quiz.id, position=position, question_id=question.id)
+            )
+        db.commit()
+        return quiz.id
+    finally:
+        db.close()
+
+
+def make_attempts(num_attempts: int, num_questions: int) -> list[list[dict]]:
+    rng = random.Random(0)
+    return [
+        [
+            {"question_index": i, "answer": rng.choice(["A1", "A2", "b"]), "time_taken": 1.0}
+            for i in range(num_questions)
+        ]
+        for _ in range(num_attempts)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--attempts", type=int, default=500)
+    parser.add_argument("--questions", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # A file-backed database so commit (fsync) cost is part of the measurement
+        engine = create_engine(
+            f"sqlite:///{Path(tmp) / 'bench.db'}", connect_args={"check_same_thread": False}
+        )
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        Base.metadata.create_all(bind=engine)
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+
+        quiz_id = seed_quiz(session_factory, args.questions)
+        attempts = make_attempts(args.attempts, args.questions)
+
+        start = time.perf_counter()
+        for answers in attempts:
+            client.post(f"/quizzes/{quiz_id}/submit", json={"answers": answers})
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = client.post(
+            "/submissions/batch",
+            json={"submissions": [{"quiz_id": quiz_id, "answers": a} for a in attempts]},
+        )
+        batch = time.perf_counter() - start
+        assert response.status_code == 200
+
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+    print(f"{args.attempts} attempts x {args.questions} questions")
+    print(f"  per-request submit : {single:8.3f}s  {args.attempts / single:10.1f} attempts/s")
+    print(f"  batch submit       : {batch:8.3f}s  {args.attempts / batch:10.1f} attempts/s")
+    print(f"  speedup            : {single / batch:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
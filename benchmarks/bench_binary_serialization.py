@@ -0,0 +1,62 @@
+"""Benchmark: binary encoding vs Pydantic JSON for quizzes and results.
+
+Compares message size and encode/decode time of quli_quiz.serialization against
+model_dump_json / model_validate_json, for a Quiz and a QuizResult with explanations.
+
+Usage:
+    uv run python benchmarks/bench_binary_serialization.py --questions 50 --repeat 2000
+"""
+
+import argparse
+import time
+
+from bench_serialization import build_payloads
+
+from quli_quiz import serialization
+from quli_quiz.models import Quiz, QuizResult
+
+
+def time_per_call(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def compare(name: str, obj, repeat: int) -> None:
+    cls = type(obj)
+    binary = serialization.dumps(obj)
+    json = obj.model_dump_json()
+    assert serialization.loads(binary) == obj == cls.model_validate_json(json)
+
+    print(name)
+    print(f"  size   : binary {len(binary):8,} B   json {len(json.encode()):8,} B")
+    print(
+        f"  encode : binary {time_per_call(lambda: serialization.dumps(obj), repeat):8.1f} µs"
+        f"  json {time_per_call(obj.model_dump_json, repeat):8.1f} µs"
+    )
+    print(
+        f"  decode : binary {time_per_call(lambda: serialization.loads(binary), repeat):8.1f} µs"
+        f"  json {time_per_call(lambda: cls.model_validate_json(json), repeat):8.1f} µs"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    quiz_read, result_read = build_payloads(args.questions)
+    # The API schemas add ids; compare on the core models caches and snapshots store
+    quiz = Quiz.model_validate(quiz_read.model_dump(exclude={"id"}))
+    result = QuizResult.model_validate(result_read.model_dump(exclude={"id"}))
+    result.quiz = quiz
+
+    compare(f"Quiz with {args.questions} questions", quiz, args.repeat)
+    compare(f"QuizResult with {args.questions} questions and answers", result, args.repeat)
+    compare("Single question", quiz.questions[0], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
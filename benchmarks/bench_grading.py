@@ -0,0 +1,140 @@
+"""Benchmark: answers graded per second.
+
+Compares per-call normalization with a compiled answer key, then grading whole answer
+sheets through QuizEngine with NumPy bulk grading (grade_batch).
+
+Usage:
+    uv run python benchmarks/bench_grading.py --questions 50 --answers 200000 --sheets 20000
+"""
+
+import argparse
+import random
+import time
+
+from quli_quiz.engine import QuizEngine
+from quli_quiz.grading import AnswerKey, grade_batch
+from quli_quiz.models import Difficulty, Question, QuestionType, Quiz, QuizConfig
+
+
+def legacy_check_answer(question: Question, answer: str) -> bool:
+    """The grading logic used before answer keys, kept here as the baseline."""
+    correct = question.correct_answer.strip().lower()
+    user_answer = answer.strip().lower()
+    if question.question_type.value == "multiple_choice":
+        if user_answer == correct:
+            return True
+        option_letters = ["a", "b", "c", "d"]
+        if user_answer in option_letters:
+            option_index = option_letters.index(user_answer)
+            if option_index < len(question.options):
+                return question.options[option_index].strip().lower() == correct
+    elif question.question_type.value == "true_false":
+        return user_answer == correct
+    return False
+
+
+def build_quiz(num_questions: int) -> Quiz:
+    questions = []
+    for i in range(num_questions):
+        if i % 4 == 3:
+            questions.append(
+                Question(
+                    question_text=f"Statement {i} is true.",
+                    question_type=QuestionType.TRUE_FALSE,
+                    options=["True", "False"],
+                    correct_answer="True",
+                    difficulty=Difficulty.EASY,
+                )
+            )
+        else:
+            options = [f"Option {c} for question {i}" for c in "ABCD"]
+            questions.append(
+                Question(
+                    question_text=f"Question {i}?",
+                    question_type=QuestionType.MULTIPLE_CHOICE,
+                    options=options,
+                    correct_answer=options[1],
+                    difficulty=Difficulty.MEDIUM,
+                )
+            )
+    return Quiz(
+        topic="Bench",
+        questions=questions,
+        config=QuizConfig(topic="Bench", num_questions=num_questions),
+    )
+
+
+def make_answers(quiz: Quiz, count: int) -> list[tuple[int, str]]:
+    rng = random.Random(0)
+    answers = []
+    for _ in range(count):
+        index = rng.randrange(len(quiz.questions))
+        question = quiz.questions[index]
+        answers.append((index, rng.choice([*question.options, "b", "C", " true "])))
+    return answers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--answers", type=int, default=200_000)
+    parser.add_argument("--sheets", type=int, default=20_000)
+    args = parser.parse_args()
+
+    quiz = build_quiz(args.questions)
+    answers = make_answers(quiz, args.answers)
+    questions = quiz.questions
+
+    start = time.perf_counter()
+    legacy = [legacy_check_answer(questions[i], answer) for i, answer in answers]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    key = AnswerKey.from_quiz(quiz)
+    compile_time = time.perf_counter() - start
+
+    compiled_questions = key.questions
+    start = time.perf_counter()
+    compiled = [compiled_questions[i].is_correct(answer) for i, answer in answers]
+    compiled_time = time.perf_counter() - start
+
+    assert compiled == legacy, "compiled key disagrees with the legacy grader"
+
+    print(f"{args.answers} answers over {args.questions} questions")
+    print(f"  per-call normalization : {args.answers / legacy_time:12,.0f} answers/s")
+    print(
+        f"  compiled answer key    : {args.answers / compiled_time:12,.0f} answers/s"
+        f"  (compiled in {compile_time * 1e6:.0f}µs)"
+    )
+    print(f"  speedup                : {legacy_time / compiled_time:8.1f}x")
+
+    rng = random.Random(1)
+    sheets = [
+        [rng.choice([*question.options, "b", None]) or "" for question in questions]
+        for _ in range(args.sheets)
+    ]
+    total = args.sheets * args.questions
+
+    start = time.perf_counter()
+    engine_scores = []
+    for sheet in sheets:
+        engine = QuizEngine(quiz)
+        for answer in sheet:
+            engine.submit_answer(answer)
+        engine_scores.append(engine.get_result().score)
+    engine_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grades = grade_batch(key, sheets)
+    batch_time = time.perf_counter() - start
+
+    assert grades.scores.tolist() == engine_scores, "grade_batch disagrees with QuizEngine"
+
+    print(f"\n{args.sheets} answer sheets x {args.questions} questions")
+    print(f"  QuizEngine per answer  : {total / engine_time:12,.0f} answers/s")
+    print(f"  grade_batch (NumPy)    : {total / batch_time:12,.0f} answers/s")
+    print(f"  speedup                : {engine_time / batch_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark: concurrent POST /quizzes/{id}/submit with and without group commit.
+
+Usage:
+    uv run python benchmarks/bench_group_commit.py --attempts 400 --clients 32
+"""
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+from bench_batch_submit import make_attempts, seed_quiz
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from quli_quiz.api import group_commit
+from quli_quiz.api.database import Base, get_db
+from quli_quiz.api.main import app
+
+
+def run(client: TestClient, quiz_id: int, attempts: list[list[dict]], clients: int) -> float:
+    def submit(answers: list[dict]) -> None:
+        response = client.post(f"/quizzes/{quiz_id}/submit", json={"answers": answers})
+        assert response.status_code == 200, response.text
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(submit, attempts))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--attempts", type=int, default=400)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--delay-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # A file-backed database so commit (fsync) cost is part of the measurement
+        engine = create_engine(
+            f"sqlite:///{Path(tmp) / 'bench.db'}",
+            connect_args={"check_same_thread": False, "timeout": 30},
+        )
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        Base.metadata.create_all(bind=engine)
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+
+        quiz_id = seed_quiz(session_factory, args.questions)
+        attempts = make_attempts(args.attempts, args.questions)
+
+        single = run(client, quiz_id, attempts, args.clients)
+
+        writer = group_commit.GroupCommitWriter(session_factory, max_delay=args.delay_ms / 1000)
+        writer.start()
+        try:
+            with patch.object(group_commit, "writer", writer):
+                grouped = run(client, quiz_id, attempts, args.clients)
+        finally:
+            writer.stop()
+
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+    print(f"{args.attempts} attempts x {args.questions} questions, {args.clients} clients")
+    print(f"  commit per request : {single:8.3f}s  {args.attempts / single:10.1f} attempts/s")
+    print(f"  group commit       : {grouped:8.3f}s  {args.attempts / grouped:10.1f} attempts/s")
+    print(f"  speedup            : {single / grouped:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark: memory of a large question pool, list[Question] vs QuestionPack.
+
+Memory is measured with tracemalloc as the growth in traced allocations while each
+pool is alive. Questions share options the way generated quizzes do (true/false
+options, recurring answer choices), which interning stores once.
+
+Usage:
+    uv run python benchmarks/bench_question_pack.py --questions 1000000
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from quli_quiz.models import Difficulty, Question, QuestionType
+from quli_quiz.pack import QuestionPack
+
+
+def make_questions(count: int):
+    rng = random.Random(0)
+    difficulties = list(Difficulty)
+    for i in range(count):
+        if i % 4 == 3:
+            yield Question(
+                question_text=f"Statement number {i} about the topic is true.",
+                question_type=QuestionType.TRUE_FALSE,
+                options=["True", "False"],
+                correct_answer=rng.choice(["True", "False"]),
+                difficulty=rng.choice(difficulties),
+            )
+        else:
+            options = [f"Choice {rng.randrange(5000)}" for _ in range(4)]
+            yield Question(
+                question_text=f"Which choice answers question number {i}?",
+                question_type=QuestionType.MULTIPLE_CHOICE,
+                options=options,
+                correct_answer=rng.choice(options),
+                difficulty=rng.choice(difficulties),
+                explanation=f"Explained in section {i % 100}." if i % 2 else None,
+            )
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    pool = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return pool, size, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=1_000_000)
+    parser.add_argument("--reads", type=int, default=100_000)
+    args = parser.parse_args()
+
+    questions, list_size, list_time = measure(lambda: list(make_questions(args.questions)))
+    pack, pack_size, pack_time = measure(lambda: QuestionPack.from_questions(questions))
+
+    rng = random.Random(1)
+    indices = [rng.randrange(args.questions) for _ in range(args.reads)]
+    assert all(pack[i] == questions[i] for i in indices[:1000]), "pack differs from the list"
+
+    start = time.perf_counter()
+    for i in indices:
+        pack[i]
+    read_time = time.perf_counter() - start
+
+    print(f"{args.questions:,} questions")
+    print(f"  list[Question] : {list_size / 2**20:10,.1f} MiB  (built in {list_time:.1f}s)")
+    print(
+        f"  QuestionPack   : {pack_size / 2**20:10,.1f} MiB  (packed in {pack_time:.1f}s,"
+        f" {pack.nbytes / 2**20:,.1f} MiB of arrays)"
+    )
+    print(f"  reduction      : {list_size / pack_size:8.1f}x")
+    print(f"  random access  : {args.reads / read_time:10,.0f} questions/s materialized")
+
+
+if __name__ == "__main__":
+    main()
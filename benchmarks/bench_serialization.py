@@ -0,0 +1,114 @@
+"""Benchmark: FastAPI's default JSON encoding vs the fast response path.
+
+Compares serialization cost of QuizRead and QuizResultRead payloads (50 questions with
+explanations), then requests/sec for endpoints returning them both ways.
+
+Usage:
+    uv run python benchmarks/bench_serialization.py --questions 50 --repeat 2000
+"""
+
+import argparse
+import json
+import time
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from quli_quiz.api import schemas
+from quli_quiz.api.responses import FastJSONResponse, orjson
+from quli_quiz.models import Difficulty, QuestionType, QuizConfig, UserAnswer
+
+
+def build_payloads(num_questions: int) -> tuple[schemas.QuizRead, schemas.QuizResultRead]:
+    questions = [
+        schemas.QuestionRead(
+            id=i,
+            question_text=f"Which of the following statements about topic {i} is correct?",
+            question_type=QuestionType.MULTIPLE_CHOICE,
+            options=[f"Option {c} for question {i} with some extra words" for c in "ABCD"],
+            correct_answer=f"Option B for question {i} with some extra words",
+            difficulty=Difficulty.MEDIUM,
+            explanation="A reasonably long explanation of why the correct answer is right " * 3,
+        )
+        for i in range(num_questions)
+    ]
+    config = QuizConfig(topic="Bench", num_questions=num_questions)
+    quiz = schemas.QuizRead(id=1, topic="Bench", questions=questions, config=config)
+    result = schemas.QuizResultRead(
+        id=1,
+        quiz=quiz,
+        answers=[
+            UserAnswer(question_index=i, answer="b", is_correct=i % 2 == 0, time_taken=3.2)
+            for i in range(num_questions)
+        ],
+        score=50.0,
+        total_questions=num_questions,
+        correct_answers=num_questions // 2,
+        time_taken=160.0,
+    )
+    return quiz, result
+
+
+def time_per_call(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    quiz, result = build_payloads(args.questions)
+
+    print(f"Serialization, {args.questions} questions (microseconds per payload)")
+    for name, payload in (("QuizRead", quiz), ("QuizResultRead", result)):
+        default = time_per_call(
+            lambda p=payload: json.dumps(jsonable_encoder(p)).encode(), args.repeat
+        )
+        fast = time_per_call(lambda p=payload: FastJSONResponse(p).body, args.repeat)
+        line = f"  {name:15s} jsonable_encoder: {default:8.1f}  model serializer: {fast:8.1f}"
+        if orjson is not None:
+            via_orjson = time_per_call(lambda p=payload: orjson.dumps(p.model_dump()), args.repeat)
+            line += f"  orjson(model_dump): {via_orjson:8.1f}"
+        print(line)
+
+    app = FastAPI()
+
+    @app.get("/default/quiz", response_model=schemas.QuizRead)
+    def default_quiz():
+        return quiz
+
+    @app.get("/default/result", response_model=schemas.QuizResultRead)
+    def default_result():
+        return result
+
+    @app.get("/fast/quiz", response_model=schemas.QuizRead, response_class=FastJSONResponse)
+    def fast_quiz():
+        return FastJSONResponse(quiz)
+
+    @app.get("/fast/result", response_model=schemas.QuizResultRead, response_class=FastJSONResponse)
+    def fast_result():
+        return FastJSONResponse(result)
+
+    client = TestClient(app)
+    print(f"\nRequests/sec over {args.requests} requests (in-process TestClient)")
+    for name in ("quiz", "result"):
+        rates = {}
+        for path in ("default", "fast"):
+            url = f"/{path}/{name}"
+            assert client.get(url).json() == client.get(f"/default/{name}").json()
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                client.get(url)
+            rates[path] = args.requests / (time.perf_counter() - start)
+        print(f"  {name:7s} default: {rates['default']:8.1f}  fast: {rates['fast']:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark: hosting many live quiz sessions with SessionManager.
+
+Creates sessions over a handful of quizzes and measures the traced memory held by the
+manager, then answers questions on uniformly random sessions from several threads (the
+worst case for the live-engine cap, as most accesses restore a spilled session). Runs
+with all engines live, then with the cap spilling the rest as snapshots.
+
+Usage:
+    uv run python benchmarks/bench_sessions.py --sessions 50000 --max-live 5000
+"""
+
+import argparse
+import gc
+import random
+import threading
+import time
+import tracemalloc
+
+from bench_grading import build_quiz
+
+from quli_quiz.sessions import SessionManager
+
+
+def run(sessions: int, max_live: int, quizzes: list, threads: int, answers: int):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    manager = SessionManager(max_live=max_live)
+    session_ids = [manager.create(quizzes[i % len(quizzes)]) for i in range(sessions)]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    def answer(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(answers // threads):
+            with manager.session(rng.choice(session_ids)) as engine:
+                if not engine.is_complete():
+                    engine.submit_answer(rng.choice(["a", "b", "True"]))
+
+    workers = [threading.Thread(target=answer, args=(seed,)) for seed in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    answer_time = time.perf_counter() - start
+
+    metrics = manager.metrics()
+    print(f"  max_live={max_live:,}")
+    print(f"    answered       : {answers / answer_time:10,.0f} answers/s ({threads} threads)")
+    print(f"    memory         : {size / 2**20:10,.1f} MiB ({size / sessions:,.0f} B/session)")
+    print(
+        f"    live / spilled : {metrics.live:,} / {metrics.spilled:,}"
+        f" ({metrics.spills:,} spills, {metrics.restores:,} restores)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=50_000)
+    parser.add_argument("--max-live", type=int, default=5_000)
+    parser.add_argument("--quizzes", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--answers", type=int, default=100_000)
+    args = parser.parse_args()
+
+    quizzes = [build_quiz(args.questions) for _ in range(args.quizzes)]
+    for i, quiz in enumerate(quizzes):
+        quiz.topic = f"Bench {i}"
+
+    print(f"{args.sessions:,} sessions over {args.quizzes} quizzes of {args.questions} questions")
+    run(args.sessions, args.sessions, quizzes, args.threads, args.answers)
+    run(args.sessions, args.max_live, quizzes, args.threads, args.answers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark: rebuilding a stored quiz result with and without validation.
+
+Times reconstruction of a QuizResultRead (quiz, questions, config and answers) from
+already loaded ORM rows: full Pydantic validation, as the API did before, against the
+trusted adapters. Database access is excluded, so only model construction is measured.
+
+Usage:
+    uv run python benchmarks/bench_trusted_load.py --questions 50 --repeat 2000
+"""
+
+import argparse
+import time
+
+from quli_quiz.api import adapters, models, schemas
+from quli_quiz.api.responses import dump_json
+from quli_quiz.models import Difficulty, Question, QuestionType, Quiz, QuizConfig, UserAnswer
+
+
+def build_rows(num_questions: int) -> tuple[models.QuizModel, list[tuple]]:
+    quiz = models.QuizModel(
+        id=1,
+        topic="Bench",
+        config=QuizConfig(topic="Bench", num_questions=num_questions).model_dump(mode="json"),
+    )
+    for i in range(num_questions):
+        question = models.QuestionModel(
+            id=i,
+            question_text=f"Which of the following statements about topic {i} is correct?",
+            question_type="multiple_choice",
+            options=[f"Option {c} for question {i} with some extra words" for c in "ABCD"],
+            correct_answer=f"Option B for question {i} with some extra words",
+            difficulty="medium",
+            explanation="A reasonably long explanation of why the correct answer is right " * 3,
+        )
+        quiz.questions.append(models.QuizQuestionLink(position=i, question=question))
+    answers = [(i, "b", i % 2 == 0, 3.2) for i in range(num_questions)]
+    return quiz, answers
+
+
+def validated_result(quiz: models.QuizModel, answers: list[tuple]) -> schemas.QuizResultRead:
+    """The validating reconstruction used before the trusted adapters, as the baseline."""
+    pydantic_quiz = Quiz(
+        topic=quiz.topic,
+        questions=[
+            Question(
+                question_text=link.question.question_text,
+                question_type=QuestionType(link.question.question_type),
+                options=link.question.options,
+                correct_answer=link.question.correct_answer,
+                difficulty=Difficulty(link.question.difficulty),
+                explanation=link.question.explanation,
+            )
+            for link in quiz.questions
+        ],
+        config=QuizConfig(**quiz.config),
+    )
+    return schemas.QuizResultRead(
+        id=1,
+        quiz=pydantic_quiz,
+        answers=[
+            UserAnswer(question_index=i, answer=a, is_correct=c, time_taken=t)
+            for i, a, c, t in answers
+        ],
+        score=50.0,
+        total_questions=len(answers),
+        correct_answers=len(answers) // 2,
+        time_taken=160.0,
+    )
+
+
+def trusted_result(quiz: models.QuizModel, answers: list[tuple]) -> schemas.QuizResultRead:
+    return adapters.quiz_result_read(
+        1,
+        adapters.quiz(quiz),
+        [adapters.user_answer(*answer) for answer in answers],
+        50.0,
+        len(answers),
+        len(answers) // 2,
+        160.0,
+    )
+
+
+def time_per_call(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    quiz, answers = build_rows(args.questions)
+    assert dump_json(trusted_result(quiz, answers)) == dump_json(validated_result(quiz, answers))
+
+    validated = time_per_call(lambda: validated_result(quiz, answers), args.repeat)
+    trusted = time_per_call(lambda: trusted_result(quiz, answers), args.repeat)
+    quiz_validated = time_per_call(lambda: validated_result(quiz, []).quiz, args.repeat)
+    quiz_trusted = time_per_call(lambda: adapters.quiz(quiz), args.repeat)
+
+    print(f"QuizResultRead with {args.questions} questions and answers")
+    print(f"  validated : {validated:8.1f} µs")
+    print(f"  trusted   : {trusted:8.1f} µs  ({validated / trusted:.1f}x faster)")
+    print("Quiz alone (cache miss in _get_quiz)")
+    print(f"  validated : {quiz_validated:8.1f} µs")
+    print(f"  trusted   : {quiz_trusted:8.1f} µs  ({quiz_validated / quiz_trusted:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
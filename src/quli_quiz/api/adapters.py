@@ -0,0 +1,130 @@
+"""Trusted construction of Pydantic models from our own database rows and caches.
+
+Everything stored was validated when it was written, so models are rebuilt on read
+without validation. Only values whose stored form differs from the model's (enum
+values stored as strings) are converted. Never use these helpers on client input.
+
+Models are created with :func:`quli_quiz.models.construct` rather than
+``model_construct``, which resolves aliases and defaults field by field in Python and
+is slower than validation itself.
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+from quli_quiz.api import models, schemas
+from quli_quiz.models import (
+    Difficulty,
+    Question,
+    QuestionType,
+    Quiz,
+    QuizConfig,
+    UserAnswer,
+    construct,
+)
+
+_QUESTION_TYPES = {question_type.value: question_type for question_type in QuestionType}
+_DIFFICULTIES = {difficulty.value: difficulty for difficulty in Difficulty}
+
+
+def quiz_config(config: dict) -> QuizConfig:
+    """Rebuild a quiz config from its stored JSON; missing fields get their defaults."""
+    values = dict(config)
+    if values.get("difficulty") is not None:
+        values["difficulty"] = _DIFFICULTIES[values["difficulty"]]
+    if "question_types" in values:
+        values["question_types"] = [_QUESTION_TYPES[t] for t in values["question_types"]]
+    return QuizConfig.model_construct(**values)
+
+
+def _question_fields(row: models.QuestionModel) -> dict[str, Any]:
+    return {
+        "question_text": row.question_text,
+        "question_type": _QUESTION_TYPES[row.question_type],
+        "options": row.options,
+        "correct_answer": row.correct_answer,
+        "difficulty": _DIFFICULTIES[row.difficulty],
+        "explanation": row.explanation,
+    }
+
+
+def question(row: models.QuestionModel) -> Question:
+    """Rebuild a question from its stored row."""
+    return construct(Question, _question_fields(row))
+
+
+def question_read(row: models.QuestionModel) -> schemas.QuestionRead:
+    """Build the QuestionRead schema from a stored question."""
+    return construct(schemas.QuestionRead, {**_question_fields(row), "id": row.id})
+
+
+def question_search_hit(row: models.QuestionModel, rank: float) -> schemas.QuestionSearchHit:
+    """Build a search hit from a stored question and its rank."""
+    return construct(
+        schemas.QuestionSearchHit, {**_question_fields(row), "id": row.id, "rank": float(rank)}
+    )
+
+
+def quiz(row: models.QuizModel) -> Quiz:
+    """Rebuild a quiz from its stored row and question links."""
+    return construct(
+        Quiz,
+        {
+            "topic": row.topic,
+            "questions": [question(link.question) for link in row.questions],
+            "config": quiz_config(row.config),
+        },
+    )
+
+
+def quiz_read(row: models.QuizModel) -> schemas.QuizRead:
+    """Build the QuizRead schema from a stored quiz and its questions."""
+    return construct(
+        schemas.QuizRead,
+        {
+            "topic": row.topic,
+            "questions": [question_read(link.question) for link in row.questions],
+            "config": quiz_config(row.config),
+            "id": row.id,
+        },
+    )
+
+
+def user_answer(
+    question_index: int, answer: str, is_correct: bool, time_taken: float | None
+) -> UserAnswer:
+    """Build a graded answer, from a stored row or from our own grading."""
+    return construct(
+        UserAnswer,
+        {
+            "question_index": question_index,
+            "answer": answer,
+            "is_correct": is_correct,
+            "time_taken": time_taken,
+            "cumulative_time": None,
+        },
+    )
+
+
+def quiz_result_read(
+    result_id: int,
+    quiz: Quiz,
+    answers: Sequence[UserAnswer],
+    score: float,
+    total_questions: int,
+    correct_answers: int,
+    time_taken: float | None,
+) -> schemas.QuizResultRead:
+    """Build the QuizResultRead schema from a stored or freshly graded result."""
+    return construct(
+        schemas.QuizResultRead,
+        {
+            "quiz": quiz,
+            "answers": list(answers),
+            "score": score,
+            "total_questions": total_questions,
+            "correct_answers": correct_answers,
+            "time_taken": time_taken,
+            "id": result_id,
+        },
+    )
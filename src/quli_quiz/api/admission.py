@@ -0,0 +1,162 @@
+"""Admission control and rate limiting for expensive endpoints."""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+
+class OverloadedError(Exception):
+    """Raised when a request cannot be admitted; carries a retry hint in seconds."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """The hint formatted for the Retry-After header (whole seconds, at least 1)."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class AdmissionController:
+    """Bound the number of concurrent operations, with a short bounded wait queue.
+
+    Requests beyond ``max_concurrent`` wait up to ``queue_timeout`` seconds for a slot,
+    but only ``max_queue`` of them at a time; everything else is rejected immediately.
+    This keeps latency of admitted requests stable instead of letting queues grow.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float):
+        """Initialize the controller limits."""
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiting = 0
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """Hold a slot for the duration of the block, or raise OverloadedError."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self._waiting >= self.max_queue:
+                    raise OverloadedError("Server is busy, please retry later", self.queue_timeout)
+                self._waiting += 1
+            try:
+                acquired = self._slots.acquire(timeout=self.queue_timeout)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+            if not acquired:
+                raise OverloadedError("Timed out waiting for capacity", self.queue_timeout)
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+
+def _check_bucket(rate: float, capacity: float) -> None:
+    # A zero rate never refills and a capacity below 1 never holds a whole token
+    if rate <= 0:
+        raise ValueError(f"Token bucket rate must be positive, got {rate}")
+    if capacity < 1:
+        raise ValueError(f"Token bucket capacity must be at least 1, got {capacity}")
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, holding at most ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        """Initialize a full bucket.
+
+        Raises ValueError unless ``rate`` is positive and ``capacity`` holds a token.
+        """
+        _check_bucket(rate, capacity)
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def try_acquire(self) -> float:
+        """Take one token; return 0 on success, otherwise seconds until one is available."""
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+
+class ClientRateLimiter:
+    """Per-client token buckets, keeping at most ``max_clients`` buckets (LRU)."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        max_clients: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the limiter with the bucket parameters used for every client.
+
+        Raises ValueError for parameters :class:`TokenBucket` rejects.
+        """
+        _check_bucket(rate, capacity)
+        self.rate = rate
+        self.capacity = capacity
+        self.max_clients = max_clients
+        self._clock = clock
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, client_id: str) -> None:
+        """Consume a token for the client or raise OverloadedError with the wait time."""
+        with self._lock:
+            bucket = self._buckets.get(client_id)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.capacity, self._clock)
+                self._buckets[client_id] = bucket
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client_id)
+            wait = bucket.try_acquire()
+        if wait > 0:
+            raise OverloadedError("Rate limit exceeded", wait)
+
+
+generation_admission = AdmissionController(
+    max_concurrent=int(os.getenv("QULI_GENERATION_CONCURRENCY", "4")),
+    max_queue=int(os.getenv("QULI_GENERATION_QUEUE", "8")),
+    queue_timeout=float(os.getenv("QULI_GENERATION_QUEUE_TIMEOUT", "2.0")),
+)
+
+_rate_per_minute = float(os.getenv("QULI_GENERATION_RATE_PER_MINUTE", "10"))
+_burst = float(os.getenv("QULI_GENERATION_BURST", "5"))
+if _rate_per_minute <= 0 or _burst < 1:
+    raise ValueError(
+        "QULI_GENERATION_RATE_PER_MINUTE must be positive and QULI_GENERATION_BURST at "
+        f"least 1, got {_rate_per_minute} and {_burst}"
+    )
+generation_rate_limiter = ClientRateLimiter(rate=_rate_per_minute / 60, capacity=_burst)
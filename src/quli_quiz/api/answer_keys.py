@@ -0,0 +1,68 @@
+"""Compiled answer keys of stored quizzes, cached across requests."""
+
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from quli_quiz import grading
+from quli_quiz.api import models
+from quli_quiz.api.cache import LRUCache, quiz_caches
+
+
+@dataclass(frozen=True)
+class AnswerKey(grading.AnswerKey):
+    """The compiled answer key of a stored quiz."""
+
+    quiz_id: int
+    topic: str
+
+
+def load_answer_keys(db: Session, quiz_ids: Iterable[int]) -> dict[int, AnswerKey]:
+    """Load the answer keys of the given quizzes in two queries; missing quizzes are omitted."""
+    topics = dict(
+        db.query(models.QuizModel.id, models.QuizModel.topic).filter(
+            models.QuizModel.id.in_(set(quiz_ids))
+        )
+    )
+    questions: dict[int, list[grading.CompiledQuestion]] = {quiz_id: [] for quiz_id in topics}
+    rows = (
+        db.query(
+            models.QuizQuestionLink.quiz_id,
+            models.QuestionModel.question_type,
+            models.QuestionModel.options,
+            models.QuestionModel.correct_answer,
+            models.QuestionModel.difficulty,
+        )
+        .join(models.QuestionModel, models.QuizQuestionLink.question_id == models.QuestionModel.id)
+        .filter(models.QuizQuestionLink.quiz_id.in_(topics))
+        .order_by(models.QuizQuestionLink.quiz_id, models.QuizQuestionLink.position)
+    )
+    for row in rows:
+        questions[row.quiz_id].append(
+            grading.compile_question(
+                row.question_type, row.options, row.correct_answer, row.difficulty
+            )
+        )
+    return {
+        quiz_id: AnswerKey(questions=tuple(questions[quiz_id]), quiz_id=quiz_id, topic=topic)
+        for quiz_id, topic in topics.items()
+    }
+
+
+answer_key_cache: LRUCache[int, AnswerKey] = LRUCache(
+    maxsize=int(os.getenv("QULI_ANSWER_KEY_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("QULI_ANSWER_KEY_TTL", "600")),
+)
+quiz_caches.append(answer_key_cache)
+
+
+def get_answer_key(db: Session, quiz_id: int) -> AnswerKey | None:
+    """Return the answer key of a quiz, loading it into the shared cache on a miss."""
+    key = answer_key_cache.get(quiz_id)
+    if key is None:
+        key = load_answer_keys(db, [quiz_id]).get(quiz_id)
+        if key is not None:
+            answer_key_cache.put(quiz_id, key)
+    return key
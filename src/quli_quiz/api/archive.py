@@ -0,0 +1,249 @@
+"""Compact archival storage for the answers of old quiz results.
+
+Answers of results older than a threshold are packed into one blob per result and
+their ``user_answers`` rows are deleted. Each answer becomes an 8-byte record::
+
+    uint16 question_index | int8 option_index | uint8 flags | float32 time_taken
+
+``option_index`` points into the question's options; answers that are not exactly one
+of the options use -1 and their text is appended after the records as UTF-8 prefixed
+with a uint32 length (uint16 in format version 1), so packing is lossless apart from
+float32 timing precision. Results whose answers cannot be packed (timings beyond
+float32 range) keep their rows.
+"""
+
+import logging
+import struct
+import threading
+from collections.abc import Callable, Sequence
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.orm import Session
+
+from quli_quiz.api import adapters, models
+from quli_quiz.models import UserAnswer
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+_HEADER = struct.Struct("<BH")
+_RECORD = struct.Struct("<HbBf")
+_TEXT_LENGTHS = {1: struct.Struct("<H"), 2: struct.Struct("<I")}
+
+_FLAG_CORRECT = 0x01
+_FLAG_HAS_TIME = 0x02
+
+
+def pack_answers(answers: Sequence[models.UserAnswerModel], options: Sequence[list[str]]) -> bytes:
+    """Pack a result's answers; ``options[i]`` are the options of question ``i``."""
+    records = []
+    texts = []
+    for answer in answers:
+        question_options = (
+            options[answer.question_index] if answer.question_index < len(options) else []
+        )
+        try:
+            option_index = question_options.index(answer.answer)
+        except ValueError:
+            option_index = -1
+        if option_index > 127:
+            option_index = -1
+        if option_index == -1:
+            texts.append(answer.answer.encode())
+
+        flags = (_FLAG_CORRECT if answer.is_correct else 0) | (
+            _FLAG_HAS_TIME if answer.time_taken is not None else 0
+        )
+        records.append(
+            _RECORD.pack(answer.question_index, option_index, flags, answer.time_taken or 0.0)
+        )
+
+    text_length = _TEXT_LENGTHS[FORMAT_VERSION]
+    parts = [_HEADER.pack(FORMAT_VERSION, len(records)), *records]
+    for text in texts:
+        parts.append(text_length.pack(len(text)))
+        parts.append(text)
+    return b"".join(parts)
+
+
+def unpack_answers(data: bytes, options: Sequence[list[str]]) -> list[UserAnswer]:
+    """Inverse of :func:`pack_answers`."""
+    version, count = _HEADER.unpack_from(data, 0)
+    text_length = _TEXT_LENGTHS.get(version)
+    if text_length is None:
+        raise ValueError(f"Unsupported archived answers format version {version}")
+
+    offset = _HEADER.size
+    records = []
+    for _ in range(count):
+        records.append(_RECORD.unpack_from(data, offset))
+        offset += _RECORD.size
+
+    answers = []
+    for question_index, option_index, flags, time_taken in records:
+        if option_index >= 0:
+            answer = options[question_index][option_index]
+        else:
+            (length,) = text_length.unpack_from(data, offset)
+            offset += text_length.size
+            answer = data[offset : offset + length].decode()
+            offset += length
+        answers.append(
+            adapters.user_answer(
+                question_index,
+                answer,
+                bool(flags & _FLAG_CORRECT),
+                time_taken if flags & _FLAG_HAS_TIME else None,
+            )
+        )
+    return answers
+
+
+def load_quiz_options(db: Session, quiz_ids: Sequence[int]) -> dict[int, list[list[str]]]:
+    """Return the options of every question of the given quizzes, in quiz order."""
+    options: dict[int, list[list[str]]] = {quiz_id: [] for quiz_id in quiz_ids}
+    rows = db.execute(
+        select(models.QuizQuestionLink.quiz_id, models.QuestionModel.options)
+        .join(models.QuestionModel, models.QuizQuestionLink.question_id == models.QuestionModel.id)
+        .where(models.QuizQuestionLink.quiz_id.in_(quiz_ids))
+        .order_by(models.QuizQuestionLink.quiz_id, models.QuizQuestionLink.position)
+    )
+    for quiz_id, question_options in rows:
+        options[quiz_id].append(question_options)
+    return options
+
+
+def load_answers(db: Session, result: models.QuizResultModel) -> list[UserAnswer]:
+    """Return a result's answers, whether stored as rows or archived."""
+    archived = db.get(models.ArchivedAnswersModel, result.id)
+    if archived is not None:
+        return unpack_answers(
+            archived.data, load_quiz_options(db, [result.quiz_id])[result.quiz_id]
+        )
+    rows = db.execute(
+        select(
+            models.UserAnswerModel.question_index,
+            models.UserAnswerModel.answer,
+            models.UserAnswerModel.is_correct,
+            models.UserAnswerModel.time_taken,
+        )
+        .where(models.UserAnswerModel.result_id == result.id)
+        .order_by(models.UserAnswerModel.id)
+    )
+    return [adapters.user_answer(*row) for row in rows]
+
+
+def compact_results(db: Session, older_than: datetime, batch_size: int = 500) -> int:
+    """Archive answers of results created before ``older_than``; return results archived.
+
+    Results stored before ``created_at`` existed have none and count as old. Works in
+    batches, each packed, inserted and deleted in its own transaction, so the job can be
+    interrupted at any point and never holds the write lock for long. Each batch takes
+    the write lock before choosing its results, so compactors running in several worker
+    processes take turns instead of packing the same results. Call it without a
+    transaction open on ``db``.
+    """
+    archived_total = 0
+    last_id = 0
+    while True:
+        if db.get_bind().dialect.name == "sqlite":
+            db.connection().exec_driver_sql("BEGIN IMMEDIATE")
+        batch = db.execute(
+            select(models.QuizResultModel.id, models.QuizResultModel.quiz_id)
+            .where(models.QuizResultModel.id > last_id)
+            .where(
+                or_(
+                    models.QuizResultModel.created_at < older_than,
+                    models.QuizResultModel.created_at.is_(None),
+                )
+            )
+            .where(
+                ~select(models.ArchivedAnswersModel.result_id)
+                .where(models.ArchivedAnswersModel.result_id == models.QuizResultModel.id)
+                .exists()
+            )
+            .order_by(models.QuizResultModel.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            db.rollback()
+            return archived_total
+        # Move past this batch even if some of its results cannot be packed
+        last_id = batch[-1].id
+
+        result_ids = [row.id for row in batch]
+        options = load_quiz_options(db, list({row.quiz_id for row in batch}))
+        answers_by_result: dict[int, list[models.UserAnswerModel]] = {rid: [] for rid in result_ids}
+        for answer in (
+            db.query(models.UserAnswerModel)
+            .filter(models.UserAnswerModel.result_id.in_(result_ids))
+            .order_by(models.UserAnswerModel.id)
+        ):
+            answers_by_result[answer.result_id].append(answer)
+
+        packed = []
+        for row in batch:
+            answers = answers_by_result[row.id]
+            try:
+                data = pack_answers(answers, options[row.quiz_id])
+            except (struct.error, OverflowError):
+                logger.warning("Keeping answers of result %d unarchived: cannot pack", row.id)
+                continue
+            packed.append({"result_id": row.id, "answer_count": len(answers), "data": data})
+
+        if packed:
+            db.execute(insert(models.ArchivedAnswersModel), packed)
+            db.execute(
+                delete(models.UserAnswerModel).where(
+                    models.UserAnswerModel.result_id.in_([row["result_id"] for row in packed])
+                )
+            )
+        db.commit()
+        archived_total += len(packed)
+
+
+class ArchiveCompactor:
+    """Background thread that periodically archives answers of old results."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        archive_after: timedelta,
+        interval: float = 3600.0,
+        batch_size: int = 500,
+    ):
+        """Initialize the compactor; call :meth:`start` to begin."""
+        self.session_factory = session_factory
+        self.archive_after = archive_after
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self) -> int:
+        """Run one compaction pass and return the number of results archived."""
+        db = self.session_factory()
+        try:
+            return compact_results(db, models.utcnow() - self.archive_after, self.batch_size)
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                archived = self.run_once()
+                if archived:
+                    logger.info("Archived answers of %d results", archived)
+            except Exception:
+                logger.exception("Answer compaction failed")
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="quli-archive", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,170 @@
+"""In-process caches and HTTP caching helpers for the API."""
+
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from quli_quiz.api import models
+from quli_quiz.models import Quiz
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Quizzes never change after creation, so clients and proxies may keep them for long
+QUIZ_CACHE_CONTROL = "public, max-age=86400, immutable"
+
+
+class LRUCache(Generic[K, V]):
+    """A small thread-safe least-recently-used cache, optionally expiring entries."""
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the cache with a maximum number of entries and lifetime in seconds."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value and mark it as recently used."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        expires_at = math.inf if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """Drop a single entry if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A fully serialized response body together with its entity tag."""
+
+    etag: str
+    body: bytes
+
+
+def content_hash(body: bytes) -> str:
+    """Return the hex digest used as the strong validator of a response body."""
+    return hashlib.sha256(body).hexdigest()
+
+
+def format_etag(digest: str) -> str:
+    """Quote a digest as a strong ETag header value."""
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, per RFC 9110)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+quiz_response_cache: LRUCache[int, CachedResponse] = LRUCache(
+    maxsize=int(os.getenv("QULI_QUIZ_CACHE_SIZE", "256"))
+)
+quiz_object_cache: LRUCache[int, Quiz] = LRUCache(
+    maxsize=int(os.getenv("QULI_QUIZ_CACHE_SIZE", "256"))
+)
+
+# Caches keyed by quiz ID, dropped together whenever a quiz or its questions change
+quiz_caches: list[LRUCache] = [quiz_response_cache, quiz_object_cache]
+
+
+def invalidate_quiz(quiz_id: int) -> None:
+    """Drop everything cached about one quiz."""
+    for cache in quiz_caches:
+        cache.invalidate(quiz_id)
+
+
+def invalidate_all_quizzes() -> None:
+    """Drop everything cached about any quiz."""
+    for cache in quiz_caches:
+        cache.clear()
+
+
+_STALE_KEY = "quli_stale_quizzes"
+_ALL = "all"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_stale_quizzes(session, flush_context):
+    # Changes are only visible to others once committed, so note them here and
+    # invalidate in after_commit (a reader could otherwise re-cache the old rows)
+    stale = session.info.setdefault(_STALE_KEY, set())
+    for obj in session.dirty | session.deleted:
+        if isinstance(obj, models.QuizModel):
+            stale.add(obj.id)
+        elif isinstance(obj, models.QuestionModel):
+            # Questions are shared between quizzes
+            stale.add(_ALL)
+    for obj in session.new | session.dirty | session.deleted:
+        if isinstance(obj, models.QuizQuestionLink):
+            stale.add(obj.quiz_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_stale_quizzes(session):
+    stale = session.info.pop(_STALE_KEY, None)
+    if not stale:
+        return
+    if _ALL in stale:
+        invalidate_all_quizzes()
+        return
+    for quiz_id in stale:
+        invalidate_quiz(quiz_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale_quizzes(session):
+    session.info.pop(_STALE_KEY, None)
@@ -1,14 +1,47 @@
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./quli.db"
+# Only SQLite is supported: statistics upserts and question search rely on it
+SQLALCHEMY_DATABASE_URL = os.getenv("QULI_DATABASE_URL", "sqlite:///./quli.db")
+_IS_SQLITE = make_url(SQLALCHEMY_DATABASE_URL).get_backend_name() == "sqlite"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False} if _IS_SQLITE else {},
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
+@event.listens_for(engine, "connect")
+def _configure_sqlite(dbapi_connection, connection_record):
+    if not _IS_SQLITE:
+        return
+    # WAL lets readers proceed during writes, and the busy timeout makes concurrent
+    # writers (e.g. several API workers) wait for the lock instead of failing
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+def init_db(bind=engine) -> None:
+    """Upgrade tables created by earlier releases, then create any that do not exist.
+
+    This is an explicit deployment step (``quli-api --init-db-only``, or run once by
+    ``quli-api`` before workers start), not something done at import time.
+    """
+    # Import modules that register tables and DDL hooks on Base.metadata
+    from quli_quiz.api import migrations, models, search  # noqa: F401
+
+    migrations.upgrade_schema(bind)
+    Base.metadata.create_all(bind=bind)
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -0,0 +1,145 @@
+"""Streaming export of quiz results and their answers as NDJSON or CSV.
+
+Rows are read through a streaming cursor and encoded in fixed-size chunks, so memory
+use stays constant however many results are exported.
+"""
+
+import csv
+import io
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from quli_quiz.api import archive, models
+from quli_quiz.api.responses import dump_json
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+COLUMNS = (
+    "result_id",
+    "quiz_id",
+    "topic",
+    "created_at",
+    "score",
+    "total_questions",
+    "correct_answers",
+    "result_time_taken",
+    "question_index",
+    "answer",
+    "is_correct",
+    "time_taken",
+)
+
+
+def iter_result_rows(
+    db: Session,
+    topic: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    yield_per: int = 1000,
+) -> Iterator[dict]:
+    """Yield one row per answer of every matching result, ordered by result.
+
+    Results whose answers were archived are expanded from their packed blob; results
+    without answers yield a single row with empty answer columns.
+    """
+    stmt = (
+        select(
+            models.QuizResultModel.id.label("result_id"),
+            models.QuizResultModel.quiz_id,
+            models.QuizModel.topic,
+            models.QuizResultModel.created_at,
+            models.QuizResultModel.score,
+            models.QuizResultModel.total_questions,
+            models.QuizResultModel.correct_answers,
+            models.QuizResultModel.time_taken.label("result_time_taken"),
+            models.UserAnswerModel.question_index,
+            models.UserAnswerModel.answer,
+            models.UserAnswerModel.is_correct,
+            models.UserAnswerModel.time_taken,
+            models.ArchivedAnswersModel.data.label("archived"),
+        )
+        .join(models.QuizModel, models.QuizModel.id == models.QuizResultModel.quiz_id)
+        .outerjoin(
+            models.UserAnswerModel,
+            models.UserAnswerModel.result_id == models.QuizResultModel.id,
+        )
+        .outerjoin(
+            models.ArchivedAnswersModel,
+            models.ArchivedAnswersModel.result_id == models.QuizResultModel.id,
+        )
+        .order_by(models.QuizResultModel.id, models.UserAnswerModel.id)
+    )
+    if topic is not None:
+        stmt = stmt.where(func.lower(models.QuizModel.topic) == topic.lower())
+    if since is not None:
+        stmt = stmt.where(models.QuizResultModel.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(models.QuizResultModel.created_at < until)
+
+    # Options are needed to unpack archived answers; one entry per quiz, not per row
+    quiz_options: dict[int, list[list[str]]] = {}
+    rows = db.execute(stmt.execution_options(stream_results=True, yield_per=yield_per))
+    for row in rows:
+        result = {column: getattr(row, column) for column in COLUMNS}
+        if row.archived is None:
+            yield result
+            continue
+        if row.quiz_id not in quiz_options:
+            quiz_options.update(archive.load_quiz_options(db, [row.quiz_id]))
+        for answer in archive.unpack_answers(row.archived, quiz_options[row.quiz_id]):
+            yield {
+                **result,
+                "question_index": answer.question_index,
+                "answer": answer.answer,
+                "is_correct": answer.is_correct,
+                "time_taken": answer.time_taken,
+            }
+
+
+def _chunked(rows: Iterable[dict], chunk_rows: int) -> Iterator[list[dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def ndjson_chunks(rows: Iterable[dict], chunk_rows: int = 500) -> Iterator[bytes]:
+    """Encode rows as newline-delimited JSON, ``chunk_rows`` rows per chunk."""
+    for chunk in _chunked(rows, chunk_rows):
+        yield b"".join(dump_json(row) + b"\n" for row in chunk)
+
+
+def csv_chunks(rows: Iterable[dict], chunk_rows: int = 500) -> Iterator[bytes]:
+    """Encode rows as CSV with a header line, ``chunk_rows`` rows per chunk."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    for chunk in _chunked(rows, chunk_rows):
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header only: no rows matched
+        yield buffer.getvalue().encode()
+
+
+def export_chunks(
+    db: Session,
+    export_format: str = "ndjson",
+    topic: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> Iterator[bytes]:
+    """Stream matching results in the given format (``ndjson`` or ``csv``)."""
+    rows = iter_result_rows(db, topic=topic, since=since, until=until)
+    if export_format == "csv":
+        return csv_chunks(rows)
+    return ndjson_chunks(rows)
@@ -0,0 +1,156 @@
+"""Group commit: store submissions from many concurrent requests in shared transactions.
+
+With SQLite every commit is an fsync, so committing each submission separately caps
+throughput at the disk's sync rate. The writer collects graded results from request
+threads for up to ``max_delay`` seconds (or ``max_batch`` results) and stores each
+batch with one transaction; a request is acknowledged once its batch has committed.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from sqlalchemy.orm import Session
+
+from quli_quiz.api import submissions
+
+logger = logging.getLogger(__name__)
+
+_Pending = tuple[submissions.GradedResult, Future]
+
+
+class GroupCommitWriter:
+    """Background thread committing graded results in batches."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_delay: float = 0.005,
+        max_batch: int = 500,
+    ):
+        """Initialize the writer; call :meth:`start` to begin."""
+        self.session_factory = session_factory
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self._queue: queue.Queue[_Pending | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, result: submissions.GradedResult) -> "Future[int]":
+        """Queue a graded result; the future resolves to its result ID once committed."""
+        future: Future[int] = Future()
+        self._queue.put((result, future))
+        return future
+
+    def save(self, result: submissions.GradedResult, timeout: float | None = 30.0) -> int:
+        """Queue a graded result and wait until its batch has committed.
+
+        Raises TimeoutError if the result was still queued after ``timeout`` seconds; it
+        is then withdrawn and never stored. A result whose batch is already being
+        written is waited for, so a timeout never leaves a result committed unreported.
+        """
+        future = self.submit(result)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                raise TimeoutError(f"Result not stored within {timeout} seconds") from None
+            return future.result()
+
+    def _collect(self) -> tuple[list[_Pending], bool]:
+        """Block for the first item, then gather more until the delay or size limit."""
+        first = self._queue.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _write(self, batch: list[_Pending]) -> None:
+        """Store a batch in one transaction and resolve its futures."""
+        db = self.session_factory()
+        try:
+            result_ids = submissions.save_results(db, [result for result, _ in batch])
+            db.commit()
+        except Exception:
+            db.rollback()
+            if len(batch) == 1:
+                raise
+            logger.exception("Group commit of %d results failed, retrying singly", len(batch))
+            failed = True
+        else:
+            failed = False
+        finally:
+            db.close()
+
+        if failed:
+            # Retry one by one so a single bad result does not fail its whole batch
+            for item in batch:
+                self._write_one(item)
+            return
+        for (_, future), result_id in zip(batch, result_ids, strict=True):
+            future.set_result(result_id)
+
+    def _write_one(self, item: _Pending) -> None:
+        try:
+            self._write([item])
+        except Exception as e:
+            item[1].set_exception(e)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._collect()
+            # Drop results whose request gave up waiting; the rest can no longer be cancelled
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                self._write(batch)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+        # Fail anything queued after the stop signal rather than leaving it hanging
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(RuntimeError("Group commit writer stopped"))
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="quli-group-commit", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Flush queued results and stop the thread."""
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join()
+
+
+# Set by the app lifespan when QULI_GROUP_COMMIT is enabled
+writer: GroupCommitWriter | None = None
+
+
+def from_env(session_factory: Callable[[], Session]) -> GroupCommitWriter | None:
+    """Build a writer from QULI_GROUP_COMMIT* settings, or None when disabled."""
+    if os.getenv("QULI_GROUP_COMMIT", "").lower() not in ("1", "true", "yes", "on"):
+        return None
+    return GroupCommitWriter(
+        session_factory,
+        max_delay=float(os.getenv("QULI_GROUP_COMMIT_DELAY_MS", "5")) / 1000,
+        max_batch=int(os.getenv("QULI_GROUP_COMMIT_MAX_BATCH", "500")),
+    )
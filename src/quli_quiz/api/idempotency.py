@@ -0,0 +1,247 @@
+"""Idempotency-Key support for non-idempotent endpoints.
+
+The first request with a given key claims it by inserting an ``in_progress`` row. When
+it succeeds the response is stored on that row, and repeats of the key within the TTL
+get the stored response back without running the endpoint again. Repeats that arrive
+while the first request is still running wait for it to finish. Failed requests release
+the key so the client can retry.
+
+A claim is a lease much shorter than the TTL: if its owner dies without completing or
+releasing the key (a killed worker), a repeat takes the claim over once the lease has
+run out, instead of getting 409 until the key expires. An owner whose lease was taken
+over can no longer complete or release the key.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, Response
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from quli_quiz.api import models
+
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+REPLAY_HEADER = "Idempotent-Replayed"
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """A response recorded for an idempotency key."""
+
+    status_code: int
+    body: bytes
+    media_type: str | None
+
+
+def request_fingerprint(scope: str, payload: bytes) -> str:
+    """Digest identifying the request a key was first used with."""
+    return hashlib.sha256(scope.encode() + b"\0" + payload).hexdigest()
+
+
+class IdempotencyStore:
+    """Claims keys, records responses and replays them within a TTL."""
+
+    def __init__(
+        self,
+        ttl: timedelta,
+        wait_timeout: float,
+        lease: timedelta = timedelta(minutes=5),
+        poll_interval: float = 0.05,
+    ):
+        """Initialize the store settings.
+
+        ``lease`` must exceed the longest time the endpoint can take to respond.
+        """
+        self.ttl = ttl
+        self.lease = lease
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._events: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+
+    def run(
+        self,
+        db: Session,
+        key: str,
+        scope: str,
+        payload: bytes,
+        handler: Callable[[], Response],
+    ) -> Response:
+        """Run ``handler`` at most once per key and return its (possibly stored) response."""
+        # Use a separate session so claiming the key never commits the caller's work
+        session_factory = sessionmaker(bind=db.get_bind(), autoflush=False)
+        fingerprint = request_fingerprint(scope, payload)
+
+        claim = self._claim(session_factory, key, fingerprint)
+        if isinstance(claim, StoredResponse):
+            return Response(
+                content=claim.body,
+                status_code=claim.status_code,
+                media_type=claim.media_type,
+                headers={REPLAY_HEADER: "true"},
+            )
+
+        try:
+            response = handler()
+        except BaseException:
+            self._release(session_factory, key, claim)
+            raise
+        if response.status_code >= 400:
+            self._release(session_factory, key, claim)
+        else:
+            self._complete(session_factory, key, claim, response)
+        return response
+
+    def _claim(
+        self, session_factory: sessionmaker, key: str, fingerprint: str
+    ) -> StoredResponse | datetime:
+        """Claim the key, or wait for and return the response stored under it.
+
+        A successful claim returns the end of its lease, which identifies the claim.
+        """
+        table = models.IdempotencyKeyModel
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            with session_factory() as db:
+                self._purge_expired(db)
+                now = models.utcnow()
+                row = db.get(table, key)
+                if row is not None and row.expires_at <= now:
+                    db.execute(delete(table).where(table.key == key, table.expires_at <= now))
+                    db.commit()
+                    row = None
+
+                if row is None:
+                    locked_until = now + self.lease
+                    db.add(
+                        table(
+                            key=key,
+                            request_hash=fingerprint,
+                            status=IN_PROGRESS,
+                            expires_at=now + self.ttl,
+                            locked_until=locked_until,
+                        )
+                    )
+                    try:
+                        db.commit()
+                    except IntegrityError:
+                        # Another request claimed it first; wait for that one below
+                        db.rollback()
+                        continue
+                    self._watch(key)
+                    return locked_until
+
+                if row.request_hash != fingerprint:
+                    raise HTTPException(
+                        status_code=422,
+                        detail="Idempotency-Key was already used with a different request",
+                    )
+                if row.status == COMPLETED:
+                    return StoredResponse(row.status_code, row.response_body, row.media_type)
+
+                # Keys claimed before leases existed have none; their lease starts at creation
+                lease_end = row.locked_until or row.created_at + self.lease
+                if lease_end <= now:
+                    # The owner died without finishing; take its claim over
+                    locked_until = now + self.lease
+                    taken = db.execute(
+                        update(table)
+                        .where(table.key == key, table.status == IN_PROGRESS)
+                        .where(
+                            table.locked_until == row.locked_until
+                            if row.locked_until is not None
+                            else table.locked_until.is_(None)
+                        )
+                        .values(locked_until=locked_until, expires_at=now + self.ttl)
+                    ).rowcount
+                    db.commit()
+                    if taken:
+                        self._watch(key)
+                        return locked_until
+                    continue
+
+            # In progress: wait for the owner (signalled in-process, polled otherwise)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise HTTPException(
+                    status_code=409,
+                    detail="A request with this Idempotency-Key is still in progress",
+                    headers={"Retry-After": "1"},
+                )
+            with self._lock:
+                event = self._events.get(key)
+            if event is not None:
+                event.wait(min(remaining, 1.0))
+            else:
+                time.sleep(min(remaining, self.poll_interval))
+
+    def _complete(
+        self, session_factory: sessionmaker, key: str, claim: datetime, response: Response
+    ) -> None:
+        table = models.IdempotencyKeyModel
+        with session_factory() as db:
+            db.execute(
+                update(table)
+                .where(table.key == key, table.status == IN_PROGRESS, table.locked_until == claim)
+                .values(
+                    status=COMPLETED,
+                    status_code=response.status_code,
+                    response_body=bytes(response.body),
+                    media_type=response.media_type,
+                )
+            )
+            db.commit()
+        self._notify(key)
+
+    def _release(self, session_factory: sessionmaker, key: str, claim: datetime) -> None:
+        table = models.IdempotencyKeyModel
+        with session_factory() as db:
+            db.execute(
+                delete(table).where(
+                    table.key == key, table.status == IN_PROGRESS, table.locked_until == claim
+                )
+            )
+            db.commit()
+        self._notify(key)
+
+    def _watch(self, key: str) -> None:
+        # Only claims held by this process get an event, as only they are notified;
+        # waiters on claims held by other processes poll instead
+        with self._lock:
+            self._events.setdefault(key, threading.Event())
+
+    def _notify(self, key: str) -> None:
+        with self._lock:
+            event = self._events.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def _purge_expired(self, db: Session) -> None:
+        """Delete expired keys, at most once a minute."""
+        now = time.monotonic()
+        if now - self._last_purge < 60:
+            return
+        self._last_purge = now
+        db.execute(
+            delete(models.IdempotencyKeyModel).where(
+                models.IdempotencyKeyModel.expires_at <= models.utcnow()
+            )
+        )
+        db.commit()
+
+
+idempotency_store = IdempotencyStore(
+    ttl=timedelta(hours=float(os.getenv("QULI_IDEMPOTENCY_TTL_HOURS", "24"))),
+    wait_timeout=float(os.getenv("QULI_IDEMPOTENCY_WAIT", "60")),
+    lease=timedelta(seconds=float(os.getenv("QULI_IDEMPOTENCY_LEASE", "300"))),
+)
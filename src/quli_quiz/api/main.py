@@ -1,26 +1,143 @@
-from fastapi import FastAPI
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
 
-from quli_quiz.api import models, routes
-from quli_quiz.api.database import engine
+import click
+from fastapi import FastAPI, Request, Response
+
+from quli_quiz.api import archive, group_commit, metrics, routes
+from quli_quiz.api.database import SessionLocal, init_db
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run background jobs for the lifetime of the app."""
+    compactor = None
+    archive_after_days = os.getenv("QULI_ARCHIVE_AFTER_DAYS")
+    if archive_after_days:
+        compactor = archive.ArchiveCompactor(
+            SessionLocal,
+            archive_after=timedelta(days=float(archive_after_days)),
+            interval=float(os.getenv("QULI_ARCHIVE_INTERVAL", "3600")),
+        )
+        compactor.start()
+    writer = group_commit.from_env(SessionLocal)
+    if writer is not None:
+        writer.start()
+        group_commit.writer = writer
+    try:
+        yield
+    finally:
+        if writer is not None:
+            group_commit.writer = None
+            writer.stop()
+        if compactor is not None:
+            compactor.stop()
 
-models.Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Quli Quiz API",
     description="API for the Quli Quiz application",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.include_router(routes.router, tags=["questions", "quizzes"])
 
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Record latency, in-flight requests and database activity per route."""
+    request_stats = metrics.RequestStats()
+    token = metrics.current_request.set(request_stats)
+    metrics.REQUESTS_IN_FLIGHT.inc(method=request.method)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.REQUESTS_IN_FLIGHT.dec(method=request.method)
+        metrics.current_request.reset(token)
+        # Label by route template, not raw path, to keep cardinality bounded
+        route = getattr(request.scope.get("route"), "path", "<unmatched>")
+        metrics.REQUEST_DURATION.observe(
+            elapsed, method=request.method, route=route, status=str(status)
+        )
+        metrics.DB_QUERIES_PER_REQUEST.observe(request_stats.queries, route=route)
+        metrics.DB_TIME_PER_REQUEST.observe(request_stats.db_time, route=route)
+
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Quli Quiz API"}
 
 
-def start():
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    return Response(content=metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@click.command()
+@click.option("--host", default=lambda: os.getenv("QULI_API_HOST", "0.0.0.0"), help="Bind address")
+@click.option(
+    "--port", type=int, default=lambda: int(os.getenv("QULI_API_PORT", "8000")), help="Bind port"
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=lambda: int(os.getenv("QULI_API_WORKERS", "1")),
+    help="Number of worker processes",
+)
+@click.option("--reload", is_flag=True, help="Reload on code changes (development only)")
+@click.option(
+    "--graceful-timeout",
+    type=int,
+    default=30,
+    show_default=True,
+    help="Seconds to let in-flight requests finish on shutdown",
+)
+@click.option(
+    "--init-db/--no-init-db",
+    "create_schema",
+    default=True,
+    show_default=True,
+    help="Create or upgrade the database schema before starting",
+)
+@click.option("--init-db-only", is_flag=True, help="Create or upgrade the database schema and exit")
+def start(
+    host: str,
+    port: int,
+    workers: int,
+    reload: bool,
+    graceful_timeout: int,
+    create_schema: bool,
+    init_db_only: bool,
+) -> None:
     """Entry point for the API server."""
     import uvicorn
 
-    uvicorn.run("quli_quiz.api.main:app", host="0.0.0.0", port=8000, reload=True)
+    if reload and workers > 1:
+        raise click.UsageError("--reload cannot be combined with --workers")
+
+    # Schema setup runs once here, before any worker starts, instead of in every worker
+    if create_schema or init_db_only:
+        init_db()
+    if init_db_only:
+        click.echo("Database schema is up to date.")
+        return
+
+    # Single-process servers use the already imported app; reload and multi-worker
+    # modes need an import string, and importing above has already validated the app
+    uvicorn.run(
+        "quli_quiz.api.main:app" if reload or workers > 1 else app,
+        host=host,
+        port=port,
+        workers=workers,
+        reload=reload,
+        timeout_graceful_shutdown=graceful_timeout,
+    )
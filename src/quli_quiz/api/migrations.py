@@ -0,0 +1,133 @@
+"""In-place upgrade of databases created by earlier releases.
+
+``create_all`` only creates missing tables. Columns, keys and indexes that changed on
+existing tables are brought up to date here, before ``create_all`` runs. Every step
+checks the live schema first, so upgrading is idempotent and a no-op on a current
+database. All steps run in one transaction.
+"""
+
+import json
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from quli_quiz.api import models
+from quli_quiz.api.database import Base
+from quli_quiz.models import Question
+
+# Indexes of earlier releases that the current schema no longer has
+_DROPPED_INDEXES = ["ix_questions_question_text"]
+
+
+def upgrade_schema(bind: Engine) -> None:
+    """Upgrade an existing SQLite database to the current schema."""
+    if bind.dialect.name != "sqlite":
+        return
+    with bind.connect() as connection:
+        # pysqlite does not open transactions for DDL; take the write lock explicitly so
+        # a failed upgrade rolls back entirely and concurrent upgrades run one at a time
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+        _upgrade(connection)
+        connection.commit()
+
+
+def _upgrade(connection: Connection) -> None:
+    tables = set(inspect(connection).get_table_names())
+    if not tables:
+        return
+
+    links = models.QuizQuestionLink.__table__
+    if links.name in tables and "position" not in _column_names(connection, links.name):
+        _rebuild_question_links(connection)
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        existing = _column_names(connection, table.name)
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=connection.dialect)
+                connection.exec_driver_sql(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                )
+
+    if models.QuestionModel.__tablename__ in tables:
+        _backfill_question_hashes(connection)
+
+    for index_name in _DROPPED_INDEXES:
+        connection.exec_driver_sql(f"DROP INDEX IF EXISTS {index_name}")
+    for table in Base.metadata.sorted_tables:
+        if table.name in tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
+
+def _column_names(connection: Connection, table_name: str) -> set[str]:
+    return {column["name"] for column in inspect(connection).get_columns(table_name)}
+
+
+def _rebuild_question_links(connection: Connection) -> None:
+    """Re-key quiz/question links on (quiz_id, position).
+
+    Earlier releases keyed links on (quiz_id, question_id) and stored no order; quizzes
+    were served and graded in question id order, so stored answer indexes refer to that
+    order and it becomes the position.
+    """
+    connection.exec_driver_sql("ALTER TABLE quiz_question_links RENAME TO quiz_question_links_old")
+    models.QuizQuestionLink.__table__.create(connection)
+    connection.exec_driver_sql(
+        """
+        INSERT INTO quiz_question_links (quiz_id, position, question_id)
+        SELECT quiz_id, ROW_NUMBER() OVER (PARTITION BY quiz_id ORDER BY question_id) - 1,
+               question_id
+        FROM quiz_question_links_old
+        """
+    )
+    connection.exec_driver_sql("DROP TABLE quiz_question_links_old")
+
+
+def _backfill_question_hashes(connection: Connection) -> None:
+    """Content-address questions stored without a hash, merging duplicates.
+
+    Earlier releases stored every generated question as a new row. Rows with the same
+    content hash are merged into the one with the lowest id, and links are repointed.
+    """
+    canonical = dict(
+        connection.execute(
+            text("SELECT content_hash, id FROM questions WHERE content_hash IS NOT NULL")
+        ).all()
+    )
+    rows = connection.execute(
+        text(
+            "SELECT id, question_text, question_type, options, correct_answer, difficulty,"
+            " explanation FROM questions WHERE content_hash IS NULL ORDER BY id"
+        )
+    ).all()
+
+    hashed, merged = [], []
+    for row in rows:
+        question = Question(
+            question_text=row.question_text,
+            question_type=row.question_type,
+            options=json.loads(row.options),
+            correct_answer=row.correct_answer,
+            difficulty=row.difficulty,
+            explanation=row.explanation,
+        )
+        content_hash = models.question_content_hash(question)
+        kept = canonical.setdefault(content_hash, row.id)
+        if kept == row.id:
+            hashed.append({"id": row.id, "content_hash": content_hash})
+        else:
+            merged.append({"id": row.id, "kept": kept})
+
+    if merged:
+        connection.execute(
+            text("UPDATE quiz_question_links SET question_id = :kept WHERE question_id = :id"),
+            merged,
+        )
+        connection.execute(text("DELETE FROM questions WHERE id = :id"), merged)
+    if hashed:
+        connection.execute(
+            text("UPDATE questions SET content_hash = :content_hash WHERE id = :id"), hashed
+        )
@@ -1,14 +1,44 @@
-from sqlalchemy import JSON, Boolean, Column, Float, ForeignKey, Integer, String
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    String,
+)
 from sqlalchemy.orm import relationship
 
 from quli_quiz.api.database import Base
+from quli_quiz.models import Question
+
+
+def utcnow() -> datetime:
+    """Current UTC time as a naive datetime, as stored in SQLite."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def question_content_hash(question: Question) -> str:
+    """Return the content address of a question.
+
+    This is :meth:`Question.fingerprint`: the digest covers the normalized question
+    text, options (in order), correct answer and question type, so the same question
+    generated for different quizzes maps to a single stored row. Difficulty and
+    explanation are not part of the identity.
+    """
+    return question.fingerprint()
 
 
 class QuestionModel(Base):
     __tablename__ = "questions"
 
     id = Column(Integer, primary_key=True, index=True)
-    question_text = Column(String, index=True)
+    content_hash = Column(String(64), unique=True, index=True)  # See question_content_hash
+    question_text = Column(String)
     question_type = Column(String)
     options = Column(JSON)  # Store list of strings as JSON
     correct_answer = Column(String)
@@ -24,8 +54,11 @@ class QuizModel(Base):
     id = Column(Integer, primary_key=True, index=True)
     topic = Column(String, index=True)
     config = Column(JSON)  # Store QuizConfig as JSON
+    content_hash = Column(String(64), nullable=True)  # Digest of the serialized QuizRead
 
-    questions = relationship("QuizQuestionLink", back_populates="quiz")
+    questions = relationship(
+        "QuizQuestionLink", back_populates="quiz", order_by="QuizQuestionLink.position"
+    )
     results = relationship("QuizResultModel", back_populates="quiz")
 
 
@@ -33,7 +66,8 @@ class QuizQuestionLink(Base):
     __tablename__ = "quiz_question_links"
 
     quiz_id = Column(Integer, ForeignKey("quizzes.id"), primary_key=True)
-    question_id = Column(Integer, ForeignKey("questions.id"), primary_key=True)
+    position = Column(Integer, primary_key=True)  # Order of the question within the quiz
+    question_id = Column(Integer, ForeignKey("questions.id"), index=True)
 
     quiz = relationship("QuizModel", back_populates="questions")
     question = relationship("QuestionModel", back_populates="quizzes")
@@ -61,6 +95,111 @@ class QuizResultModel(Base):
     total_questions = Column(Integer)
     correct_answers = Column(Integer)
     time_taken = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=utcnow, index=True)
 
     quiz = relationship("QuizModel", back_populates="results")
     answers = relationship("UserAnswerModel", back_populates="result")
+
+
+class AttemptModel(Base):
+    """A quiz being taken one answer at a time; finishing it produces a result."""
+
+    __tablename__ = "attempts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id"), index=True)
+    status = Column(String(16), nullable=False, default="in_progress")  # or "finished"
+    total_questions = Column(Integer, nullable=False)
+    answered_count = Column(Integer, nullable=False, default=0)
+    correct_count = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, default=utcnow)
+    last_answer_at = Column(DateTime, nullable=True)  # Server clock; start of the next answer
+    finished_at = Column(DateTime, nullable=True)
+    result_id = Column(Integer, ForeignKey("quiz_results.id"), nullable=True)
+
+
+class AttemptAnswerModel(Base):
+    """An answer recorded during an attempt, graded when it was given."""
+
+    __tablename__ = "attempt_answers"
+
+    attempt_id = Column(Integer, ForeignKey("attempts.id"), primary_key=True)
+    question_index = Column(Integer, primary_key=True)
+    answer = Column(String)
+    is_correct = Column(Boolean)
+    time_taken = Column(Float)
+
+
+class ArchivedAnswersModel(Base):
+    """All answers of an old result packed into one blob (see api/archive.py)."""
+
+    __tablename__ = "archived_answers"
+
+    result_id = Column(Integer, ForeignKey("quiz_results.id"), primary_key=True)
+    answer_count = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+
+
+class QuizStatsModel(Base):
+    """Running aggregates over all results of a quiz, updated on every submission."""
+
+    __tablename__ = "quiz_stats"
+
+    quiz_id = Column(Integer, ForeignKey("quizzes.id"), primary_key=True)
+    topic = Column(String, index=True)
+    attempt_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_sq_sum = Column(Float, nullable=False, default=0.0)
+    mean_score = Column(Float, nullable=False, default=0.0, index=True)
+    best_score = Column(Float, nullable=False, default=0.0)
+
+
+class QuestionStatsModel(Base):
+    """Per-question answer counters for a quiz."""
+
+    __tablename__ = "question_stats"
+
+    quiz_id = Column(Integer, ForeignKey("quizzes.id"), primary_key=True)
+    question_index = Column(Integer, primary_key=True)
+    answered_count = Column(Integer, nullable=False, default=0)
+    correct_count = Column(Integer, nullable=False, default=0)
+
+
+class DifficultyStatsModel(Base):
+    """Per-difficulty answer counters for a quiz."""
+
+    __tablename__ = "difficulty_stats"
+
+    quiz_id = Column(Integer, ForeignKey("quizzes.id"), primary_key=True)
+    difficulty = Column(String, primary_key=True)
+    answered_count = Column(Integer, nullable=False, default=0)
+    correct_count = Column(Integer, nullable=False, default=0)
+
+
+class TopicStatsModel(Base):
+    """Running aggregates over all results of all quizzes on a topic."""
+
+    __tablename__ = "topic_stats"
+
+    topic = Column(String, primary_key=True)
+    attempt_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_sq_sum = Column(Float, nullable=False, default=0.0)
+    mean_score = Column(Float, nullable=False, default=0.0, index=True)
+    best_score = Column(Float, nullable=False, default=0.0)
+
+
+class IdempotencyKeyModel(Base):
+    """A claimed Idempotency-Key and, once finished, the response to replay for it."""
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)  # Digest of endpoint scope and body
+    status = Column(String(16), nullable=False)  # "in_progress" or "completed"
+    status_code = Column(Integer, nullable=True)
+    media_type = Column(String, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime, default=utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    locked_until = Column(DateTime, nullable=True)  # End of an in-progress claim's lease
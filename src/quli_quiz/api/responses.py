@@ -0,0 +1,37 @@
+"""Fast JSON serialization for API responses."""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+try:  # orjson is optional (pip install quli-quiz[fast])
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def dump_json(content: Any) -> bytes:
+    """Serialize a response payload to JSON bytes.
+
+    Pydantic models go straight through their compiled serializer, skipping the
+    ``jsonable_encoder`` round trip through plain dicts. Other payloads use orjson
+    when it is installed.
+    """
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    if orjson is not None:
+        return orjson.dumps(content)
+    return to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response that renders Pydantic models directly to bytes.
+
+    Return an instance from an endpoint (``return FastJSONResponse(model)``) to bypass
+    FastAPI's response_model validation and encoding for payloads we built ourselves.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
@@ -1,27 +1,98 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-
-from quli_quiz.api import models, schemas
+import time
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from quli_quiz.api import (
+    adapters,
+    admission,
+    archive,
+    exports,
+    group_commit,
+    idempotency,
+    metrics,
+    models,
+    schemas,
+    search,
+    stats,
+    submissions,
+)
+from quli_quiz.api.answer_keys import get_answer_key, load_answer_keys
+from quli_quiz.api.cache import (
+    QUIZ_CACHE_CONTROL,
+    CachedResponse,
+    content_hash,
+    etag_matches,
+    format_etag,
+    quiz_object_cache,
+    quiz_response_cache,
+)
 from quli_quiz.api.database import get_db
+from quli_quiz.api.responses import FastJSONResponse, dump_json
 from quli_quiz.generator import QuizGenerator
-from quli_quiz.models import Difficulty, Question, QuestionType, Quiz, QuizConfig, UserAnswer
+from quli_quiz.models import Difficulty, Question, Quiz
 
 router = APIRouter()
 
 
-@router.post("/quizzes/", response_model=schemas.QuizRead)
-def create_quiz(quiz: schemas.QuizCreate, db: Session = Depends(get_db)):  # noqa: B008
-    # Initialize generator
+@router.post("/quizzes/", response_model=schemas.QuizRead, response_class=FastJSONResponse)
+def create_quiz(
+    quiz: schemas.QuizCreate,
+    request: Request,
+    db: Session = Depends(get_db),  # noqa: B008
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),  # noqa: B008
+):
+    if idempotency_key is None:
+        return _create_quiz(quiz, request, db)
+    # A retried request replays the stored quiz instead of paying for another generation
+    return idempotency.idempotency_store.run(
+        db, idempotency_key, "create_quiz", dump_json(quiz), lambda: _create_quiz(quiz, request, db)
+    )
+
+
+def _create_quiz(quiz: schemas.QuizCreate, request: Request, db: Session) -> Response:
+    # Shed load before starting an LLM call: per-client rate limit, then global capacity
+    client_id = request.client.host if request.client else "unknown"
     try:
-        generator = QuizGenerator()
-    except ValueError as e:
-        raise HTTPException(status_code=500, detail=str(e)) from e
+        admission.generation_rate_limiter.check(client_id)
+    except admission.OverloadedError as e:
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": e.retry_after_header}
+        ) from e
 
-    # Generate quiz
     try:
-        generated_quiz = generator.generate_quiz(quiz.config)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate quiz: {str(e)}") from e
+        with admission.generation_admission.admit():
+            # Initialize generator
+            try:
+                generator = QuizGenerator()
+            except ValueError as e:
+                raise HTTPException(status_code=500, detail=str(e)) from e
+
+            # Generate quiz
+            generation_start = time.perf_counter()
+            try:
+                generated_quiz = generator.generate_quiz(quiz.config)
+            except Exception as e:
+                metrics.GENERATOR_DURATION.observe(
+                    time.perf_counter() - generation_start, outcome="error"
+                )
+                raise HTTPException(
+                    status_code=500, detail=f"Failed to generate quiz: {str(e)}"
+                ) from e
+            metrics.GENERATOR_DURATION.observe(
+                time.perf_counter() - generation_start, outcome="success"
+            )
+    except admission.OverloadedError as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": e.retry_after_header}
+        ) from e
+
+    store_start = time.perf_counter()
 
     # Create QuizModel
     db_quiz = models.QuizModel(
@@ -31,172 +102,544 @@ def create_quiz(quiz: schemas.QuizCreate, db: Session = Depends(get_db)):  # noq
     db.add(db_quiz)
     db.flush()  # Flush to get ID
 
-    # Save questions and link them
+    # Questions are content-addressed: reuse stored rows and only insert new ones
+    hashes = [models.question_content_hash(q) for q in generated_quiz.questions]
+    stored = {
+        row.content_hash: row
+        for row in db.query(models.QuestionModel)
+        .filter(models.QuestionModel.content_hash.in_(set(hashes)))
+        .all()
+    }
+
     db_questions = []
-    for q in generated_quiz.questions:
-        # Create QuestionModel
-        db_q = models.QuestionModel(
-            question_text=q.question_text,
-            question_type=q.question_type.value,
-            options=q.options,
-            correct_answer=q.correct_answer,
-            difficulty=q.difficulty.value,
-            explanation=q.explanation,
-        )
-        db.add(db_q)
-        db.flush()  # Get ID
+    for position, (q, question_hash) in enumerate(
+        zip(generated_quiz.questions, hashes, strict=True)
+    ):
+        db_q = stored.get(question_hash)
+        if db_q is None:
+            db_q = _store_question(db, q, question_hash)
+            stored[question_hash] = db_q
 
         # Link to quiz
-        link = models.QuizQuestionLink(quiz_id=db_quiz.id, question_id=db_q.id)
+        link = models.QuizQuestionLink(quiz_id=db_quiz.id, position=position, question_id=db_q.id)
         db.add(link)
 
-        # Add to list for response
-        # We need to manually construct the Pydantic model from the DB model to match the schema
-        # or rely on the relationship if we commit and refresh.
-        # However, the relationship returns QuizQuestionLink objects, not QuestionModel objects directly
-        # in the way Pydantic expects for `questions: list[Question]`.
-        # The schema QuizRead expects `questions: list[Question]`.
-        # But `db_quiz.questions` is a list of `QuizQuestionLink`.
-        # We need to fix the response model or the schema.
-
-        # Actually, let's fix the schema to handle this or construct the response manually.
-        # For now, let's just append the Pydantic question object we already have,
-        # but we need the ID.
-        q_read = schemas.QuestionRead(id=db_q.id, **q.model_dump())
-        db_questions.append(q_read)
+        # Reused questions keep their stored explanation and difficulty, so build the
+        # response from the row rather than from the generated question
+        db_questions.append(adapters.question_read(db_q))
+
+    # Construct response manually to avoid relationship mapping issues for now.
+    # Use the stored config so this body matches what GET /quizzes/{id} serves.
+    quiz_read = schemas.QuizRead(
+        id=db_quiz.id, topic=db_quiz.topic, questions=db_questions, config=generated_quiz.config
+    )
+
+    # Quizzes are immutable, so the digest of the response doubles as a strong ETag
+    body = dump_json(quiz_read)
+    db_quiz.content_hash = content_hash(body)
 
     db.commit()
-    db.refresh(db_quiz)
+    metrics.STAGE_DURATION.observe(
+        time.perf_counter() - store_start, endpoint="create_quiz", stage="store"
+    )
 
-    # Construct response manually to avoid relationship mapping issues for now
-    return schemas.QuizRead(
-        id=db_quiz.id, topic=db_quiz.topic, questions=db_questions, config=quiz.config
+    cached = CachedResponse(format_etag(db_quiz.content_hash), body)
+    quiz_response_cache.put(db_quiz.id, cached)
+    return Response(content=body, media_type="application/json", headers={"ETag": cached.etag})
+
+
+def _store_question(db: Session, question: Question, question_hash: str) -> models.QuestionModel:
+    """Insert a question, or return the row a concurrent request stored first."""
+    db_q = models.QuestionModel(
+        content_hash=question_hash,
+        question_text=question.question_text,
+        question_type=question.question_type.value,
+        options=question.options,
+        correct_answer=question.correct_answer,
+        difficulty=question.difficulty.value,
+        explanation=question.explanation,
     )
+    try:
+        with db.begin_nested():
+            db.add(db_q)
+    except IntegrityError:
+        db_q = (
+            db.query(models.QuestionModel)
+            .filter(models.QuestionModel.content_hash == question_hash)
+            .one()
+        )
+    return db_q
 
 
-def check_answer(question: models.QuestionModel, answer: str) -> bool:
-    """Check if the answer is correct (logic from engine.py)."""
-    # Normalize answers for comparison
-    correct = question.correct_answer.strip().lower()
-    user_answer = answer.strip().lower()
+def _get_quiz(db: Session, quiz_id: int) -> Quiz:
+    """Return the Quiz Pydantic object of a stored quiz, cached across requests."""
+    quiz = quiz_object_cache.get(quiz_id)
+    if quiz is None:
+        quiz = adapters.quiz(db.get(models.QuizModel, quiz_id))
+        quiz_object_cache.put(quiz_id, quiz)
+    return quiz
 
-    # For multiple choice, check if answer matches or if it's an option index
-    if question.question_type == "multiple_choice":
-        # Check direct match
-        if user_answer == correct:
-            return True
-        # Check if answer is an option letter (A, B, C, D)
-        option_letters = ["a", "b", "c", "d"]
-        if user_answer in option_letters:
-            option_index = option_letters.index(user_answer)
-            if option_index < len(question.options):
-                return question.options[option_index].strip().lower() == correct
-    elif question.question_type == "true_false":
-        # For true/false, check exact match
-        return user_answer == correct
 
-    return False
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": QUIZ_CACHE_CONTROL})
 
 
-@router.post("/quizzes/{quiz_id}/submit", response_model=schemas.QuizResultRead)
-def submit_quiz(quiz_id: int, submission: schemas.QuizSubmission, db: Session = Depends(get_db)):  # noqa: B008
-    quiz = db.query(models.QuizModel).filter(models.QuizModel.id == quiz_id).first()
-    if not quiz:
-        raise HTTPException(status_code=404, detail="Quiz not found")
+@router.get("/quizzes/{quiz_id}", response_model=schemas.QuizRead)
+def read_quiz(quiz_id: int, request: Request, db: Session = Depends(get_db)):  # noqa: B008
+    if_none_match = request.headers.get("if-none-match")
+
+    # Hot quizzes are served straight from the serialized response cache
+    cached = quiz_response_cache.get(quiz_id)
+    if cached is None:
+        # Only the stored digest is needed to answer a conditional request
+        stored_hash = (
+            db.query(models.QuizModel.content_hash).filter(models.QuizModel.id == quiz_id).first()
+        )
+        if stored_hash is None:
+            raise HTTPException(status_code=404, detail="Quiz not found")
+        if stored_hash.content_hash and etag_matches(
+            if_none_match, format_etag(stored_hash.content_hash)
+        ):
+            return _not_modified(format_etag(stored_hash.content_hash))
+
+        quiz = db.get(models.QuizModel, quiz_id)
+        body = dump_json(adapters.quiz_read(quiz))
+        digest = content_hash(body)
+        if quiz.content_hash is None:
+            # Quizzes stored before digests existed get theirs on first read
+            quiz.content_hash = digest
+            db.commit()
+        cached = CachedResponse(format_etag(digest), body)
+        quiz_response_cache.put(quiz_id, cached)
+
+    if etag_matches(if_none_match, cached.etag):
+        return _not_modified(cached.etag)
+    return Response(
+        content=cached.body,
+        media_type="application/json",
+        headers={"ETag": cached.etag, "Cache-Control": QUIZ_CACHE_CONTROL},
+    )
 
-    # Get questions (assuming order is stable/consistent with what client saw)
-    # Ideally we should sort by ID or something deterministic
-    # quiz.questions is a list of QuizQuestionLink
-    quiz_links = sorted(quiz.questions, key=lambda x: x.question_id)
 
-    if not quiz_links:
-        raise HTTPException(status_code=400, detail="Quiz has no questions")
+@router.post(
+    "/quizzes/{quiz_id}/submit",
+    response_model=schemas.QuizResultRead,
+    response_class=FastJSONResponse,
+)
+def submit_quiz(
+    quiz_id: int,
+    submission: schemas.QuizSubmission,
+    db: Session = Depends(get_db),  # noqa: B008
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),  # noqa: B008
+):
+    if idempotency_key is None:
+        return _submit_quiz(quiz_id, submission, db)
+    # A retried submission returns the original result instead of recording another one
+    return idempotency.idempotency_store.run(
+        db,
+        idempotency_key,
+        f"submit_quiz:{quiz_id}",
+        dump_json(submission),
+        lambda: _submit_quiz(quiz_id, submission, db),
+    )
 
-    correct_count = 0
-    total_questions = len(quiz_links)
-    user_answers_db = []
 
-    for ans in submission.answers:
-        if ans.question_index < 0 or ans.question_index >= total_questions:
-            continue
+def _submit_quiz(quiz_id: int, submission: schemas.QuizSubmission, db: Session) -> Response:
+    with metrics.stage("submit_quiz", "load"):
+        # Hot quizzes are graded from the shared answer key without touching the database
+        answer_key = get_answer_key(db, quiz_id)
+        if answer_key is None:
+            raise HTTPException(status_code=404, detail="Quiz not found")
+        if not answer_key:
+            raise HTTPException(status_code=400, detail="Quiz has no questions")
 
-        link = quiz_links[ans.question_index]
-        question = link.question
-
-        # Check answer
-        is_correct = check_answer(question, ans.answer)
-        if is_correct:
-            correct_count += 1
-
-        user_answers_db.append(
-            {
-                "question_index": ans.question_index,
-                "answer": ans.answer,
-                "is_correct": is_correct,
-                "time_taken": ans.time_taken,
-            }
+    with metrics.stage("submit_quiz", "grade"):
+        graded = submissions.grade_submission(
+            quiz_id, answer_key.topic, answer_key.questions, submission.answers
         )
 
-    score = (correct_count / total_questions * 100) if total_questions > 0 else 0.0
+    pydantic_quiz = _get_quiz(db, quiz_id)
+
+    with metrics.stage("submit_quiz", "store"):
+        writer = group_commit.writer
+        if writer is not None:
+            # Share a transaction (and fsync) with concurrent submissions. End this
+            # session's read transaction first so it cannot hold up the writer's commit.
+            db.rollback()
+            try:
+                result_id = writer.save(graded)
+            except TimeoutError as e:
+                # Withdrawn from the queue, so nothing was stored and a retry is safe
+                raise HTTPException(
+                    status_code=503,
+                    detail="Timed out waiting to store the result",
+                    headers={"Retry-After": "1"},
+                ) from e
+        else:
+            (result_id,) = submissions.save_results(db, [graded])
+            db.commit()
+
+    # Graded by us from validated input, so the response is built without revalidation
+    return FastJSONResponse(
+        adapters.quiz_result_read(
+            result_id,
+            pydantic_quiz,
+            [
+                adapters.user_answer(a.question_index, a.answer, a.is_correct, a.time_taken)
+                for a in graded.answers
+            ],
+            graded.score,
+            graded.total_questions,
+            graded.correct_answers,
+            graded.time_taken,
+        )
+    )
 
-    # Create Result
-    db_result = models.QuizResultModel(
-        quiz_id=quiz_id,
-        score=score,
-        total_questions=total_questions,
-        correct_answers=correct_count,
-        time_taken=sum(a["time_taken"] or 0 for a in user_answers_db),
+
+@router.get(
+    "/results/{result_id}",
+    response_model=schemas.QuizResultRead,
+    response_class=FastJSONResponse,
+)
+def read_result(result_id: int, db: Session = Depends(get_db)):  # noqa: B008
+    result = db.get(models.QuizResultModel, result_id)
+    if not result:
+        raise HTTPException(status_code=404, detail="Result not found")
+
+    return FastJSONResponse(
+        adapters.quiz_result_read(
+            result.id,
+            _get_quiz(db, result.quiz_id),
+            # Answers may live in user_answers or in the compact archive
+            archive.load_answers(db, result),
+            result.score,
+            result.total_questions,
+            result.correct_answers,
+            result.time_taken,
+        )
     )
-    db.add(db_result)
-    db.flush()
 
-    # Add answers
-    for ans_data in user_answers_db:
-        db_ans = models.UserAnswerModel(result_id=db_result.id, **ans_data)
-        db.add(db_ans)
 
+@router.post(
+    "/quizzes/{quiz_id}/attempts",
+    response_model=schemas.AttemptRead,
+    status_code=201,
+    response_class=FastJSONResponse,
+)
+def create_attempt(quiz_id: int, db: Session = Depends(get_db)):  # noqa: B008
+    answer_key = get_answer_key(db, quiz_id)
+    if answer_key is None:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+    if not answer_key:
+        raise HTTPException(status_code=400, detail="Quiz has no questions")
+
+    attempt = models.AttemptModel(
+        quiz_id=quiz_id, status="in_progress", total_questions=len(answer_key)
+    )
+    db.add(attempt)
     db.commit()
-    db.refresh(db_result)
-
-    # Reconstruct Quiz Pydantic object
-    quiz_questions = []
-    # Sort links by question_id (same as we did for checking)
-    sorted_links = sorted(quiz.questions, key=lambda x: x.question_id)
-    for link in sorted_links:
-        q = link.question
-        quiz_questions.append(
-            Question(
-                question_text=q.question_text,
-                question_type=QuestionType(q.question_type),
-                options=q.options,
-                correct_answer=q.correct_answer,
-                difficulty=Difficulty(q.difficulty),
-                explanation=q.explanation,
-            )
+    return FastJSONResponse(schemas.AttemptRead.model_validate(attempt), status_code=201)
+
+
+@router.get(
+    "/attempts/{attempt_id}", response_model=schemas.AttemptRead, response_class=FastJSONResponse
+)
+def read_attempt(attempt_id: int, db: Session = Depends(get_db)):  # noqa: B008
+    attempt = db.get(models.AttemptModel, attempt_id)
+    if not attempt:
+        raise HTTPException(status_code=404, detail="Attempt not found")
+    return FastJSONResponse(schemas.AttemptRead.model_validate(attempt))
+
+
+@router.post(
+    "/attempts/{attempt_id}/answers",
+    response_model=schemas.AttemptAnswerRead,
+    response_class=FastJSONResponse,
+)
+def answer_attempt(
+    attempt_id: int,
+    answer: schemas.AttemptAnswerSubmit,
+    db: Session = Depends(get_db),  # noqa: B008
+):
+    answered_at = models.utcnow()
+    attempt = db.get(models.AttemptModel, attempt_id)
+    if not attempt:
+        raise HTTPException(status_code=404, detail="Attempt not found")
+    if attempt.status != "in_progress":
+        raise HTTPException(status_code=409, detail="Attempt is already finished")
+
+    # Grade against the shared answer key: no quiz or question reads per answer
+    answer_key = get_answer_key(db, attempt.quiz_id)
+    if answer.question_index < 0 or answer.question_index >= len(answer_key):
+        raise HTTPException(status_code=400, detail="Question index out of range")
+    is_correct = answer_key.questions[answer.question_index].is_correct(answer.answer)
+
+    # Time the answer from the previous one (or the start) by the server's clock
+    time_taken = (answered_at - (attempt.last_answer_at or attempt.started_at)).total_seconds()
+    db.add(
+        models.AttemptAnswerModel(
+            attempt_id=attempt.id,
+            question_index=answer.question_index,
+            answer=answer.answer,
+            is_correct=is_correct,
+            time_taken=time_taken,
         )
+    )
+    try:
+        db.flush()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Question was already answered") from e
+
+    # Count in SQL: concurrent answers to one attempt would lose read-modify-write updates
+    answered_count = db.execute(
+        update(models.AttemptModel)
+        .where(models.AttemptModel.id == attempt.id, models.AttemptModel.status == "in_progress")
+        .values(
+            answered_count=models.AttemptModel.answered_count + 1,
+            correct_count=models.AttemptModel.correct_count + int(is_correct),
+            last_answer_at=answered_at,
+        )
+        .returning(models.AttemptModel.answered_count)
+    ).scalar()
+    if answered_count is None:
+        # Finished while this answer was being graded
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Attempt is already finished")
+    db.commit()
 
-    pydantic_quiz = Quiz(
-        topic=quiz.topic, questions=quiz_questions, config=QuizConfig(**quiz.config)
+    return FastJSONResponse(
+        schemas.AttemptAnswerRead(
+            question_index=answer.question_index,
+            answer=answer.answer,
+            is_correct=is_correct,
+            time_taken=time_taken,
+            answered_count=answered_count,
+            total_questions=attempt.total_questions,
+        )
     )
 
-    # Reconstruct UserAnswers
-    pydantic_answers = []
-    for ans in db_result.answers:
-        pydantic_answers.append(
-            UserAnswer(
+
+@router.post(
+    "/attempts/{attempt_id}/finish",
+    response_model=schemas.QuizResultRead,
+    response_class=FastJSONResponse,
+)
+def finish_attempt(attempt_id: int, db: Session = Depends(get_db)):  # noqa: B008
+    attempt = db.get(models.AttemptModel, attempt_id)
+    if not attempt:
+        raise HTTPException(status_code=404, detail="Attempt not found")
+    if attempt.status == "finished":
+        # Finishing twice is harmless: return the result recorded the first time
+        return read_result(attempt.result_id, db)
+
+    # Claim the attempt first so concurrent finish calls record only one result
+    claimed = db.execute(
+        update(models.AttemptModel)
+        .where(models.AttemptModel.id == attempt.id, models.AttemptModel.status == "in_progress")
+        .values(status="finished", finished_at=models.utcnow())
+    ).rowcount
+    if not claimed:
+        db.rollback()
+        db.refresh(attempt)
+        return read_result(attempt.result_id, db)
+
+    answer_key = get_answer_key(db, attempt.quiz_id)
+    graded = submissions.GradedResult(
+        quiz_id=attempt.quiz_id, topic=answer_key.topic, total_questions=len(answer_key)
+    )
+    for ans in (
+        db.query(models.AttemptAnswerModel)
+        .filter(models.AttemptAnswerModel.attempt_id == attempt.id)
+        .order_by(models.AttemptAnswerModel.question_index)
+    ):
+        graded.answers.append(
+            submissions.GradedAnswer(
                 question_index=ans.question_index,
                 answer=ans.answer,
                 is_correct=ans.is_correct,
+                difficulty=answer_key.questions[ans.question_index].difficulty,
                 time_taken=ans.time_taken,
             )
         )
 
-    return schemas.QuizResultRead(
-        id=db_result.id,
-        quiz=pydantic_quiz,
-        answers=pydantic_answers,
-        score=db_result.score,
-        total_questions=db_result.total_questions,
-        correct_answers=db_result.correct_answers,
-        time_taken=db_result.time_taken,
+    (result_id,) = submissions.save_results(db, [graded])
+    db.execute(
+        update(models.AttemptModel)
+        .where(models.AttemptModel.id == attempt.id)
+        .values(result_id=result_id)
+    )
+    db.commit()
+    return read_result(result_id, db)
+
+
+@router.post(
+    "/submissions/batch",
+    response_model=schemas.BatchSubmissionRead,
+    response_class=FastJSONResponse,
+)
+def submit_batch(batch: schemas.BatchSubmission, db: Session = Depends(get_db)):  # noqa: B008
+    quiz_ids = {item.quiz_id for item in batch.submissions}
+
+    # Load every answer key once, in a single query across all quizzes
+    answer_keys = load_answer_keys(db, quiz_ids)
+
+    # Grade everything in memory, then store all results in one transaction
+    items: list[schemas.BatchSubmissionResult] = []
+    graded_results = []
+    for item in batch.submissions:
+        answer_key = answer_keys.get(item.quiz_id)
+        if answer_key is None:
+            items.append(
+                schemas.BatchSubmissionResult(quiz_id=item.quiz_id, error="Quiz not found")
+            )
+            continue
+        if not answer_key:
+            items.append(
+                schemas.BatchSubmissionResult(quiz_id=item.quiz_id, error="Quiz has no questions")
+            )
+            continue
+        graded = submissions.grade_submission(
+            item.quiz_id, answer_key.topic, answer_key.questions, item.answers
+        )
+        graded_results.append(graded)
+        items.append(
+            schemas.BatchSubmissionResult(
+                quiz_id=item.quiz_id,
+                score=graded.score,
+                total_questions=graded.total_questions,
+                correct_answers=graded.correct_answers,
+                time_taken=graded.time_taken,
+            )
+        )
+
+    result_ids = iter(submissions.save_results(db, graded_results))
+    db.commit()
+
+    for item in items:
+        if item.error is None:
+            item.result_id = next(result_ids)
+    return FastJSONResponse(schemas.BatchSubmissionRead(results=items))
+
+
+@router.get("/exports/results", response_class=StreamingResponse)
+def export_results(
+    db: Session = Depends(get_db),  # noqa: B008
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    topic: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+):
+    # The stream outlives this request's session, so it reads through its own
+    session_factory = sessionmaker(bind=db.get_bind(), autoflush=False)
+
+    def stream():
+        with session_factory() as export_db:
+            yield from exports.export_chunks(export_db, export_format, topic, since, until)
+
+    return StreamingResponse(
+        stream(),
+        media_type=exports.FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="results.{export_format}"'},
+    )
+
+
+@router.get("/quizzes/{quiz_id}/stats", response_model=schemas.QuizStatsRead)
+def get_quiz_stats(quiz_id: int, db: Session = Depends(get_db)):  # noqa: B008
+    quiz = db.get(models.QuizModel, quiz_id)
+    if not quiz:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+
+    quiz_stats = db.get(models.QuizStatsModel, quiz_id)
+    question_rows = (
+        db.query(models.QuestionStatsModel)
+        .filter(models.QuestionStatsModel.quiz_id == quiz_id)
+        .order_by(models.QuestionStatsModel.question_index)
+        .all()
+    )
+    difficulty_rows = (
+        db.query(models.DifficultyStatsModel)
+        .filter(models.DifficultyStatsModel.quiz_id == quiz_id)
+        .order_by(models.DifficultyStatsModel.difficulty)
+        .all()
+    )
+
+    attempt_count = quiz_stats.attempt_count if quiz_stats else 0
+    return schemas.QuizStatsRead(
+        quiz_id=quiz_id,
+        topic=quiz.topic,
+        attempt_count=attempt_count,
+        mean_score=quiz_stats.mean_score if quiz_stats else 0.0,
+        score_stddev=(
+            stats.score_stddev(attempt_count, quiz_stats.score_sum, quiz_stats.score_sq_sum)
+            if quiz_stats
+            else 0.0
+        ),
+        best_score=quiz_stats.best_score if quiz_stats else 0.0,
+        questions=[
+            schemas.QuestionStatsRead(
+                question_index=row.question_index,
+                answered_count=row.answered_count,
+                correct_count=row.correct_count,
+                accuracy=stats.accuracy(row.answered_count, row.correct_count),
+            )
+            for row in question_rows
+        ],
+        difficulties=[
+            schemas.DifficultyStatsRead(
+                difficulty=Difficulty(row.difficulty),
+                answered_count=row.answered_count,
+                correct_count=row.correct_count,
+                accuracy=stats.accuracy(row.answered_count, row.correct_count),
+            )
+            for row in difficulty_rows
+        ],
+    )
+
+
+@router.get("/leaderboard", response_model=schemas.LeaderboardRead)
+def get_leaderboard(
+    scope: Literal["quiz", "topic"] = "quiz",
+    limit: int = Query(10, ge=1, le=100),
+    min_attempts: int = Query(1, ge=1),
+    db: Session = Depends(get_db),  # noqa: B008
+):
+    # Both tables keep an indexed mean_score, so this is an index scan, not an aggregate
+    model = models.QuizStatsModel if scope == "quiz" else models.TopicStatsModel
+    rows = (
+        db.query(model)
+        .filter(model.attempt_count >= min_attempts)
+        .order_by(model.mean_score.desc(), model.attempt_count.desc())
+        .limit(limit)
+        .all()
+    )
+    return schemas.LeaderboardRead(
+        scope=scope,
+        entries=[
+            schemas.LeaderboardEntry(
+                quiz_id=getattr(row, "quiz_id", None),
+                topic=row.topic,
+                attempt_count=row.attempt_count,
+                mean_score=row.mean_score,
+                best_score=row.best_score,
+            )
+            for row in rows
+        ],
+    )
+
+
+@router.get("/questions/search", response_model=schemas.QuestionSearchRead)
+def search_questions(
+    q: str = Query(..., min_length=1, max_length=200),
+    topic: str | None = None,
+    difficulty: Difficulty | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),  # noqa: B008
+):
+    hits = search.search_questions(
+        db, q, topic=topic, difficulty=difficulty.value if difficulty else None, limit=limit
+    )
+    return schemas.QuestionSearchRead(
+        query=q,
+        results=[adapters.question_search_hit(row, rank) for row, rank in hits],
     )
@@ -1,6 +1,9 @@
-from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Literal
 
-from quli_quiz.models import Question, Quiz, QuizConfig, QuizResult, UserAnswer
+from pydantic import BaseModel, ConfigDict, Field
+
+from quli_quiz.models import Difficulty, Question, Quiz, QuizConfig, QuizResult, UserAnswer
 
 
 class QuestionCreate(Question):
@@ -17,6 +20,19 @@ class QuestionRead(Question):
     model_config = ConfigDict(from_attributes=True)
 
 
+class QuestionSearchHit(QuestionRead):
+    """Schema for a question matched by full-text search."""
+
+    rank: float
+
+
+class QuestionSearchRead(BaseModel):
+    """Schema for full-text search results, best match first."""
+
+    query: str
+    results: list[QuestionSearchHit]
+
+
 class QuizCreate(BaseModel):
     """Schema for creating a quiz."""
 
@@ -28,6 +44,7 @@ class QuizRead(Quiz):
     """Schema for reading a quiz."""
 
     id: int
+    questions: list[QuestionRead]
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -46,15 +63,126 @@ class UserAnswerSubmit(BaseModel):
     time_taken: float | None = None
 
 
+class AttemptRead(BaseModel):
+    """Schema for the progress of a quiz attempt."""
+
+    id: int
+    quiz_id: int
+    status: Literal["in_progress", "finished"]
+    total_questions: int
+    answered_count: int
+    correct_count: int
+    started_at: datetime
+    result_id: int | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AttemptAnswerSubmit(BaseModel):
+    """Schema for answering one question of an attempt."""
+
+    question_index: int
+    answer: str
+
+
+class AttemptAnswerRead(BaseModel):
+    """Schema for a graded answer of an attempt; timing is measured by the server."""
+
+    question_index: int
+    answer: str
+    is_correct: bool
+    time_taken: float
+    answered_count: int
+    total_questions: int
+
+
 class QuizSubmission(BaseModel):
     """Schema for submitting a complete quiz."""
 
     answers: list[UserAnswerSubmit]
 
 
+class BatchSubmissionItem(QuizSubmission):
+    """Schema for one submission within a batch."""
+
+    quiz_id: int
+
+
+class BatchSubmission(BaseModel):
+    """Schema for submitting many completed quizzes at once."""
+
+    submissions: list[BatchSubmissionItem] = Field(..., max_length=5000)
+
+
+class BatchSubmissionResult(BaseModel):
+    """Schema for the outcome of one submission within a batch."""
+
+    quiz_id: int
+    result_id: int | None = None
+    score: float | None = None
+    total_questions: int | None = None
+    correct_answers: int | None = None
+    time_taken: float | None = None
+    error: str | None = None
+
+
+class BatchSubmissionRead(BaseModel):
+    """Schema for the per-item outcomes of a batch submission, in request order."""
+
+    results: list[BatchSubmissionResult]
+
+
 class QuizResultRead(QuizResult):
     """Schema for reading quiz results."""
 
     id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class QuestionStatsRead(BaseModel):
+    """Schema for per-question answer statistics."""
+
+    question_index: int
+    answered_count: int
+    correct_count: int
+    accuracy: float
+
+
+class DifficultyStatsRead(BaseModel):
+    """Schema for per-difficulty answer statistics."""
+
+    difficulty: Difficulty
+    answered_count: int
+    correct_count: int
+    accuracy: float
+
+
+class QuizStatsRead(BaseModel):
+    """Schema for aggregate statistics of a quiz."""
+
+    quiz_id: int
+    topic: str
+    attempt_count: int
+    mean_score: float
+    score_stddev: float
+    best_score: float
+    questions: list[QuestionStatsRead]
+    difficulties: list[DifficultyStatsRead]
+
+
+class LeaderboardEntry(BaseModel):
+    """Schema for a single leaderboard row."""
+
+    quiz_id: int | None = None
+    topic: str
+    attempt_count: int
+    mean_score: float
+    best_score: float
+
+
+class LeaderboardRead(BaseModel):
+    """Schema for the leaderboard, ranked by mean score."""
+
+    scope: Literal["quiz", "topic"]
+    entries: list[LeaderboardEntry]
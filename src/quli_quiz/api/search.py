@@ -0,0 +1,120 @@
+"""Full-text search over the question bank using SQLite FTS5."""
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from quli_quiz.api import models
+from quli_quiz.api.database import Base
+
+FTS_TABLE = "questions_fts"
+
+# External-content FTS5 index: the text lives in `questions`, the index only stores
+# tokens, and triggers keep both in sync on every insert, update and delete.
+_CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        question_text, options, explanation,
+        content='questions', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON questions BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, question_text, options, explanation)
+        VALUES (new.id, new.question_text, new.options, new.explanation);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON questions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, question_text, options, explanation)
+        VALUES ('delete', old.id, old.question_text, old.options, old.explanation);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON questions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, question_text, options, explanation)
+        VALUES ('delete', old.id, old.question_text, old.options, old.explanation);
+        INSERT INTO {FTS_TABLE}(rowid, question_text, options, explanation)
+        VALUES (new.id, new.question_text, new.options, new.explanation);
+    END
+    """,
+]
+
+# bm25 column weights: question text, options, explanation
+_RANK = f"bm25({FTS_TABLE}, 10.0, 2.0, 1.0)"
+
+
+def ensure_search_index(connection: Connection) -> None:
+    """Create the FTS index and its triggers if missing, indexing existing questions."""
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE},
+    ).first()
+    for statement in _CREATE_STATEMENTS:
+        connection.exec_driver_sql(statement)
+    if not exists:
+        # Index questions stored before the index existed
+        connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection, **kw):
+    ensure_search_index(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def build_match_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every term quoted, all terms required."""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " ".join(f'"{term}"' for term in terms if term)
+
+
+def search_questions(
+    db: Session,
+    query: str,
+    topic: str | None = None,
+    difficulty: str | None = None,
+    limit: int = 20,
+) -> list[tuple[models.QuestionModel, float]]:
+    """Return questions matching ``query``, best match first, with their bm25 rank."""
+    match = build_match_query(query)
+    if not match:
+        return []
+
+    filters = []
+    params: dict[str, object] = {"match": match, "limit": limit}
+    if difficulty is not None:
+        filters.append("q.difficulty = :difficulty")
+        params["difficulty"] = difficulty
+    if topic is not None:
+        filters.append(
+            "EXISTS (SELECT 1 FROM quiz_question_links l JOIN quizzes z ON z.id = l.quiz_id "
+            "WHERE l.question_id = q.id AND z.topic = :topic COLLATE NOCASE)"
+        )
+        params["topic"] = topic
+
+    sql = f"""
+        SELECT q.id, {_RANK} AS rank
+        FROM {FTS_TABLE} JOIN questions q ON q.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH :match {"".join(" AND " + f for f in filters)}
+        ORDER BY rank
+        LIMIT :limit
+    """
+    ranked = db.execute(text(sql), params).all()
+    if not ranked:
+        return []
+
+    rows = {
+        row.id: row
+        for row in db.query(models.QuestionModel)
+        .filter(models.QuestionModel.id.in_([r.id for r in ranked]))
+        .all()
+    }
+    return [(rows[r.id], r.rank) for r in ranked]
@@ -0,0 +1,155 @@
+"""Incrementally maintained aggregate statistics for quiz results."""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from math import sqrt
+from typing import TYPE_CHECKING
+
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from quli_quiz.api import models
+
+if TYPE_CHECKING:
+    from quli_quiz.api.submissions import GradedResult
+
+
+@dataclass
+class _ScoreDelta:
+    attempt_count: int = 0
+    score_sum: float = 0.0
+    score_sq_sum: float = 0.0
+    best_score: float = 0.0
+
+    def add(self, score: float) -> None:
+        self.attempt_count += 1
+        self.score_sum += score
+        self.score_sq_sum += score * score
+        self.best_score = max(self.best_score, score)
+
+    def as_row(self) -> dict[str, float | int]:
+        return {
+            "attempt_count": self.attempt_count,
+            "score_sum": self.score_sum,
+            "score_sq_sum": self.score_sq_sum,
+            "mean_score": self.score_sum / self.attempt_count,
+            "best_score": self.best_score,
+        }
+
+
+def record_results(db: Session, results: Iterable["GradedResult"]) -> None:
+    """Fold graded results into the aggregate tables.
+
+    Deltas are summed in memory and applied with one upsert per table, so the cost
+    depends on the number of quizzes and questions touched rather than on how many
+    results were already recorded. The caller owns the transaction.
+    """
+    quiz_deltas: dict[int, _ScoreDelta] = {}
+    quiz_topics: dict[int, str] = {}
+    topic_deltas: dict[str, _ScoreDelta] = {}
+    question_deltas: dict[tuple[int, int], list[int]] = {}
+    difficulty_deltas: dict[tuple[int, str], list[int]] = {}
+
+    for result in results:
+        quiz_deltas.setdefault(result.quiz_id, _ScoreDelta()).add(result.score)
+        quiz_topics[result.quiz_id] = result.topic
+        topic_deltas.setdefault(result.topic, _ScoreDelta()).add(result.score)
+        for answer in result.answers:
+            counts = question_deltas.setdefault((result.quiz_id, answer.question_index), [0, 0])
+            counts[0] += 1
+            counts[1] += answer.is_correct
+            counts = difficulty_deltas.setdefault((result.quiz_id, answer.difficulty), [0, 0])
+            counts[0] += 1
+            counts[1] += answer.is_correct
+
+    if quiz_deltas:
+        _upsert_scores(
+            db,
+            models.QuizStatsModel,
+            "quiz_id",
+            [
+                {"quiz_id": quiz_id, "topic": quiz_topics[quiz_id], **delta.as_row()}
+                for quiz_id, delta in quiz_deltas.items()
+            ],
+        )
+        _upsert_scores(
+            db,
+            models.TopicStatsModel,
+            "topic",
+            [{"topic": topic, **delta.as_row()} for topic, delta in topic_deltas.items()],
+        )
+    if question_deltas:
+        _upsert_counts(
+            db,
+            models.QuestionStatsModel,
+            ["quiz_id", "question_index"],
+            [
+                {
+                    "quiz_id": quiz_id,
+                    "question_index": index,
+                    "answered_count": answered,
+                    "correct_count": correct,
+                }
+                for (quiz_id, index), (answered, correct) in question_deltas.items()
+            ],
+        )
+        _upsert_counts(
+            db,
+            models.DifficultyStatsModel,
+            ["quiz_id", "difficulty"],
+            [
+                {
+                    "quiz_id": quiz_id,
+                    "difficulty": difficulty,
+                    "answered_count": answered,
+                    "correct_count": correct,
+                }
+                for (quiz_id, difficulty), (answered, correct) in difficulty_deltas.items()
+            ],
+        )
+
+
+def _upsert_scores(db: Session, model: type, key: str, rows: list[dict]) -> None:
+    """Add score deltas to existing rows, inserting rows that do not exist yet."""
+    table = model.__table__
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[key],
+        set_={
+            "attempt_count": table.c.attempt_count + stmt.excluded.attempt_count,
+            "score_sum": table.c.score_sum + stmt.excluded.score_sum,
+            "score_sq_sum": table.c.score_sq_sum + stmt.excluded.score_sq_sum,
+            "mean_score": (table.c.score_sum + stmt.excluded.score_sum)
+            / (table.c.attempt_count + stmt.excluded.attempt_count),
+            "best_score": func.max(table.c.best_score, stmt.excluded.best_score),
+        },
+    )
+    db.execute(stmt, rows)
+
+
+def _upsert_counts(db: Session, model: type, keys: list[str], rows: list[dict]) -> None:
+    """Add answered/correct deltas to existing rows, inserting missing rows."""
+    table = model.__table__
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=keys,
+        set_={
+            "answered_count": table.c.answered_count + stmt.excluded.answered_count,
+            "correct_count": table.c.correct_count + stmt.excluded.correct_count,
+        },
+    )
+    db.execute(stmt, rows)
+
+
+def score_stddev(attempt_count: int, score_sum: float, score_sq_sum: float) -> float:
+    """Population standard deviation of scores from running sums."""
+    if attempt_count == 0:
+        return 0.0
+    mean = score_sum / attempt_count
+    return sqrt(max(score_sq_sum / attempt_count - mean * mean, 0.0))
+
+
+def accuracy(answered_count: int, correct_count: int) -> float:
+    """Percentage of correct answers, 0 when nothing was answered."""
+    return (correct_count / answered_count * 100) if answered_count > 0 else 0.0
@@ -0,0 +1,123 @@
+"""Grading and persistence of quiz submissions."""
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from quli_quiz.api import models, stats
+from quli_quiz.api.schemas import UserAnswerSubmit
+from quli_quiz.grading import CompiledQuestion
+
+
+@dataclass
+class GradedAnswer:
+    """A single graded answer, ready to be stored."""
+
+    question_index: int
+    answer: str
+    is_correct: bool
+    difficulty: str
+    time_taken: float | None = None
+
+
+@dataclass
+class GradedResult:
+    """A graded submission, ready to be stored."""
+
+    quiz_id: int
+    topic: str
+    total_questions: int
+    answers: list[GradedAnswer] = field(default_factory=list)
+
+    @property
+    def correct_answers(self) -> int:
+        return sum(1 for answer in self.answers if answer.is_correct)
+
+    @property
+    def score(self) -> float:
+        if self.total_questions == 0:
+            return 0.0
+        return self.correct_answers / self.total_questions * 100
+
+    @property
+    def time_taken(self) -> float:
+        return sum(answer.time_taken or 0 for answer in self.answers)
+
+
+def grade_submission(
+    quiz_id: int,
+    topic: str,
+    questions: Sequence[CompiledQuestion],
+    answers: Iterable[UserAnswerSubmit],
+) -> GradedResult:
+    """Grade submitted answers against the answer key of a quiz, in quiz order.
+
+    Answers to questions outside the quiz are ignored; when a question is answered more
+    than once, the last answer replaces the earlier ones, as in the quiz engine.
+    """
+    result = GradedResult(quiz_id=quiz_id, topic=topic, total_questions=len(questions))
+    latest: dict[int, UserAnswerSubmit] = {}
+    for ans in answers:
+        if 0 <= ans.question_index < len(questions):
+            latest[ans.question_index] = ans
+    for index in sorted(latest):
+        ans = latest[index]
+        question = questions[index]
+        result.answers.append(
+            GradedAnswer(
+                question_index=ans.question_index,
+                answer=ans.answer,
+                is_correct=question.is_correct(ans.answer),
+                difficulty=question.difficulty,
+                time_taken=ans.time_taken,
+            )
+        )
+    return result
+
+
+def save_results(db: Session, results: Sequence[GradedResult]) -> list[int]:
+    """Store graded results, their answers and aggregate updates with bulk inserts.
+
+    Returns the new result IDs in the order of ``results``. The caller owns the
+    transaction, so any number of results costs a single commit.
+    """
+    if not results:
+        return []
+
+    result_ids = list(
+        db.scalars(
+            insert(models.QuizResultModel).returning(
+                models.QuizResultModel.id, sort_by_parameter_order=True
+            ),
+            [
+                {
+                    "quiz_id": result.quiz_id,
+                    "score": result.score,
+                    "total_questions": result.total_questions,
+                    "correct_answers": result.correct_answers,
+                    "time_taken": result.time_taken,
+                }
+                for result in results
+            ],
+        )
+    )
+
+    answer_rows = [
+        {
+            "result_id": result_id,
+            "question_index": answer.question_index,
+            "answer": answer.answer,
+            "is_correct": answer.is_correct,
+            "time_taken": answer.time_taken,
+        }
+        for result_id, result in zip(result_ids, results, strict=True)
+        for answer in result.answers
+    ]
+    if answer_rows:
+        db.execute(insert(models.UserAnswerModel), answer_rows)
+
+    # Fold the results into the aggregate counters in the same transaction
+    stats.record_results(db, results)
+    return result_ids
@@ -0,0 +1,54 @@
+"""Checkpoint files for resuming an interrupted quiz without regenerating it."""
+
+import json
+import os
+from pathlib import Path
+
+from quli_quiz.engine import QuizEngine
+from quli_quiz.models import Quiz
+
+
+def default_checkpoint_path() -> Path:
+    """Return the checkpoint location (``QULI_CHECKPOINT`` or the user state directory)."""
+    override = os.getenv("QULI_CHECKPOINT")
+    if override:
+        return Path(override)
+    state_home = os.getenv("XDG_STATE_HOME") or Path.home() / ".local" / "state"
+    return Path(state_home) / "quli" / "checkpoint.json"
+
+
+class Checkpoint:
+    """Saves an engine's progress to a file after each answer.
+
+    The quiz is serialized once; each save only encodes the engine snapshot and
+    atomically replaces the file, so a crash never leaves a partial checkpoint.
+    """
+
+    def __init__(self, engine: QuizEngine, path: Path | None = None):
+        """Initialize the checkpoint for an engine; nothing is written until :meth:`save`."""
+        self.engine = engine
+        self.path = path or default_checkpoint_path()
+        self._quiz_json = engine.quiz.model_dump_json().encode()
+
+    def save(self) -> None:
+        """Write the engine's current progress."""
+        data = b'{"quiz":' + self._quiz_json + b',"state":' + self.engine.snapshot() + b"}"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Remove the checkpoint, e.g. once the quiz is complete."""
+        self.path.unlink(missing_ok=True)
+
+
+def load_checkpoint(path: Path | None = None) -> QuizEngine | None:
+    """Restore the engine saved at ``path``, or return None if there is no checkpoint."""
+    path = path or default_checkpoint_path()
+    try:
+        data = json.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    quiz = Quiz.model_validate(data["quiz"])
+    return QuizEngine.restore(quiz, json.dumps(data["state"]).encode())
@@ -1,6 +1,7 @@
 """CLI interface for the quiz app."""
 
 import sys
+from datetime import datetime
 from pathlib import Path
 
 import click
@@ -9,6 +10,7 @@ from rich.panel import Panel
 from rich.prompt import Prompt
 from rich.rule import Rule
 
+from quli_quiz.checkpoint import Checkpoint, load_checkpoint
 from quli_quiz.config import load_environment_variables, parse_env_line
 from quli_quiz.engine import QuizEngine
 from quli_quiz.generator import QuizGenerator
@@ -105,7 +107,7 @@ def get_advanced_config() -> QuizConfig:
     )
 
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option(
     "--topic",
     "-t",
@@ -130,6 +132,11 @@ def get_advanced_config() -> QuizConfig:
     is_flag=True,
     help="Use advanced configuration",
 )
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Resume the last unfinished quiz instead of generating a new one",
+)
 @click.option(
     "--env-file",
     "-e",
@@ -170,17 +177,23 @@ def get_advanced_config() -> QuizConfig:
     flag_value=False,
     help="Disable Nerd Font glyphs",
 )
+@click.pass_context
 def main(
+    ctx: click.Context,
     topic: str | None,
     interactive: bool,
     batch: bool,
     advanced: bool,
+    resume: bool,
     env_file: Path | None,
     style: str,
     ascii_override: bool | None,
     nerd_font: bool | None,
 ) -> None:
     """Quli - CLI Quiz App powered by Gemini Flash 2.5."""
+    if ctx.invoked_subcommand is not None:
+        return
+
     # Load environment variables first (before building console to avoid style issues)
     import os
 
@@ -190,7 +203,7 @@ def main(
     # Only prompt if stdin is a TTY (interactive) and GEMINI_API_KEY is not set
     # Note: read_env_from_stdin() only reads when stdin is piped (not TTY),
     # so if we're here and stdin is a TTY, we haven't read from stdin yet
-    if sys.stdin.isatty() and not os.getenv("GEMINI_API_KEY"):
+    if sys.stdin.isatty() and not os.getenv("GEMINI_API_KEY") and not resume:
         prompt_for_environment_variables()
 
     # Build console with style
@@ -217,6 +230,23 @@ def main(
     # Determine mode
     mode = "interactive" if interactive else "batch" if batch else "interactive"
 
+    if resume:
+        # Progress is checkpointed after every answer, so no regeneration is needed
+        try:
+            engine = load_checkpoint()
+        except ValueError as e:
+            console.print(f"[red]Cannot resume: {e}[/red]")
+            sys.exit(1)
+        if engine is None:
+            console.print("[yellow]No unfinished quiz to resume.[/yellow]")
+            sys.exit(1)
+        console.print(
+            f"\n[bold]Resuming quiz on '{engine.quiz.topic}' "
+            f"({engine.current_question_index}/{len(engine.quiz)} answered)[/bold]\n"
+        )
+        run_mode(engine, mode)
+        return
+
     # Get configuration
     if advanced or topic is None:  # noqa: SIM108
         config = get_advanced_config()
@@ -238,11 +268,70 @@ def main(
 
     # Create engine and run quiz
     engine = QuizEngine(quiz)
+    run_mode(engine, mode)
 
+
+def run_mode(engine: QuizEngine, mode: str) -> None:
+    """Run the quiz in the given mode, checkpointing progress for --resume."""
+    checkpoint = Checkpoint(engine)
     if mode == "interactive":
-        run_interactive_mode(engine)
+        run_interactive_mode(engine, checkpoint)
     else:
-        run_batch_mode(engine)
+        run_batch_mode(engine, checkpoint)
+
+
+@main.command("export")
+@click.option(
+    "--format",
+    "export_format",
+    type=click.Choice(["ndjson", "csv"]),
+    default="ndjson",
+    show_default=True,
+    help="Output format",
+)
+@click.option("--topic", default=None, help="Only results of quizzes on this topic")
+@click.option("--since", type=click.DateTime(), default=None, help="Only results from this time on")
+@click.option("--until", type=click.DateTime(), default=None, help="Only results before this time")
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write to a file instead of stdout",
+)
+def export(
+    export_format: str,
+    topic: str | None,
+    since: datetime | None,
+    until: datetime | None,
+    output: Path | None,
+) -> None:
+    """Export stored quiz results and answers from the API database (QULI_DATABASE_URL)."""
+    from sqlalchemy.exc import OperationalError
+
+    from quli_quiz.api.database import SessionLocal
+    from quli_quiz.api.exports import export_chunks
+
+    with SessionLocal() as db:
+        chunks = export_chunks(db, export_format, topic=topic, since=since, until=until)
+        # Run the query before creating the output, so a failed export leaves no file
+        try:
+            first = next(chunks, b"")
+        except OperationalError as e:
+            raise click.ClickException(
+                f"Cannot read results: {e.orig}. "
+                "Create the database schema with `quli-api --init-db-only`."
+            ) from e
+        out = output.open("wb") if output is not None else sys.stdout.buffer
+        try:
+            out.write(first)
+            for chunk in chunks:
+                out.write(chunk)
+        finally:
+            if output is not None:
+                out.close()
+            else:
+                out.flush()
 
 
 if __name__ == "__main__":
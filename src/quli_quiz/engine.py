@@ -1,75 +1,157 @@
 """Quiz engine for managing quiz flow and scoring."""
 
+import hashlib
+import json
 import time
+from collections.abc import Callable
 
+from quli_quiz.grading import AnswerKey
 from quli_quiz.models import Question, Quiz, QuizResult, UserAnswer
 
+# Version 2 added the time spent on the current question ("pending"); version 3 moved
+# the quiz digest off Pydantic's JSON output to :func:`quiz_fingerprint`
+SNAPSHOT_VERSION = 3
+
+
+def quiz_fingerprint(quiz: Quiz) -> str:
+    """Digest identifying a quiz's content, used to match snapshots to it.
+
+    Built from the stable question and config fingerprints, plus the difficulty and
+    explanation that question fingerprints leave out, so it does not change with the
+    serializer when dependencies are upgraded.
+    """
+    parts = [
+        quiz.topic,
+        quiz.config.fingerprint(),
+        [[q.fingerprint(), q.difficulty.value, q.explanation] for q in quiz.questions],
+    ]
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+
+def _legacy_quiz_fingerprint(quiz: Quiz) -> str:
+    # The digest of version 1 and 2 snapshots
+    return hashlib.sha256(quiz.model_dump_json().encode()).hexdigest()
+
 
 class QuizEngine:
     """Engine for managing quiz flow and scoring."""
 
-    def __init__(self, quiz: Quiz):
-        """Initialize the engine with a quiz."""
+    def __init__(
+        self,
+        quiz: Quiz,
+        clock: Callable[[], float] = time.perf_counter,
+        answer_key: AnswerKey | None = None,
+    ):
+        """Initialize the engine with a quiz.
+
+        Timing uses a monotonic clock, so it is unaffected by system clock adjustments.
+        Engines on the same quiz may share its compiled ``answer_key``.
+        """
         self.quiz = quiz
-        self.answers: list[UserAnswer] = []
+        # Compiled once so each answer is graded with a lookup
+        self.answer_key = answer_key if answer_key is not None else AnswerKey.from_quiz(quiz)
+        # Answers indexed by question, with a bitmap of the answered questions and
+        # running tallies, so lookups and scoring never scan the answers
+        self._slots: list[UserAnswer | None] = [None] * len(quiz.questions)
+        self._answered_mask = 0
+        self._answered_count = 0
+        self._correct_count = 0
         self.start_time: float | None = None
         self.current_question_index = 0
+        self._clock = clock
+        self._presented_at: dict[int, float] = {}
+        self._answered_at: dict[int, float] = {}
+        self._last_answer_at: float | None = None
+        self._fingerprint: str | None = None
 
     def start(self) -> None:
         """Start the quiz timer."""
-        self.start_time = time.time()
+        self.start_time = self._clock()
+
+    def present_question(self, question_index: int | None = None) -> None:
+        """Record that a question is shown to the user, starting its timer.
+
+        Only the first presentation counts. Questions never presented explicitly are
+        timed from the previous answer (or the start of the quiz).
+        """
+        if question_index is None:
+            question_index = self.current_question_index
+        self._presented_at.setdefault(question_index, self._clock())
+
+    def mark_answered(self, question_index: int | None = None) -> None:
+        """Record that the user chose an answer, for answers submitted later (batch mode)."""
+        if question_index is None:
+            question_index = self.current_question_index
+        self._answered_at[question_index] = self._clock()
 
     def submit_answer(self, answer: str, question_index: int | None = None) -> UserAnswer:
-        """Submit an answer for a question."""
+        """Submit an answer for a question, replacing any earlier answer to it."""
         if question_index is None:
             question_index = self.current_question_index
 
         if question_index >= len(self.quiz.questions):
             raise ValueError(f"Question index {question_index} is out of range")
 
-        question = self.quiz.questions[question_index]
-        is_correct = self._check_answer(question, answer)
+        is_correct = self.answer_key.is_correct(question_index, answer)
 
-        # Calculate the time taken to answer if quiz has started
-        if self.start_time is not None:  # noqa: SIM108
-            time_taken = time.time() - self.start_time
-        else:
-            time_taken = None
+        # Time spent on this question, from when it was presented to when it was answered
+        answered_at = self._answered_at.get(question_index, self._clock())
+        presented_at = self._presented_at.get(
+            question_index,
+            self._last_answer_at if self._last_answer_at is not None else self.start_time,
+        )
+        time_taken = answered_at - presented_at if presented_at is not None else None
+        cumulative_time = answered_at - self.start_time if self.start_time is not None else None
+        self._last_answer_at = answered_at
 
         user_answer = UserAnswer(
             question_index=question_index,
             answer=answer,
             is_correct=is_correct,
             time_taken=time_taken,
+            cumulative_time=cumulative_time,
         )
 
-        self.answers.append(user_answer)
-        self.current_question_index += 1
+        self._store(user_answer)
+        self.current_question_index = max(self.current_question_index, question_index + 1)
 
         return user_answer
 
-    def _check_answer(self, question: Question, answer: str) -> bool:
-        """Check if the answer is correct."""
-        # Normalize answers for comparison
-        correct = question.correct_answer.strip().lower()
-        user_answer = answer.strip().lower()
-
-        # For multiple choice, check if answer matches or if it's an option index
-        if question.question_type.value == "multiple_choice":
-            # Check direct match
-            if user_answer == correct:
-                return True
-            # Check if answer is an option letter (A, B, C, D)
-            option_letters = ["a", "b", "c", "d"]
-            if user_answer in option_letters:
-                option_index = option_letters.index(user_answer)
-                if option_index < len(question.options):
-                    return question.options[option_index].strip().lower() == correct
-        elif question.question_type.value == "true_false":
-            # For true/false, check exact match
-            return user_answer == correct
-
-        return False
+    def _store(self, user_answer: UserAnswer) -> None:
+        """Put an answer in its question's slot, replacing any previous answer."""
+        question_index = user_answer.question_index
+        previous = self._slots[question_index]
+        if previous is None:
+            self._answered_mask |= 1 << question_index
+            self._answered_count += 1
+        elif previous.is_correct:
+            self._correct_count -= 1
+        if user_answer.is_correct:
+            self._correct_count += 1
+        self._slots[question_index] = user_answer
+
+    @property
+    def answers(self) -> list[UserAnswer]:
+        """The answers given so far, in question order."""
+        return [answer for answer in self._slots if answer is not None]
+
+    @property
+    def answered_count(self) -> int:
+        """Number of questions answered."""
+        return self._answered_count
+
+    @property
+    def correct_count(self) -> int:
+        """Number of questions answered correctly."""
+        return self._correct_count
+
+    def is_answered(self, question_index: int) -> bool:
+        """Check if the question at ``question_index`` has been answered."""
+        return bool(self._answered_mask >> question_index & 1)
+
+    def get_answer(self, question_index: int) -> UserAnswer | None:
+        """Get the answer to the question at ``question_index``, if answered."""
+        return self._slots[question_index]
 
     def get_current_question(self) -> Question | None:
         """Get the current question."""
@@ -86,19 +168,17 @@ class QuizEngine:
         if not self.is_complete():
             raise ValueError("Quiz is not complete yet")
 
-        end_time = time.time()
-        total_time = (end_time - self.start_time) if self.start_time else None
+        total_time = (self._clock() - self.start_time) if self.start_time is not None else None
 
-        correct_count = sum(1 for answer in self.answers if answer.is_correct)
         total_questions = len(self.quiz.questions)
-        score = (correct_count / total_questions * 100) if total_questions > 0 else 0.0
+        score = (self._correct_count / total_questions * 100) if total_questions > 0 else 0.0
 
         return QuizResult(
             quiz=self.quiz,
             answers=self.answers,
             score=score,
             total_questions=total_questions,
-            correct_answers=correct_count,
+            correct_answers=self._correct_count,
             time_taken=total_time,
         )
 
@@ -107,3 +187,83 @@ class QuizEngine:
         if index >= len(self.quiz.questions):
             raise ValueError(f"Question index {index} is out of range")
         return self.quiz.questions[index]
+
+    @property
+    def quiz_fingerprint(self) -> str:
+        """The quiz's fingerprint, computed once."""
+        if self._fingerprint is None:
+            self._fingerprint = quiz_fingerprint(self.quiz)
+        return self._fingerprint
+
+    def snapshot(self) -> bytes:
+        """Return the engine's progress as compact JSON, cheap enough to save per answer.
+
+        The snapshot holds the quiz fingerprint, the answers with their timing, the
+        time elapsed so far and the time spent on the current question, but not the
+        quiz itself.
+        """
+        now = self._clock()
+        elapsed = pending = None
+        if self.start_time is not None:
+            elapsed = now - self.start_time
+            timer_start = self._presented_at.get(
+                self.current_question_index,
+                self._last_answer_at if self._last_answer_at is not None else self.start_time,
+            )
+            pending = now - timer_start
+        state = {
+            "v": SNAPSHOT_VERSION,
+            "quiz": self.quiz_fingerprint,
+            "index": self.current_question_index,
+            "elapsed": elapsed,
+            "pending": pending,
+            "answers": [
+                [a.question_index, a.answer, a.is_correct, a.time_taken, a.cumulative_time]
+                for a in self.answers
+            ],
+        }
+        return json.dumps(state, separators=(",", ":")).encode()
+
+    @classmethod
+    def restore(
+        cls,
+        quiz: Quiz,
+        snapshot: bytes,
+        clock: Callable[[], float] = time.perf_counter,
+        away: float = 0.0,
+        answer_key: AnswerKey | None = None,
+    ) -> "QuizEngine":
+        """Rebuild an engine for ``quiz`` from :meth:`snapshot` output.
+
+        The quiz clock resumes from the elapsed time saved in the snapshot, plus ``away``
+        seconds: the time since the snapshot that should count toward the quiz (by
+        default, time between saving and restoring is not counted). Raises ValueError
+        if the snapshot is from another quiz or an unknown format version.
+        """
+        state = json.loads(snapshot)
+        if state.get("v") not in (1, 2, SNAPSHOT_VERSION):
+            raise ValueError(f"Unsupported snapshot version {state.get('v')}")
+
+        engine = cls(quiz, clock=clock, answer_key=answer_key)
+        expected = _legacy_quiz_fingerprint(quiz) if state["v"] < 3 else engine.quiz_fingerprint
+        if state["quiz"] != expected:
+            raise ValueError("Snapshot does not belong to this quiz")
+
+        for question_index, answer, is_correct, time_taken, cumulative_time in state["answers"]:
+            engine._store(
+                UserAnswer(
+                    question_index=question_index,
+                    answer=answer,
+                    is_correct=is_correct,
+                    time_taken=time_taken,
+                    cumulative_time=cumulative_time,
+                )
+            )
+        engine.current_question_index = state["index"]
+        if state["elapsed"] is not None:
+            resumed_from = clock() - away
+            engine.start_time = resumed_from - state["elapsed"]
+            # The current question keeps the time already spent on it; version 1
+            # snapshots did not record it, so the question is timed from resuming
+            engine._last_answer_at = resumed_from - state.get("pending", 0.0)
+        return engine
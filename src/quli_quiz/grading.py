@@ -0,0 +1,235 @@
+"""Answer grading shared by the quiz engine and the API.
+
+A quiz is compiled once into an answer key: per question, the normalized correct answer,
+the index of the matching option and the set of every accepted spelling (the answer
+itself, plus the option's letter and number). Grading is then one normalization and one
+set lookup, whatever the number of options.
+
+For bulk grading, :func:`grade_batch` encodes answers as option codes and computes
+correctness, scores and accuracy breakdowns for many answer sheets with NumPy.
+"""
+
+import string
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from enum import Enum
+from types import MappingProxyType
+
+import numpy as np
+
+from quli_quiz.models import Quiz
+
+# Compact question type codes
+MULTIPLE_CHOICE = 0
+TRUE_FALSE = 1
+OTHER = -1
+
+_TYPE_CODES = {"multiple_choice": MULTIPLE_CHOICE, "true_false": TRUE_FALSE}
+
+# Answer codes that are not options
+UNANSWERED = -1
+UNKNOWN = -2
+NEVER = -3  # Correct code of questions that cannot be graded
+
+
+def normalize_answer(answer: str) -> str:
+    """Normalize an answer for comparison (surrounding whitespace and case)."""
+    return answer.strip().lower()
+
+
+def _value(value: str | Enum) -> str:
+    return value.value if isinstance(value, Enum) else value
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledQuestion:
+    """Grading data of one question, normalized once."""
+
+    type_code: int
+    difficulty: str
+    correct_answer: str  # Normalized
+    correct_option: int | None  # Index of the option matching the answer, if any
+    accepted: frozenset[str]  # Every normalized answer graded as correct
+    # Normalized answer -> option code (option index, or len(options) for a correct
+    # answer that is not one of the options), used to encode answers for grade_batch
+    codes: Mapping[str, int]
+    correct_code: int
+
+    def is_correct(self, answer: str) -> bool:
+        """Grade an answer."""
+        return normalize_answer(answer) in self.accepted
+
+    def encode(self, answer: str | None) -> int:
+        """Encode an answer as its option code (UNANSWERED or UNKNOWN otherwise)."""
+        if answer is None:
+            return UNANSWERED
+        normalized = normalize_answer(answer)
+        if not normalized:
+            return UNANSWERED
+        return self.codes.get(normalized, UNKNOWN)
+
+
+def compile_question(
+    question_type: str | Enum,
+    options: Sequence[str],
+    correct_answer: str,
+    difficulty: str | Enum,
+) -> CompiledQuestion:
+    """Compile a question (from a model or a stored row) for grading."""
+    type_code = _TYPE_CODES.get(_value(question_type), OTHER)
+    correct = normalize_answer(correct_answer)
+    normalized_options = [normalize_answer(option) for option in options]
+
+    # Duplicate option texts share the code of their first occurrence
+    codes: dict[str, int] = {}
+    for index, option in enumerate(normalized_options):
+        codes.setdefault(option, index)
+    canonical = [codes[option] for option in normalized_options]
+    if type_code == MULTIPLE_CHOICE:
+        # Letter (A, B, ...) and 1-based number of each option, unless the alias is
+        # itself the text of an option or options are numbers themselves
+        numeric = any(option.isdigit() for option in normalized_options)
+        for index, code in enumerate(canonical):
+            if index < len(string.ascii_lowercase):
+                codes.setdefault(string.ascii_lowercase[index], code)
+            if not numeric:
+                codes.setdefault(str(index + 1), code)
+
+    correct_option = codes[correct] if correct in normalized_options else None
+    if type_code == OTHER:
+        correct_code = NEVER
+    elif correct_option is None:
+        correct_code = len(normalized_options)
+        codes[correct] = correct_code
+    else:
+        correct_code = correct_option
+
+    return CompiledQuestion(
+        type_code=type_code,
+        difficulty=_value(difficulty),
+        correct_answer=correct,
+        correct_option=correct_option,
+        accepted=frozenset(answer for answer, code in codes.items() if code == correct_code),
+        codes=MappingProxyType(codes),
+        correct_code=correct_code,
+    )
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    """Compiled grading data of a quiz, in question order."""
+
+    questions: tuple[CompiledQuestion, ...]
+
+    @classmethod
+    def from_quiz(cls, quiz: Quiz) -> "AnswerKey":
+        """Compile every question of a quiz."""
+        return cls(
+            questions=tuple(
+                compile_question(q.question_type, q.options, q.correct_answer, q.difficulty)
+                for q in quiz.questions
+            )
+        )
+
+    def is_correct(self, question_index: int, answer: str) -> bool:
+        """Grade an answer to the question at ``question_index``."""
+        return self.questions[question_index].is_correct(answer)
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+
+@dataclass(frozen=True)
+class BatchGrade:
+    """Grades of many answer sheets to one quiz, as arrays.
+
+    Rows are attempts and columns questions, in the order given to :func:`grade_batch`.
+    """
+
+    codes: np.ndarray  # int16 option codes (UNANSWERED / UNKNOWN for non-options)
+    correct: np.ndarray  # bool correctness matrix
+    correct_counts: np.ndarray  # Correct answers per attempt
+    scores: np.ndarray  # Score per attempt, in percent
+    answered_counts: np.ndarray  # Answers per question
+    question_accuracy: np.ndarray  # Percent of answers to each question that are correct
+    difficulty_accuracy: dict[str, float]  # Percent correct per difficulty, over answers
+
+    @property
+    def mean_score(self) -> float:
+        return float(self.scores.mean()) if len(self.scores) else 0.0
+
+
+def encode_sheets(key: AnswerKey, sheets: Sequence[Sequence[str | None]]) -> np.ndarray:
+    """Encode answer sheets (answer per question, ``None`` if unanswered) as option codes.
+
+    Each distinct answer to a question is normalized and looked up once, however many
+    sheets repeat it.
+    """
+    num_questions = len(key)
+    answers = np.full((len(sheets), num_questions), "", dtype=object)
+    for row, sheet in enumerate(sheets):
+        answers[row, : len(sheet)] = sheet[:num_questions]
+    answers[np.equal(answers, None)] = ""
+
+    codes = np.empty(answers.shape, dtype=np.int16)
+    for column, question in enumerate(key.questions):
+        distinct, inverse = np.unique(answers[:, column].astype(str), return_inverse=True)
+        lookup = np.fromiter((question.encode(a) for a in distinct), np.int16, len(distinct))
+        codes[:, column] = lookup[inverse.reshape(-1)]
+    return codes
+
+
+def grade_batch(
+    quiz: Quiz | AnswerKey, submissions: Sequence[Sequence[str | None]] | np.ndarray
+) -> BatchGrade:
+    """Grade many answer sheets against the same quiz at once.
+
+    ``submissions`` is either a sequence of answer sheets (the answer to each question in
+    order, ``None`` or missing when unanswered) or an integer array of option codes with
+    one row per attempt, as produced by :func:`encode_sheets`.
+    """
+    key = quiz if isinstance(quiz, AnswerKey) else AnswerKey.from_quiz(quiz)
+    if isinstance(submissions, np.ndarray) and submissions.dtype.kind in "iu":
+        codes = submissions.astype(np.int16, copy=False)
+    else:
+        codes = encode_sheets(key, submissions)
+    if codes.ndim != 2 or codes.shape[1] != len(key):
+        raise ValueError(f"Expected {len(key)} answer columns, got shape {codes.shape}")
+
+    correct_codes = np.fromiter((q.correct_code for q in key.questions), np.int16, len(key))
+    correct = codes == correct_codes
+    answered = codes != UNANSWERED
+
+    correct_counts = correct.sum(axis=1)
+    scores = correct_counts / len(key) * 100 if len(key) else np.zeros(len(codes))
+
+    answered_counts = answered.sum(axis=0)
+    correct_per_question = correct.sum(axis=0)
+    question_accuracy = np.divide(
+        correct_per_question * 100.0,
+        answered_counts,
+        out=np.zeros(len(key)),
+        where=answered_counts > 0,
+    )
+
+    difficulties, difficulty_index = np.unique(
+        np.array([q.difficulty for q in key.questions], dtype=str), return_inverse=True
+    )
+    answered_by_difficulty = np.bincount(difficulty_index, answered_counts, len(difficulties))
+    correct_by_difficulty = np.bincount(difficulty_index, correct_per_question, len(difficulties))
+    difficulty_accuracy = {
+        str(difficulty): (float(right / total * 100) if total else 0.0)
+        for difficulty, right, total in zip(
+            difficulties, correct_by_difficulty, answered_by_difficulty, strict=True
+        )
+    }
+
+    return BatchGrade(
+        codes=codes,
+        correct=correct,
+        correct_counts=correct_counts,
+        scores=scores,
+        answered_counts=answered_counts,
+        question_accuracy=question_accuracy,
+        difficulty_accuracy=difficulty_accuracy,
+    )
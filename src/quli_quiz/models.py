@@ -1,9 +1,20 @@
 """Pydantic models for quiz data structures."""
 
+import hashlib
+from collections.abc import Mapping
 from enum import Enum
+from typing import Any, TypeVar
 
 from pydantic import BaseModel, Field
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+_object_setattr = object.__setattr__
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace and casefold, so trivially different spellings compare equal."""
+    return " ".join(text.split()).casefold()
+
 
 class QuestionType(str, Enum):
     """Question type enumeration."""
@@ -20,7 +31,41 @@ class Difficulty(str, Enum):
     HARD = "hard"
 
 
-class Question(BaseModel):
+class _Fingerprinted(BaseModel):
+    """Base for models with a content fingerprint, computed once per instance.
+
+    The digest is cached in the instance ``__dict__`` rather than a private attribute,
+    as Pydantic compares private attributes in ``==``; since Pydantic 2.6, ``==`` only
+    compares the fields in ``__dict__``. Assigning a field or copying with ``update``
+    drops it; in-place changes (``question.options.append(...)``) do not.
+    """
+
+    def _fingerprint_parts(self) -> list[str]:
+        raise NotImplementedError
+
+    def fingerprint(self) -> str:
+        """Return the SHA-256 hex digest of the model's normalized content.
+
+        Stable across releases: it may key persistent caches and unique indexes.
+        """
+        fingerprint = self.__dict__.get("_fingerprint")
+        if fingerprint is None:
+            parts = "\x1f".join(self._fingerprint_parts())
+            fingerprint = self.__dict__["_fingerprint"] = hashlib.sha256(parts.encode()).hexdigest()
+        return fingerprint
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        self.__dict__.pop("_fingerprint", None)
+
+    def model_copy(self, *, update: Mapping[str, Any] | None = None, deep: bool = False):
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            copied.__dict__.pop("_fingerprint", None)
+        return copied
+
+
+class Question(_Fingerprinted):
     """Model representing a single quiz question."""
 
     question_text: str = Field(..., description="The question text")
@@ -45,8 +90,17 @@ class Question(BaseModel):
             )
         return False
 
+    def _fingerprint_parts(self) -> list[str]:
+        # Difficulty and explanation are not part of a question's identity
+        return [
+            self.question_type.value,
+            _normalize(self.question_text),
+            _normalize(self.correct_answer),
+            *(_normalize(option) for option in self.options),
+        ]
+
 
-class QuizConfig(BaseModel):
+class QuizConfig(_Fingerprinted):
     """Configuration model for quiz generation."""
 
     topic: str = Field(..., description="Topic for the quiz")
@@ -59,6 +113,15 @@ class QuizConfig(BaseModel):
         description="Types of questions to include",
     )
 
+    def _fingerprint_parts(self) -> list[str]:
+        # Question type order and repeats do not change what is generated
+        return [
+            _normalize(self.topic),
+            ",".join(sorted({question_type.value for question_type in self.question_types})),
+            self.difficulty.value if self.difficulty is not None else "",
+            str(self.num_questions),
+        ]
+
 
 class Quiz(BaseModel):
     """Model representing a complete quiz."""
@@ -78,7 +141,10 @@ class UserAnswer(BaseModel):
     question_index: int = Field(..., ge=0, description="Index of the question")
     answer: str = Field(..., description="User's selected answer")
     is_correct: bool = Field(..., description="Whether the answer is correct")
-    time_taken: float | None = Field(None, description="Time taken to answer in seconds")
+    time_taken: float | None = Field(None, description="Time spent on this question in seconds")
+    cumulative_time: float | None = Field(
+        None, description="Time since the quiz started when answered, in seconds"
+    )
 
 
 class QuizResult(BaseModel):
@@ -95,3 +161,20 @@ class QuizResult(BaseModel):
     def percentage(self) -> float:
         """Return score as percentage."""
         return self.score
+
+
+def construct(cls: type[ModelT], values: dict[str, Any]) -> ModelT:
+    """Create a model from trusted, already valid values for every one of its fields.
+
+    Skips validation entirely, for data we produced ourselves (stored rows, caches,
+    our own binary encoding). Unlike ``model_construct``, no defaults are filled in.
+    """
+    model = cls.__new__(cls)
+    _object_setattr(model, "__dict__", values)
+    _object_setattr(model, "__pydantic_fields_set__", set(values))
+    _object_setattr(model, "__pydantic_extra__", None)
+    _object_setattr(model, "__pydantic_private__", None)
+    if cls.__pydantic_post_init__:
+        # Initializes private attributes
+        model.model_post_init(None)
+    return model
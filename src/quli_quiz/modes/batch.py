@@ -2,6 +2,7 @@
 
 from rich.console import Console
 
+from quli_quiz.checkpoint import Checkpoint
 from quli_quiz.engine import QuizEngine
 from quli_quiz.ui.display import display_question, display_results
 from quli_quiz.ui.input import get_answer_interactive, get_answer_simple
@@ -9,32 +10,39 @@ from quli_quiz.ui.input import get_answer_interactive, get_answer_simple
 console = Console()
 
 
-def run_batch_mode(engine: QuizEngine) -> None:
-    """Run quiz in batch mode (all questions, then score)."""
+def run_batch_mode(engine: QuizEngine, checkpoint: Checkpoint | None = None) -> None:
+    """Run quiz in batch mode (all questions, then score).
+
+    With a checkpoint, progress is saved after every answer and cleared on completion.
+    A restored engine continues where it stopped.
+    """
     console.print("\n[bold green]Starting Batch Quiz Mode[/bold green]\n")
     console.print("Answer all questions, then we'll show your results.\n")
-    engine.start()
-
-    # Collect all answers
-    answers_map = {}
-    for i, question in enumerate(engine.quiz.questions):
+    if engine.start_time is None:
+        engine.start()
+
+    # Answers are graded as they are given (so progress can be saved), but only
+    # shown once all questions are answered
+    total = len(engine.quiz.questions)
+    for i in range(engine.current_question_index, total):
+        question = engine.quiz.questions[i]
         question_num = i + 1
-        total = len(engine.quiz.questions)
 
         display_question(question, question_num, total)
+        engine.present_question(i)
 
         try:
             answer = get_answer_interactive(question)
         except (OSError, ImportError):
             answer = get_answer_simple(question)
 
-        answers_map[i] = answer
-        console.print()
-
-    # Submit all answers
-    for i, answer in answers_map.items():
         engine.submit_answer(answer, question_index=i)
+        if checkpoint is not None:
+            checkpoint.save()
+        console.print()
 
     # Show results
     result = engine.get_result()
+    if checkpoint is not None:
+        checkpoint.clear()
     display_results(result, show_answers=True)
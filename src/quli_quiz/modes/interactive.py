@@ -5,6 +5,7 @@ import sys
 from rich.console import Console
 from rich.prompt import Prompt
 
+from quli_quiz.checkpoint import Checkpoint
 from quli_quiz.engine import QuizEngine
 from quli_quiz.ui.display import display_question, display_results
 from quli_quiz.ui.input import get_answer_interactive, get_answer_simple
@@ -12,10 +13,15 @@ from quli_quiz.ui.input import get_answer_interactive, get_answer_simple
 console = Console()
 
 
-def run_interactive_mode(engine: QuizEngine) -> None:
-    """Run quiz in interactive mode (question-by-question)."""
+def run_interactive_mode(engine: QuizEngine, checkpoint: Checkpoint | None = None) -> None:
+    """Run quiz in interactive mode (question-by-question).
+
+    With a checkpoint, progress is saved after every answer and cleared on completion.
+    A restored engine continues where it stopped.
+    """
     console.print("\n[bold green]Starting Interactive Quiz Mode[/bold green]\n")
-    engine.start()
+    if engine.start_time is None:
+        engine.start()
 
     try:
         while not engine.is_complete():
@@ -27,6 +33,7 @@ def run_interactive_mode(engine: QuizEngine) -> None:
             total = len(engine.quiz.questions)
 
             display_question(question, question_num, total)
+            engine.present_question()
 
             try:
                 answer = get_answer_interactive(question)
@@ -38,6 +45,8 @@ def run_interactive_mode(engine: QuizEngine) -> None:
                 sys.exit(0)
 
             user_answer = engine.submit_answer(answer)
+            if checkpoint is not None:
+                checkpoint.save()
 
             # Show immediate feedback
             if user_answer.is_correct:
@@ -58,6 +67,8 @@ def run_interactive_mode(engine: QuizEngine) -> None:
 
         # Show results
         result = engine.get_result()
+        if checkpoint is not None:
+            checkpoint.clear()
         display_results(result)
     except KeyboardInterrupt:
         console.print("\n[yellow]Quiz cancelled[/yellow]")
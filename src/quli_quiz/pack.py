@@ -0,0 +1,196 @@
+"""Memory-compact storage for large pools of questions.
+
+A :class:`QuestionPack` stores questions as columns instead of one model per question.
+Every distinct string (question text, option, answer or explanation) is stored once in
+a UTF-8 blob addressed through an offset table, and each question is a row of small
+integers: string ids, enum codes and a slice of the option table. ``Question`` models
+are only built when a question is accessed.
+"""
+
+import random
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import overload
+
+import numpy as np
+
+from quli_quiz.models import Difficulty, Question, QuestionType
+
+_QUESTION_TYPES = list(QuestionType)
+_DIFFICULTIES = list(Difficulty)
+_TYPE_CODES = {question_type: code for code, question_type in enumerate(_QUESTION_TYPES)}
+_DIFFICULTY_CODES = {difficulty: code for code, difficulty in enumerate(_DIFFICULTIES)}
+
+NO_STRING = np.iinfo(np.uint32).max  # String id of a missing explanation
+
+
+class QuestionPack(Sequence[Question]):
+    """A read-only, array-backed sequence of questions.
+
+    Build one with :meth:`from_questions`. Indexing returns a new ``Question`` each time;
+    keep the returned models only as long as they are needed.
+    """
+
+    __slots__ = (
+        "_blob",
+        "_string_offsets",
+        "_text_ids",
+        "_correct_ids",
+        "_explanation_ids",
+        "_option_offsets",
+        "_option_ids",
+        "type_codes",
+        "difficulty_codes",
+    )
+
+    def __init__(
+        self,
+        blob: bytes,
+        string_offsets: np.ndarray,
+        text_ids: np.ndarray,
+        correct_ids: np.ndarray,
+        explanation_ids: np.ndarray,
+        option_offsets: np.ndarray,
+        option_ids: np.ndarray,
+        type_codes: np.ndarray,
+        difficulty_codes: np.ndarray,
+    ):
+        """Initialize a pack from its columns; use :meth:`from_questions` instead."""
+        self._blob = blob
+        self._string_offsets = string_offsets
+        self._text_ids = text_ids
+        self._correct_ids = correct_ids
+        self._explanation_ids = explanation_ids
+        self._option_offsets = option_offsets
+        self._option_ids = option_ids
+        # Indexes into QuestionType / Difficulty, in declaration order
+        self.type_codes = type_codes
+        self.difficulty_codes = difficulty_codes
+
+    @classmethod
+    def from_questions(cls, questions: Iterable[Question]) -> "QuestionPack":
+        """Pack questions, storing each distinct string once."""
+        string_ids: dict[str, int] = {}
+
+        def intern(value: str) -> int:
+            string_id = string_ids.get(value)
+            if string_id is None:
+                string_id = string_ids[value] = len(string_ids)
+            return string_id
+
+        text_ids = array("I")
+        correct_ids = array("I")
+        explanation_ids = array("I")
+        option_offsets = array("q", [0])
+        option_ids = array("I")
+        type_codes = array("B")
+        difficulty_codes = array("B")
+        for question in questions:
+            text_ids.append(intern(question.question_text))
+            correct_ids.append(intern(question.correct_answer))
+            explanation_ids.append(
+                NO_STRING if question.explanation is None else intern(question.explanation)
+            )
+            option_ids.extend(intern(option) for option in question.options)
+            option_offsets.append(len(option_ids))
+            type_codes.append(_TYPE_CODES[question.question_type])
+            difficulty_codes.append(_DIFFICULTY_CODES[question.difficulty])
+
+        encoded = [value.encode() for value in string_ids]
+        string_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=string_offsets[1:])
+
+        return cls(
+            blob=b"".join(encoded),
+            string_offsets=string_offsets,
+            text_ids=np.frombuffer(text_ids, dtype=np.uint32),
+            correct_ids=np.frombuffer(correct_ids, dtype=np.uint32),
+            explanation_ids=np.frombuffer(explanation_ids, dtype=np.uint32),
+            option_offsets=np.frombuffer(option_offsets, dtype=np.int64),
+            option_ids=np.frombuffer(option_ids, dtype=np.uint32),
+            type_codes=np.frombuffer(type_codes, dtype=np.uint8),
+            difficulty_codes=np.frombuffer(difficulty_codes, dtype=np.uint8),
+        )
+
+    def _string(self, string_id: int) -> str:
+        start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+        return self._blob[start:end].decode()
+
+    def _question(self, index: int) -> Question:
+        start, end = self._option_offsets[index], self._option_offsets[index + 1]
+        explanation_id = self._explanation_ids[index]
+        return Question(
+            question_text=self._string(self._text_ids[index]),
+            question_type=_QUESTION_TYPES[self.type_codes[index]],
+            options=[self._string(option_id) for option_id in self._option_ids[start:end]],
+            correct_answer=self._string(self._correct_ids[index]),
+            difficulty=_DIFFICULTIES[self.difficulty_codes[index]],
+            explanation=None if explanation_id == NO_STRING else self._string(explanation_id),
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> Question: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Question]: ...
+
+    def __getitem__(self, index: int | slice) -> Question | list[Question]:
+        """Materialize the question at ``index`` (a list of questions for a slice)."""
+        if isinstance(index, slice):
+            return [self._question(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("QuestionPack index out of range")
+        return self._question(index)
+
+    def __len__(self) -> int:
+        return len(self._text_ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the packed data in bytes."""
+        return len(self._blob) + sum(
+            column.nbytes
+            for column in (
+                self._string_offsets,
+                self._text_ids,
+                self._correct_ids,
+                self._explanation_ids,
+                self._option_offsets,
+                self._option_ids,
+                self.type_codes,
+                self.difficulty_codes,
+            )
+        )
+
+    def select(
+        self,
+        question_types: Sequence[QuestionType] | None = None,
+        difficulty: Difficulty | None = None,
+    ) -> np.ndarray:
+        """Return the indices of questions matching the given types and difficulty."""
+        mask = np.ones(len(self), dtype=bool)
+        if question_types is not None:
+            codes = [_TYPE_CODES[question_type] for question_type in question_types]
+            mask &= np.isin(self.type_codes, codes)
+        if difficulty is not None:
+            mask &= self.difficulty_codes == _DIFFICULTY_CODES[difficulty]
+        return np.flatnonzero(mask)
+
+    def sample(
+        self,
+        k: int,
+        question_types: Sequence[QuestionType] | None = None,
+        difficulty: Difficulty | None = None,
+        rng: random.Random | None = None,
+    ) -> list[Question]:
+        """Materialize ``k`` distinct random questions matching the given filters.
+
+        Raises ValueError if fewer than ``k`` questions match.
+        """
+        indices = self.select(question_types, difficulty)
+        if k > len(indices):
+            raise ValueError(f"Only {len(indices)} matching questions, {k} requested")
+        chosen = (rng or random).sample(range(len(indices)), k)
+        return [self._question(int(indices[i])) for i in chosen]
@@ -0,0 +1,294 @@
+"""Compact, versioned binary encoding of questions, quizzes and results.
+
+Pydantic JSON repeats every key and spells out enums; this format stores each distinct
+string once and everything else as fixed-width little-endian columns, for caches and
+persistence layers that do not need readable data. A message is::
+
+    header   "QQB" | uint8 version | uint8 kind | uint8 index width
+             | uint32 string count | uint32 string bytes
+    strings  uint32 length (in characters) per string, then all strings as one UTF-8 blob
+    body     the encoded object, referring to strings by index
+
+Index 0 means "no string"; real strings start at 1. Strings are interned per message,
+so options shared by questions (True/False) and answers equal to an option are stored
+once. Indexes are 2 bytes wide when a message has fewer than 65536 strings and 4 bytes
+otherwise.
+
+Questions are stored column by column (all texts, then all types, ...), so a quiz is
+packed and unpacked with a few ``struct`` calls whatever its size. Enums are stored as
+their position in the enum and timings as float64, so a round trip is lossless.
+
+Messages are less than half the size of ``model_dump_json`` output; encoding and
+decoding run in Python, so they are not faster than Pydantic's JSON (see
+benchmarks/bench_binary_serialization.py). Decoding builds models without validation,
+as every field is typed by the format itself: only decode data produced by :func:`dumps`.
+"""
+
+import struct
+from itertools import accumulate, chain
+from typing import Any
+
+from quli_quiz.models import (
+    Difficulty,
+    Question,
+    QuestionType,
+    Quiz,
+    QuizConfig,
+    QuizResult,
+    UserAnswer,
+    construct,
+)
+
+MAGIC = b"QQB"
+FORMAT_VERSION = 1
+
+KIND_QUESTION = 1
+KIND_QUIZ = 2
+KIND_RESULT = 3
+
+_HEADER = struct.Struct("<3sBBBII")
+_NO_DIFFICULTY = 0xFF
+
+_QUESTION_TYPES = list(QuestionType)
+_DIFFICULTIES = list(Difficulty)
+_TYPE_CODES = {question_type: code for code, question_type in enumerate(_QUESTION_TYPES)}
+_DIFFICULTY_CODES = {difficulty: code for code, difficulty in enumerate(_DIFFICULTIES)}
+
+_FLAG_CORRECT = 0x01
+_FLAG_HAS_TIME = 0x02
+_FLAG_HAS_CUMULATIVE = 0x04
+
+# In body layouts, "S" is a string index, packed as H or I depending on the message
+
+
+class _Writer:
+    def __init__(self):
+        self.strings: dict[str | None, int] = {None: 0}
+        self.layout: list[str] = []
+        self.values: list = []
+
+    def intern(self, values) -> list[int]:
+        strings = self.strings
+        return [strings.setdefault(value, len(strings)) for value in values]
+
+    def add(self, layout: str, values) -> None:
+        self.layout.append(layout)
+        self.values.extend(values)
+
+    def questions(self, questions: list[Question]) -> None:
+        n = len(questions)
+        options = [q.options for q in questions]
+        self.add("I", (n,))
+        self.add(
+            f"{n}S{n}B{n}B{n}S{n}S{n}H",
+            chain(
+                self.intern([q.question_text for q in questions]),
+                [_TYPE_CODES[q.question_type] for q in questions],
+                [_DIFFICULTY_CODES[q.difficulty] for q in questions],
+                self.intern([q.correct_answer for q in questions]),
+                self.intern([q.explanation for q in questions]),
+                map(len, options),
+            ),
+        )
+        option_ids = self.intern(chain.from_iterable(options))
+        self.add(f"{len(option_ids)}S", option_ids)
+
+    def quiz(self, quiz: Quiz) -> None:
+        config = quiz.config
+        types = [_TYPE_CODES[question_type] for question_type in config.question_types]
+        difficulty = config.difficulty
+        self.add(
+            f"SSHBB{len(types)}B",
+            (
+                *self.intern([quiz.topic, config.topic]),
+                config.num_questions,
+                _NO_DIFFICULTY if difficulty is None else _DIFFICULTY_CODES[difficulty],
+                len(types),
+                *types,
+            ),
+        )
+        self.questions(quiz.questions)
+
+    def result(self, result: QuizResult) -> None:
+        self.quiz(result.quiz)
+        answers = result.answers
+        n = len(answers)
+        self.add(
+            "dIIBdI",
+            (
+                result.score,
+                result.total_questions,
+                result.correct_answers,
+                result.time_taken is not None,
+                result.time_taken or 0.0,
+                n,
+            ),
+        )
+        self.add(
+            f"{n}I{n}S{n}B{n}d{n}d",
+            chain(
+                [a.question_index for a in answers],
+                self.intern([a.answer for a in answers]),
+                [
+                    (_FLAG_CORRECT if a.is_correct else 0)
+                    | (_FLAG_HAS_TIME if a.time_taken is not None else 0)
+                    | (_FLAG_HAS_CUMULATIVE if a.cumulative_time is not None else 0)
+                    for a in answers
+                ],
+                [a.time_taken or 0.0 for a in answers],
+                [a.cumulative_time or 0.0 for a in answers],
+            ),
+        )
+
+    def getvalue(self, kind: int) -> bytes:
+        strings = list(self.strings)[1:]
+        index_width = 2 if len(self.strings) <= 0xFFFF else 4
+        index_code = "H" if index_width == 2 else "I"
+        blob = "".join(strings).encode()
+        return b"".join(
+            (
+                _HEADER.pack(MAGIC, FORMAT_VERSION, kind, index_width, len(strings), len(blob)),
+                struct.pack(f"<{len(strings)}I", *map(len, strings)),
+                blob,
+                struct.pack("<" + "".join(self.layout).replace("S", index_code), *self.values),
+            )
+        )
+
+
+def dumps(obj: Question | Quiz | QuizResult) -> bytes:
+    """Encode a question, quiz or result; subclasses are encoded as their base model."""
+    writer = _Writer()
+    if isinstance(obj, QuizResult):
+        writer.result(obj)
+        return writer.getvalue(KIND_RESULT)
+    if isinstance(obj, Quiz):
+        writer.quiz(obj)
+        return writer.getvalue(KIND_QUIZ)
+    if isinstance(obj, Question):
+        writer.questions([obj])
+        return writer.getvalue(KIND_QUESTION)
+    raise TypeError(f"Cannot encode {type(obj).__name__}")
+
+
+class _Reader:
+    def __init__(self, data: bytes, offset: int, index_width: int, strings: list[str | None]):
+        self.data = data
+        self.offset = offset
+        self.index_code = "H" if index_width == 2 else "I"
+        self.strings = strings
+
+    def unpack(self, layout: str) -> tuple:
+        fmt = "<" + layout.replace("S", self.index_code)
+        values = struct.unpack_from(fmt, self.data, self.offset)
+        self.offset += struct.calcsize(fmt)
+        return values
+
+    def questions(self) -> list[Question]:
+        (n,) = self.unpack("I")
+        columns = self.unpack(f"{n}S{n}B{n}B{n}S{n}S{n}H")
+        texts, types, difficulties, correct, explanations, option_counts = (
+            columns[i * n : (i + 1) * n] for i in range(6)
+        )
+        strings = self.strings
+        option_ids = self.unpack(f"{sum(option_counts)}S")
+        ends = list(accumulate(option_counts))
+        return [
+            construct(
+                Question,
+                {
+                    "question_text": strings[text],
+                    "question_type": _QUESTION_TYPES[type_code],
+                    "options": [strings[i] for i in option_ids[end - count : end]],
+                    "correct_answer": strings[answer],
+                    "difficulty": _DIFFICULTIES[difficulty],
+                    "explanation": strings[explanation],
+                },
+            )
+            for text, type_code, difficulty, answer, explanation, count, end in zip(
+                texts, types, difficulties, correct, explanations, option_counts, ends, strict=True
+            )
+        ]
+
+    def quiz(self) -> Quiz:
+        topic, config_topic, num_questions, difficulty, type_count = self.unpack("SSHBB")
+        types = self.unpack(f"{type_count}B")
+        config = construct(
+            QuizConfig,
+            {
+                "topic": self.strings[config_topic],
+                "num_questions": num_questions,
+                "difficulty": None if difficulty == _NO_DIFFICULTY else _DIFFICULTIES[difficulty],
+                "question_types": [_QUESTION_TYPES[code] for code in types],
+            },
+        )
+        return construct(
+            Quiz, {"topic": self.strings[topic], "questions": self.questions(), "config": config}
+        )
+
+    def result(self) -> QuizResult:
+        quiz = self.quiz()
+        score, total, correct, has_time, time_taken, n = self.unpack("dIIBdI")
+        columns = self.unpack(f"{n}I{n}S{n}B{n}d{n}d")
+        strings = self.strings
+        answers = [
+            construct(
+                UserAnswer,
+                {
+                    "question_index": question_index,
+                    "answer": strings[answer],
+                    "is_correct": bool(flags & _FLAG_CORRECT),
+                    "time_taken": answer_time if flags & _FLAG_HAS_TIME else None,
+                    "cumulative_time": cumulative if flags & _FLAG_HAS_CUMULATIVE else None,
+                },
+            )
+            for question_index, answer, flags, answer_time, cumulative in zip(
+                *(columns[i * n : (i + 1) * n] for i in range(5)), strict=True
+            )
+        ]
+        return construct(
+            QuizResult,
+            {
+                "quiz": quiz,
+                "answers": answers,
+                "score": score,
+                "total_questions": total,
+                "correct_answers": correct,
+                "time_taken": time_taken if has_time else None,
+            },
+        )
+
+
+_DECODERS: dict[int, Any] = {
+    KIND_QUESTION: lambda reader: reader.questions()[0],
+    KIND_QUIZ: _Reader.quiz,
+    KIND_RESULT: _Reader.result,
+}
+
+
+def loads(data: bytes) -> Question | Quiz | QuizResult:
+    """Decode a message produced by :func:`dumps`.
+
+    Raises ValueError if ``data`` is not a well-formed message of a supported version.
+    """
+    try:
+        magic, version, kind, index_width, count, blob_size = _HEADER.unpack_from(data, 0)
+    except struct.error as e:
+        raise ValueError("Truncated binary message") from e
+    if magic != MAGIC:
+        raise ValueError("Not a quli binary message")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported binary format version {version}")
+    if kind not in _DECODERS:
+        raise ValueError(f"Unknown binary message kind {kind}")
+
+    try:
+        offset = _HEADER.size
+        lengths = struct.unpack_from(f"<{count}I", data, offset)
+        offset += 4 * count
+        text = data[offset : offset + blob_size].decode()
+        bounds = list(accumulate(lengths, initial=0))
+        strings = [None]
+        strings += [text[start:end] for start, end in zip(bounds, bounds[1:], strict=False)]
+        return _DECODERS[kind](_Reader(data, offset + blob_size, index_width, strings))
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError("Corrupt binary message") from e
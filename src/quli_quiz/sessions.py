@@ -0,0 +1,362 @@
+"""Lifetime management for many concurrent quiz engines in one process.
+
+A :class:`SessionManager` hands out ``QuizEngine`` instances by session id. Each
+session has its own lock, so requests for different sessions never wait on each other
+while calls on the same session are serialized. Live engines are capped: when the cap
+is exceeded the least recently used idle sessions are spilled to a
+:class:`SessionStore` as compact snapshots and restored on their next use. Sessions
+unused for longer than the idle TTL expire, live or spilled.
+
+Snapshots are taken, saved and loaded under the session's own lock, never the
+manager-wide one, so a slow store only delays the session being spilled or restored.
+The manager lock may be taken while holding a session lock, never the reverse.
+
+Quizzes are shared: sessions on the same quiz keep one ``Quiz`` object and one compiled
+answer key, and spilled sessions only keep their snapshot.
+"""
+
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Protocol
+
+from quli_quiz.engine import QuizEngine, quiz_fingerprint
+from quli_quiz.grading import AnswerKey
+from quli_quiz.models import Quiz
+
+
+class SessionStore(Protocol):
+    """Where spilled sessions are kept, as :meth:`QuizEngine.snapshot` bytes."""
+
+    def save(self, session_id: str, snapshot: bytes) -> None: ...
+
+    def load(self, session_id: str) -> bytes | None: ...
+
+    def delete(self, session_id: str) -> None: ...
+
+
+class MemorySessionStore:
+    """Keeps snapshots in a dict; a spilled session costs only its snapshot bytes."""
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._snapshots: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def save(self, session_id: str, snapshot: bytes) -> None:
+        with self._lock:
+            self._snapshots[session_id] = snapshot
+
+    def load(self, session_id: str) -> bytes | None:
+        with self._lock:
+            return self._snapshots.get(session_id)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._snapshots.pop(session_id, None)
+
+
+_SAFE_ID = re.compile(r"[A-Za-z0-9_-]+")
+
+
+class DirectorySessionStore:
+    """Keeps snapshots as files in a directory, one per session."""
+
+    def __init__(self, path: Path):
+        """Initialize the store, creating the directory if needed."""
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def _file(self, session_id: str) -> Path:
+        if not _SAFE_ID.fullmatch(session_id):
+            raise ValueError(f"Invalid session id {session_id!r}")
+        return self.path / f"{session_id}.json"
+
+    def save(self, session_id: str, snapshot: bytes) -> None:
+        path = self._file(session_id)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(snapshot)
+        tmp_path.replace(path)
+
+    def load(self, session_id: str) -> bytes | None:
+        try:
+            return self._file(session_id).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, session_id: str) -> None:
+        self._file(session_id).unlink(missing_ok=True)
+
+
+@dataclass(frozen=True)
+class SessionMetrics:
+    """Counts of sessions by state, and of lifetime events since the manager started."""
+
+    live: int
+    spilled: int
+    in_use: int
+    quizzes: int
+    created: int
+    closed: int
+    expired: int
+    spills: int
+    restores: int
+
+
+@dataclass(eq=False)
+class _SharedQuiz:
+    quiz: Quiz
+    answer_key: AnswerKey
+    sessions: int = 0
+
+
+@dataclass(eq=False)
+class _Session:
+    quiz_key: str
+    last_used: float
+    engine: QuizEngine | None = None  # None while spilled; changed under ``lock``
+    spilled_at: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    pins: int = 0  # Callers holding or waiting for the session, and spills in progress
+    closed: bool = False
+
+
+class SessionManager:
+    """Hosts quiz engines by session id with per-session locking and bounded memory."""
+
+    def __init__(
+        self,
+        max_live: int = 10_000,
+        idle_ttl: float = 1800.0,
+        store: SessionStore | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sweep_interval: float = 60.0,
+    ):
+        """Initialize the manager.
+
+        ``max_live`` caps the engines kept in memory; ``idle_ttl`` is how long (in
+        seconds) a session may go unused before it expires. Expired sessions are swept
+        at most once per ``sweep_interval`` seconds, as a side effect of other calls.
+        """
+        self.max_live = max_live
+        self.idle_ttl = idle_ttl
+        self.store = store if store is not None else MemorySessionStore()
+        self.sweep_interval = sweep_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sessions: dict[str, _Session] = {}
+        # Live sessions that may be spilled, least recently used first
+        self._live: OrderedDict[str, _Session] = OrderedDict()
+        # Shared quizzes by fingerprint
+        self._quizzes: dict[str, _SharedQuiz] = {}
+        self._last_sweep = clock()
+        self._created = self._closed = self._expired = self._spills = self._restores = 0
+
+    def create(self, quiz: Quiz) -> str:
+        """Start a new engine on ``quiz`` and return its session id."""
+        quiz_key = quiz_fingerprint(quiz)
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            shared = self._quizzes.get(quiz_key)
+            if shared is None:
+                shared = self._quizzes[quiz_key] = _SharedQuiz(quiz, AnswerKey.from_quiz(quiz))
+            shared.sessions += 1
+            engine = QuizEngine(shared.quiz, clock=self._clock, answer_key=shared.answer_key)
+            engine.start()
+            entry = _Session(quiz_key=quiz_key, last_used=self._clock(), engine=engine)
+            self._sessions[session_id] = entry
+            self._live[session_id] = entry
+            self._created += 1
+            victims = self._select_victims()
+        self._spill(victims)
+        self._maybe_sweep()
+        return session_id
+
+    @contextmanager
+    def session(self, session_id: str) -> Iterator[QuizEngine]:
+        """Lock a session and yield its engine, restoring it first if it was spilled.
+
+        Raises KeyError if the session does not exist (closed, expired or never created).
+        """
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                raise KeyError(session_id)
+            entry.pins += 1
+        try:
+            with entry.lock:
+                if entry.engine is None:
+                    self._restore(session_id, entry)
+                with self._lock:
+                    if entry.closed:
+                        raise KeyError(session_id)
+                    if session_id in self._live:
+                        self._live.move_to_end(session_id)
+                yield entry.engine
+        finally:
+            with self._lock:
+                entry.last_used = self._clock()
+                drop = self._unpin(entry)
+                victims = self._select_victims()
+            if drop:
+                self._drop_snapshot(session_id, entry)
+            self._spill(victims)
+            self._maybe_sweep()
+
+    def close(self, session_id: str) -> None:
+        """Discard a session, e.g. once its quiz is complete. Unknown ids are ignored."""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return
+            drop = self._discard(session_id, entry)
+            self._closed += 1
+        if drop:
+            self._drop_snapshot(session_id, entry)
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def expire_idle(self) -> int:
+        """Discard sessions unused for longer than the idle TTL; return how many."""
+        with self._lock:
+            deadline = self._clock() - self.idle_ttl
+            idle = [
+                (session_id, entry)
+                for session_id, entry in self._sessions.items()
+                if entry.last_used < deadline and not entry.pins
+            ]
+            dropped = [
+                (session_id, entry)
+                for session_id, entry in idle
+                if self._discard(session_id, entry)
+            ]
+            self._expired += len(idle)
+            self._last_sweep = self._clock()
+        for session_id, entry in dropped:
+            self._drop_snapshot(session_id, entry)
+        return len(idle)
+
+    def metrics(self) -> SessionMetrics:
+        """Return current session counts."""
+        with self._lock:
+            return SessionMetrics(
+                live=len(self._live),
+                spilled=len(self._sessions) - len(self._live),
+                in_use=sum(1 for entry in self._sessions.values() if entry.pins),
+                quizzes=len(self._quizzes),
+                created=self._created,
+                closed=self._closed,
+                expired=self._expired,
+                spills=self._spills,
+                restores=self._restores,
+            )
+
+    def _maybe_sweep(self) -> None:
+        if self._clock() - self._last_sweep >= self.sweep_interval:
+            self.expire_idle()
+
+    def _select_victims(self) -> list[tuple[str, _Session]]:
+        """Pick the sessions to spill to get back under the cap, and pin them.
+
+        Called with the manager lock held; sessions in use are never picked. The caller
+        passes the result to :meth:`_spill` once it has released the lock.
+        """
+        excess = len(self._live) - self.max_live
+        if excess <= 0:
+            return []
+        victims = []
+        for session_id, entry in self._live.items():
+            if not entry.pins:
+                victims.append((session_id, entry))
+                if len(victims) == excess:
+                    break
+        for session_id, entry in victims:
+            del self._live[session_id]
+            entry.pins += 1
+        return victims
+
+    def _spill(self, victims: list[tuple[str, _Session]]) -> None:
+        """Snapshot victims to the store, without holding the manager lock."""
+        for session_id, entry in victims:
+            spilled = False
+            with entry.lock:
+                with self._lock:
+                    # Picked up by a caller since it was chosen: keep it live
+                    keep = entry.pins > 1 and not entry.closed
+                    if keep:
+                        self._live[session_id] = entry
+                if not keep and not entry.closed and entry.engine is not None:
+                    self.store.save(session_id, entry.engine.snapshot())
+                    entry.engine = None
+                    entry.spilled_at = self._clock()
+                    spilled = True
+            with self._lock:
+                self._spills += spilled
+                drop = self._unpin(entry)
+            if drop:
+                self._drop_snapshot(session_id, entry)
+
+    def _restore(self, session_id: str, entry: _Session) -> None:
+        # Called with the session lock held, not the manager lock
+        with self._lock:
+            if entry.closed:
+                raise KeyError(session_id)
+            shared = self._quizzes[entry.quiz_key]
+        snapshot = self.store.load(session_id)
+        if snapshot is None:
+            raise KeyError(session_id)
+        # Time spent spilled still counts toward the quiz
+        entry.engine = QuizEngine.restore(
+            shared.quiz,
+            snapshot,
+            clock=self._clock,
+            away=self._clock() - entry.spilled_at,
+            answer_key=shared.answer_key,
+        )
+        self.store.delete(session_id)
+        with self._lock:
+            if not entry.closed:
+                self._live[session_id] = entry
+            self._restores += 1
+
+    def _unpin(self, entry: _Session) -> bool:
+        """Release a pin, with the manager lock held.
+
+        Returns whether the session was closed meanwhile and its snapshot, if any, is
+        now for the caller to delete with :meth:`_drop_snapshot`.
+        """
+        entry.pins -= 1
+        return entry.closed and not entry.pins
+
+    def _discard(self, session_id: str, entry: _Session) -> bool:
+        """Remove a session, with the manager lock held.
+
+        Returns whether its snapshot is for the caller to delete with
+        :meth:`_drop_snapshot`; for pinned sessions the last :meth:`_unpin` does it.
+        """
+        del self._sessions[session_id]
+        self._live.pop(session_id, None)
+        entry.closed = True
+        shared = self._quizzes[entry.quiz_key]
+        shared.sessions -= 1
+        if not shared.sessions:
+            del self._quizzes[entry.quiz_key]
+        return not entry.pins
+
+    def _drop_snapshot(self, session_id: str, entry: _Session) -> None:
+        """Delete a closed session's snapshot, without holding the manager lock."""
+        with entry.lock:
+            if entry.engine is None:
+                self.store.delete(session_id)
@@ -128,32 +128,30 @@ def display_quiz_interface(quiz) -> None:
 
     # Display question
     question.render_question(current_question, question_num, total_questions)
+    engine.present_question(current_index)
 
     # Get answer input
     user_answer = question.render_answer_input(current_question, current_index)
 
     # Store answer
     if user_answer:
+        if st.session_state.answers.get(current_index) != user_answer:
+            engine.mark_answered(current_index)
         st.session_state.answers[current_index] = user_answer
 
     mode = st.session_state.get("quiz_mode", "interactive")
 
     # Show feedback in interactive mode if answer was already submitted
-    answer_submitted_to_engine = any(ans.question_index == current_index for ans in engine.answers)
+    answer_submitted_to_engine = engine.is_answered(current_index)
     if mode == "interactive" and answer_submitted_to_engine:
         submitted_answer = st.session_state.answers.get(current_index)
         if submitted_answer:
-            # Find the answer object
-            user_answer_obj = next(
-                (ans for ans in engine.answers if ans.question_index == current_index), None
+            question.render_feedback(
+                current_question,
+                submitted_answer,
+                engine.get_answer(current_index).is_correct,
+                show_explanation=True,
             )
-            if user_answer_obj:
-                question.render_feedback(
-                    current_question,
-                    submitted_answer,
-                    user_answer_obj.is_correct,
-                    show_explanation=True,
-                )
 
     # Navigation buttons
     col1, col2, col3 = st.columns([1, 1, 1])
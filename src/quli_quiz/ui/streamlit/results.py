@@ -160,9 +160,11 @@ def render_difficulty_breakdown(result: QuizResult) -> None:
 def render_time_analysis(result: QuizResult) -> None:
     """Render time analysis if time data is available."""
     # Check if we have time data per question
+    question_numbers = []
     times_per_question = []
-    for answer in result.answers:
+    for answer in sorted(result.answers, key=lambda a: a.question_index):
         if answer.time_taken is not None:
+            question_numbers.append(answer.question_index + 1)
             times_per_question.append(answer.time_taken)
 
     if not times_per_question:
@@ -170,7 +172,6 @@ def render_time_analysis(result: QuizResult) -> None:
         return
 
     # Time per question chart
-    question_numbers = list(range(1, len(times_per_question) + 1))
     fig = px.bar(
         x=question_numbers,
         y=times_per_question,
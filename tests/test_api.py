@@ -1,10 +1,12 @@
 from unittest.mock import MagicMock, patch
 
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from quli_quiz.api import admission
 from quli_quiz.api.database import Base, get_db
 from quli_quiz.api.main import app
 from quli_quiz.models import Difficulty, Question, QuestionType, Quiz, QuizConfig
@@ -41,6 +43,14 @@ def teardown_module(module):
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def unlimited_generation():
+    # All test requests come from one client, so lift the per-client rate limit
+    limiter = admission.ClientRateLimiter(rate=1000.0, capacity=1000.0)
+    with patch.object(admission, "generation_rate_limiter", limiter):
+        yield
+
+
 @patch("quli_quiz.api.routes.QuizGenerator")
 def test_create_quiz(mock_generator_cls):
     # Setup mock
@@ -138,3 +148,884 @@ def test_submit_quiz(mock_generator_cls):
     data = response.json()
     assert data["score"] == 0.0
     assert data["correct_answers"] == 0
+
+
+def create_mock_quiz(mock_generator_cls, questions=None, topic="Math"):
+    """Create a quiz through the API with a mocked generator and return its ID."""
+    mock_generator = MagicMock()
+    mock_generator_cls.return_value = mock_generator
+    if questions is None:
+        questions = [
+            Question(
+                question_text="1+1?",
+                question_type=QuestionType.MULTIPLE_CHOICE,
+                options=["1", "2", "3", "4"],
+                correct_answer="2",
+                difficulty=Difficulty.EASY,
+            ),
+            Question(
+                question_text="2+2=5",
+                question_type=QuestionType.TRUE_FALSE,
+                options=["True", "False"],
+                correct_answer="False",
+                difficulty=Difficulty.HARD,
+            ),
+        ]
+    mock_generator.generate_quiz.return_value = Quiz(
+        topic=topic,
+        config=QuizConfig(topic=topic, num_questions=len(questions)),
+        questions=questions,
+    )
+    response = client.post(
+        "/quizzes/",
+        json={"topic": topic, "config": {"topic": topic, "num_questions": len(questions)}},
+    )
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_quiz_stats_and_leaderboard(mock_generator_cls):
+    quiz_id = create_mock_quiz(mock_generator_cls, topic="Stats")
+
+    response = client.get(f"/quizzes/{quiz_id}/stats")
+    assert response.status_code == 200
+    assert response.json()["attempt_count"] == 0
+
+    client.post(
+        f"/quizzes/{quiz_id}/submit",
+        json={
+            "answers": [
+                {"question_index": 0, "answer": "2"},
+                {"question_index": 1, "answer": "False"},
+            ]
+        },
+    )
+    client.post(
+        f"/quizzes/{quiz_id}/submit",
+        json={
+            "answers": [
+                {"question_index": 0, "answer": "2"},
+                {"question_index": 1, "answer": "True"},
+            ]
+        },
+    )
+
+    data = client.get(f"/quizzes/{quiz_id}/stats").json()
+    assert data["attempt_count"] == 2
+    assert data["mean_score"] == 75.0
+    assert data["best_score"] == 100.0
+    assert data["score_stddev"] == 25.0
+    assert [q["correct_count"] for q in data["questions"]] == [2, 1]
+    by_difficulty = {d["difficulty"]: d["accuracy"] for d in data["difficulties"]}
+    assert by_difficulty == {"easy": 100.0, "hard": 50.0}
+
+    leaderboard = client.get("/leaderboard", params={"scope": "topic"}).json()
+    entry = next(e for e in leaderboard["entries"] if e["topic"] == "Stats")
+    assert entry["attempt_count"] == 2
+    assert entry["mean_score"] == 75.0
+
+    leaderboard = client.get("/leaderboard").json()
+    assert any(e["quiz_id"] == quiz_id for e in leaderboard["entries"])
+    scores = [e["mean_score"] for e in leaderboard["entries"]]
+    assert scores == sorted(scores, reverse=True)
+
+    assert client.get("/quizzes/999999/stats").status_code == 404
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_submit_repeated_answer(mock_generator_cls):
+    """Test that only the last answer to a question counts."""
+    from quli_quiz.api import models
+
+    quiz_id = create_mock_quiz(mock_generator_cls, topic="Repeats")
+
+    response = client.post(
+        f"/quizzes/{quiz_id}/submit",
+        json={
+            "answers": [
+                {"question_index": 0, "answer": "3"},
+                {"question_index": 0, "answer": "2"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["correct_answers"] == 1
+    assert data["score"] == 50.0
+
+    with TestingSessionLocal() as db:
+        answers = db.query(models.UserAnswerModel).filter_by(result_id=data["id"]).all()
+        assert [(a.question_index, a.answer) for a in answers] == [(0, "2")]
+
+    stats = client.get(f"/quizzes/{quiz_id}/stats").json()
+    assert [(q["answered_count"], q["correct_count"]) for q in stats["questions"]] == [(1, 1)]
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_read_quiz_etag(mock_generator_cls):
+    from quli_quiz.api.cache import quiz_response_cache
+
+    quiz_id = create_mock_quiz(mock_generator_cls)
+
+    response = client.get(f"/quizzes/{quiz_id}")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert "immutable" in response.headers["cache-control"]
+    assert response.json()["id"] == quiz_id
+    assert [q["question_text"] for q in response.json()["questions"]] == ["1+1?", "2+2=5"]
+
+    response = client.get(f"/quizzes/{quiz_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # Without the cached body, the stored digest still answers the conditional GET
+    quiz_response_cache.clear()
+    response = client.get(f"/quizzes/{quiz_id}", headers={"If-None-Match": f"W/{etag}"})
+    assert response.status_code == 304
+
+    response = client.get(f"/quizzes/{quiz_id}")
+    assert response.status_code == 200
+    assert response.headers["etag"] == etag
+
+    assert client.get("/quizzes/999999").status_code == 404
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_questions_are_deduplicated(mock_generator_cls):
+    from quli_quiz.api import models
+
+    repeated = Question(
+        question_text="  Capital of  France? ",
+        question_type=QuestionType.MULTIPLE_CHOICE,
+        options=["Paris", "Rome", "Madrid", "Berlin"],
+        correct_answer="Paris",
+        difficulty=Difficulty.EASY,
+    )
+    same_question = repeated.model_copy(update={"question_text": "capital of france?"})
+    first_id = create_mock_quiz(mock_generator_cls, questions=[repeated, same_question])
+    second_id = create_mock_quiz(mock_generator_cls, questions=[same_question])
+
+    first = client.get(f"/quizzes/{first_id}").json()
+    second = client.get(f"/quizzes/{second_id}").json()
+    assert len(first["questions"]) == 2
+    question_ids = {q["id"] for q in first["questions"] + second["questions"]}
+    assert len(question_ids) == 1
+
+    db = TestingSessionLocal()
+    try:
+        stored = (
+            db.query(models.QuestionModel)
+            .filter(models.QuestionModel.content_hash == models.question_content_hash(repeated))
+            .all()
+        )
+        assert len(stored) == 1
+    finally:
+        db.close()
+
+    # Both positions of the first quiz grade against the shared row
+    response = client.post(
+        f"/quizzes/{first_id}/submit",
+        json={
+            "answers": [
+                {"question_index": 0, "answer": "Paris"},
+                {"question_index": 1, "answer": "a"},
+            ]
+        },
+    )
+    assert response.json()["correct_answers"] == 2
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_submit_batch(mock_generator_cls):
+    first_id = create_mock_quiz(mock_generator_cls, topic="Batch")
+    second_id = create_mock_quiz(mock_generator_cls, topic="Batch")
+
+    response = client.post(
+        "/submissions/batch",
+        json={
+            "submissions": [
+                {"quiz_id": first_id, "answers": [{"question_index": 0, "answer": "2"}]},
+                {"quiz_id": 999999, "answers": []},
+                {
+                    "quiz_id": second_id,
+                    "answers": [
+                        {"question_index": 0, "answer": "b", "time_taken": 1.5},
+                        {"question_index": 1, "answer": "False", "time_taken": 2.0},
+                    ],
+                },
+            ]
+        },
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["quiz_id"] for r in results] == [first_id, 999999, second_id]
+    assert results[0]["score"] == 50.0
+    assert results[1]["error"] == "Quiz not found"
+    assert results[1]["result_id"] is None
+    assert results[2]["correct_answers"] == 2
+    assert results[2]["time_taken"] == 3.5
+    assert results[0]["result_id"] < results[2]["result_id"]
+
+    stats = client.get(f"/quizzes/{second_id}/stats").json()
+    assert stats["attempt_count"] == 1
+    assert stats["mean_score"] == 100.0
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_create_quiz_load_shedding(mock_generator_cls):
+    payload = {"topic": "Math", "config": {"topic": "Math", "num_questions": 1}}
+
+    full = admission.AdmissionController(max_concurrent=0, max_queue=0, queue_timeout=0.1)
+    with patch.object(admission, "generation_admission", full):
+        response = client.post("/quizzes/", json=payload)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    mock_generator_cls.assert_not_called()
+
+    clock = MagicMock(return_value=100.0)
+    limiter = admission.ClientRateLimiter(rate=0.5, capacity=1, clock=clock)
+    with patch.object(admission, "generation_rate_limiter", limiter):
+        create_mock_quiz(mock_generator_cls)
+        response = client.post("/quizzes/", json=payload)
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "2"
+
+        clock.return_value = 102.0
+        create_mock_quiz(mock_generator_cls)
+
+
+def test_rate_limit_settings_are_validated():
+    """Test that a zero rate is rejected up front instead of failing every request."""
+    import os
+    import subprocess
+    import sys
+
+    with pytest.raises(ValueError, match="rate must be positive"):
+        admission.ClientRateLimiter(rate=0.0, capacity=5)
+    with pytest.raises(ValueError, match="capacity"):
+        admission.TokenBucket(rate=1.0, capacity=0.5)
+
+    env = {**os.environ, "QULI_GENERATION_RATE_PER_MINUTE": "0"}
+    result = subprocess.run(
+        [sys.executable, "-c", "import quli_quiz.api.admission"],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode != 0
+    assert "QULI_GENERATION_RATE_PER_MINUTE must be positive" in result.stderr
+
+
+def test_admission_controller_queue():
+    controller = admission.AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.01)
+    with controller.admit():
+        assert controller.in_flight == 1
+        # One waiter is allowed to queue and times out; the slot is still held
+        with pytest.raises(admission.OverloadedError), controller.admit():
+            pass
+    with controller.admit():
+        assert controller.in_flight == 1
+    assert controller.in_flight == 0
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_metrics_endpoint(mock_generator_cls):
+    quiz_id = create_mock_quiz(mock_generator_cls)
+    client.post(f"/quizzes/{quiz_id}/submit", json={"answers": []})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert "# TYPE quli_http_request_duration_seconds histogram" in text
+    assert (
+        'quli_http_request_duration_seconds_count{method="POST",'
+        'route="/quizzes/{quiz_id}/submit",status="200"}'
+    ) in text
+    db_queries = next(
+        line
+        for line in text.splitlines()
+        if line.startswith('quli_db_queries_per_request_sum{route="/quizzes/{quiz_id}/submit"}')
+    )
+    assert float(db_queries.split()[-1]) > 0
+    assert 'quli_generator_duration_seconds_count{outcome="success"}' in text
+    assert 'quli_stage_duration_seconds_count{endpoint="submit_quiz",stage="grade"}' in text
+    assert 'quli_http_requests_in_flight{method="GET"} 1' in text
+
+
+def test_query_timer_survives_failed_statements():
+    """Test that a failed statement leaves no timer behind on its connection."""
+    from sqlalchemy.exc import OperationalError
+
+    from quli_quiz.api import metrics
+
+    stats = metrics.RequestStats()
+    token = metrics.current_request.set(stats)
+    try:
+        with engine.connect() as connection:
+            with pytest.raises(OperationalError):
+                connection.exec_driver_sql("SELECT * FROM no_such_table")
+            connection.exec_driver_sql("SELECT 1")
+            assert not connection.info.get("quli_query_start")
+    finally:
+        metrics.current_request.reset(token)
+    assert stats.queries == 1
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_search_questions(mock_generator_cls):
+    questions = [
+        Question(
+            question_text="Which planet is known as the Red Planet?",
+            question_type=QuestionType.MULTIPLE_CHOICE,
+            options=["Venus", "Mars", "Jupiter", "Saturn"],
+            correct_answer="Mars",
+            difficulty=Difficulty.EASY,
+            explanation="Iron oxide gives the planet its colour.",
+        ),
+        Question(
+            question_text="Jupiter is the largest planet in the solar system.",
+            question_type=QuestionType.TRUE_FALSE,
+            options=["True", "False"],
+            correct_answer="True",
+            difficulty=Difficulty.MEDIUM,
+        ),
+    ]
+    create_mock_quiz(mock_generator_cls, questions=questions, topic="Astronomy")
+
+    response = client.get("/questions/search", params={"q": "planets"})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 2
+    assert results[0]["rank"] <= results[1]["rank"]
+
+    results = client.get("/questions/search", params={"q": "iron oxide"}).json()["results"]
+    assert [r["correct_answer"] for r in results] == ["Mars"]
+
+    params = {"q": "jupiter", "difficulty": "medium", "topic": "astronomy"}
+    results = client.get("/questions/search", params=params).json()["results"]
+    assert [r["question_type"] for r in results] == ["true_false"]
+
+    params = {"q": "jupiter", "topic": "Cooking"}
+    assert client.get("/questions/search", params=params).json()["results"] == []
+
+    # FTS syntax characters in user input are treated as plain text
+    response = client.get("/questions/search", params={"q": 'red" OR (planet'})
+    assert response.status_code == 200
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_archive_answers(mock_generator_cls):
+    from datetime import timedelta
+
+    from quli_quiz.api import archive, models
+
+    quiz_id = create_mock_quiz(mock_generator_cls)
+    answers = [
+        {"question_index": 0, "answer": "2", "time_taken": 1.5},
+        {"question_index": 1, "answer": "not an option"},
+    ]
+    result_id = client.post(f"/quizzes/{quiz_id}/submit", json={"answers": answers}).json()["id"]
+    before = client.get(f"/results/{result_id}").json()
+    assert [a["answer"] for a in before["answers"]] == ["2", "not an option"]
+
+    db = TestingSessionLocal()
+    try:
+        archived = archive.compact_results(db, models.utcnow() + timedelta(seconds=1), batch_size=2)
+        assert archived >= 1
+        remaining = (
+            db.query(models.UserAnswerModel)
+            .filter(models.UserAnswerModel.result_id == result_id)
+            .count()
+        )
+        assert remaining == 0
+        blob = db.get(models.ArchivedAnswersModel, result_id)
+        assert blob.answer_count == 2
+        assert len(blob.data) < 40
+        # Nothing left to archive on a second pass
+        assert archive.compact_results(db, models.utcnow() + timedelta(seconds=1)) == 0
+    finally:
+        db.close()
+
+    after = client.get(f"/results/{result_id}").json()
+    assert after == before
+    assert client.get("/results/999999").status_code == 404
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_archive_skips_unpackable_results(mock_generator_cls):
+    import struct
+    from datetime import timedelta
+
+    from quli_quiz.api import archive, models
+
+    quiz_id = create_mock_quiz(mock_generator_cls)
+
+    def submit(answer: str, time_taken: float) -> int:
+        answers = [{"question_index": 0, "answer": answer, "time_taken": time_taken}]
+        response = client.post(f"/quizzes/{quiz_id}/submit", json={"answers": answers})
+        return response.json()["id"]
+
+    long_answer = "x" * 70000
+    long_id = submit(long_answer, 1.0)
+    unpackable_id = submit("4", 1e300)  # Beyond float32 range
+    pre_created_at_id = submit("4", 2.0)
+
+    db = TestingSessionLocal()
+    try:
+        db.get(models.QuizResultModel, pre_created_at_id).created_at = None
+        db.commit()
+        archive.compact_results(db, models.utcnow() + timedelta(seconds=1), batch_size=1)
+        assert db.get(models.ArchivedAnswersModel, long_id) is not None
+        assert db.get(models.ArchivedAnswersModel, pre_created_at_id) is not None
+        assert db.get(models.ArchivedAnswersModel, unpackable_id) is None
+        assert (
+            db.query(models.UserAnswerModel)
+            .filter(models.UserAnswerModel.result_id == unpackable_id)
+            .count()
+            == 1
+        )
+    finally:
+        db.close()
+
+    assert client.get(f"/results/{long_id}").json()["answers"][0]["answer"] == long_answer
+    assert client.get(f"/results/{unpackable_id}").json()["answers"][0]["time_taken"] == 1e300
+
+    # Blobs written with 16-bit text lengths still decode
+    version_1 = struct.pack("<BH", 1, 1) + struct.pack("<HbBf", 0, -1, 0, 0.0)
+    version_1 += struct.pack("<H", 3) + b"abc"
+    assert [a.answer for a in archive.unpack_answers(version_1, [["4"]])] == ["abc"]
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_idempotency_keys(mock_generator_cls):
+    quiz_id = create_mock_quiz(mock_generator_cls, topic="Idempotent")
+    generate = mock_generator_cls.return_value.generate_quiz
+    payload = {"topic": "Idempotent", "config": {"topic": "Idempotent", "num_questions": 2}}
+    headers = {"Idempotency-Key": "create-1"}
+
+    first = client.post("/quizzes/", json=payload, headers=headers)
+    calls = generate.call_count
+    replay = client.post("/quizzes/", json=payload, headers=headers)
+    assert replay.status_code == 200
+    assert replay.content == first.content
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert generate.call_count == calls
+
+    # Reusing a key for a different request is rejected
+    other = {"topic": "Other", "config": {"topic": "Other", "num_questions": 2}}
+    assert client.post("/quizzes/", json=other, headers=headers).status_code == 422
+
+    submission = {"answers": [{"question_index": 0, "answer": "2"}]}
+    headers = {"Idempotency-Key": "submit-1"}
+    results = [
+        client.post(f"/quizzes/{quiz_id}/submit", json=submission, headers=headers)
+        for _ in range(2)
+    ]
+    assert results[0].json()["id"] == results[1].json()["id"]
+    assert client.get(f"/quizzes/{quiz_id}/stats").json()["attempt_count"] == 1
+
+    # Failed requests release the key so the client can retry
+    headers = {"Idempotency-Key": "missing-quiz"}
+    assert (
+        client.post("/quizzes/999999/submit", json=submission, headers=headers).status_code == 404
+    )
+    assert (
+        client.post("/quizzes/999999/submit", json=submission, headers=headers).status_code == 404
+    )
+
+
+def test_idempotency_lease_takeover():
+    from datetime import timedelta
+
+    from fastapi import HTTPException, Response
+    from sqlalchemy.orm import sessionmaker
+
+    from quli_quiz.api import idempotency
+
+    db = TestingSessionLocal()
+    factory = sessionmaker(bind=engine, autoflush=False)
+    fingerprint = idempotency.request_fingerprint("scope", b"{}")
+
+    def handler(body: bytes):
+        return lambda: Response(content=body, media_type="text/plain")
+
+    try:
+        # An owner that never finishes blocks repeats while its lease lasts...
+        leased = idempotency.IdempotencyStore(timedelta(hours=1), wait_timeout=0.1)
+        leased._claim(factory, "busy", fingerprint)
+        with pytest.raises(HTTPException) as error:
+            leased.run(db, "busy", "scope", b"{}", handler(b"new"))
+        assert error.value.status_code == 409
+
+        # ...and once the lease has run out, a repeat takes the claim over
+        expired = idempotency.IdempotencyStore(
+            timedelta(hours=1), wait_timeout=0.1, lease=timedelta(0)
+        )
+        abandoned = expired._claim(factory, "crashed", fingerprint)
+        assert expired.run(db, "crashed", "scope", b"{}", handler(b"new")).body == b"new"
+
+        # The original owner can no longer overwrite the key
+        expired._complete(factory, "crashed", abandoned, Response(content=b"old"))
+        replay = expired.run(db, "crashed", "scope", b"{}", handler(b"other"))
+        assert replay.body == b"new"
+        assert replay.headers[idempotency.REPLAY_HEADER] == "true"
+    finally:
+        db.close()
+
+
+def test_idempotency_claims_of_other_processes():
+    """Test that losing a claim to another process leaves no wait event behind."""
+    from datetime import timedelta
+
+    from fastapi import HTTPException
+    from sqlalchemy.orm import Session, sessionmaker
+
+    from quli_quiz.api import idempotency
+
+    factory = sessionmaker(bind=engine, autoflush=False)
+    fingerprint = idempotency.request_fingerprint("scope", b"{}")
+    # Stores do not share events, like workers in separate processes
+    owner = idempotency.IdempotencyStore(timedelta(hours=1), wait_timeout=0.1)
+    other = idempotency.IdempotencyStore(timedelta(hours=1), wait_timeout=0.1)
+    owner._claim(factory, "remote", fingerprint)
+
+    # The other store reads before the owner's claim lands, so its insert loses the race
+    real_get = Session.get
+    reads = []
+
+    def get(db, *args, **kwargs):
+        reads.append(args)
+        return None if len(reads) == 1 else real_get(db, *args, **kwargs)
+
+    with patch.object(Session, "get", get), pytest.raises(HTTPException) as error:
+        other._claim(factory, "remote", fingerprint)
+    assert error.value.status_code == 409
+    assert len(reads) > 2  # Raced, then polled the owner's claim until the timeout
+    assert other._events == {}
+    assert "remote" in owner._events
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_attempts(mock_generator_cls):
+    quiz_id = create_mock_quiz(mock_generator_cls, topic="Attempts")
+
+    response = client.post(f"/quizzes/{quiz_id}/attempts")
+    assert response.status_code == 201
+    attempt = response.json()
+    assert attempt["status"] == "in_progress"
+    assert attempt["total_questions"] == 2
+
+    url = f"/attempts/{attempt['id']}"
+    data = client.post(f"{url}/answers", json={"question_index": 0, "answer": "B"}).json()
+    assert data["is_correct"] is True
+    assert data["time_taken"] >= 0
+    assert data["answered_count"] == 1
+
+    duplicate = client.post(f"{url}/answers", json={"question_index": 0, "answer": "2"})
+    assert duplicate.status_code == 409
+    invalid = client.post(f"{url}/answers", json={"question_index": 5, "answer": "2"})
+    assert invalid.status_code == 400
+
+    data = client.post(f"{url}/answers", json={"question_index": 1, "answer": "True"}).json()
+    assert data["is_correct"] is False
+    assert client.get(url).json()["correct_count"] == 1
+
+    result = client.post(f"{url}/finish").json()
+    assert result["score"] == 50.0
+    assert [a["answer"] for a in result["answers"]] == ["B", "True"]
+    assert client.get(url).json()["result_id"] == result["id"]
+
+    # Finishing again returns the same result; answering a finished attempt fails
+    assert client.post(f"{url}/finish").json()["id"] == result["id"]
+    late = client.post(f"{url}/answers", json={"question_index": 1, "answer": "False"})
+    assert late.status_code == 409
+    assert client.get(f"/quizzes/{quiz_id}/stats").json()["attempt_count"] == 1
+
+    assert client.post("/quizzes/999999/attempts").status_code == 404
+    assert client.post("/attempts/999999/finish").status_code == 404
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_attempt_answers_from_stale_reads(mock_generator_cls):
+    import json
+
+    from fastapi import HTTPException
+
+    from quli_quiz.api import models, routes, schemas
+
+    quiz_id = create_mock_quiz(mock_generator_cls, topic="Concurrent attempts")
+    attempt_id = client.post(f"/quizzes/{quiz_id}/attempts").json()["id"]
+    url = f"/attempts/{attempt_id}"
+
+    # A request that loaded the attempt before a concurrent answer was committed
+    db = TestingSessionLocal()
+    try:
+        stale = db.get(models.AttemptModel, attempt_id)
+        assert stale.answered_count == 0
+        client.post(f"{url}/answers", json={"question_index": 0, "answer": "B"})
+        response = routes.answer_attempt(
+            attempt_id, schemas.AttemptAnswerSubmit(question_index=1, answer="True"), db
+        )
+        assert json.loads(response.body)["answered_count"] == 2
+    finally:
+        db.close()
+    progress = client.get(url).json()
+    assert (progress["answered_count"], progress["correct_count"]) == (2, 1)
+
+    # An answer graded while the attempt was being finished is not recorded
+    attempt_id = client.post(f"/quizzes/{quiz_id}/attempts").json()["id"]
+    db = TestingSessionLocal()
+    try:
+        stale = db.get(models.AttemptModel, attempt_id)
+        assert stale.status == "in_progress"
+        client.post(f"/attempts/{attempt_id}/finish")
+        with pytest.raises(HTTPException) as error:
+            routes.answer_attempt(
+                attempt_id, schemas.AttemptAnswerSubmit(question_index=0, answer="B"), db
+            )
+        assert error.value.status_code == 409
+    finally:
+        db.close()
+    assert client.get(f"/attempts/{attempt_id}").json()["answered_count"] == 0
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_group_commit_writer(mock_generator_cls):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from quli_quiz.api import group_commit, submissions
+
+    quiz_id = create_mock_quiz(mock_generator_cls, topic="Group Commit")
+    writer = group_commit.GroupCommitWriter(TestingSessionLocal, max_delay=0.05)
+    writer.start()
+    try:
+        graded = [
+            submissions.GradedResult(
+                quiz_id=quiz_id,
+                topic="Group Commit",
+                total_questions=2,
+                answers=[submissions.GradedAnswer(0, "2", True, "easy", 1.0)],
+            )
+            for _ in range(20)
+        ]
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            result_ids = list(pool.map(writer.save, graded))
+        assert len(set(result_ids)) == 20
+
+        with patch.object(group_commit, "writer", writer):
+            response = client.post(
+                f"/quizzes/{quiz_id}/submit",
+                json={"answers": [{"question_index": 0, "answer": "2"}]},
+            )
+        assert response.status_code == 200
+        assert client.get(f"/results/{response.json()['id']}").json()["score"] == 50.0
+    finally:
+        writer.stop()
+
+    assert client.get(f"/quizzes/{quiz_id}/stats").json()["attempt_count"] == 21
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_group_commit_timeouts(mock_generator_cls):
+    import threading
+    import time
+
+    from quli_quiz.api import group_commit, submissions
+
+    quiz_id = create_mock_quiz(mock_generator_cls, topic="Group Commit Timeouts")
+
+    def graded():
+        return submissions.GradedResult(
+            quiz_id=quiz_id,
+            topic="Group Commit Timeouts",
+            total_questions=2,
+            answers=[submissions.GradedAnswer(0, "2", True, "easy", 1.0)],
+        )
+
+    def attempt_count() -> int:
+        return client.get(f"/quizzes/{quiz_id}/stats").json()["attempt_count"]
+
+    # A result still queued when its request gives up is withdrawn, never stored
+    before = attempt_count()
+    writer = group_commit.GroupCommitWriter(TestingSessionLocal)
+    with pytest.raises(TimeoutError):
+        writer.save(graded(), timeout=0.01)
+    writer.start()
+    writer.stop()
+    assert attempt_count() == before
+
+    # A result whose batch is already being written is waited for past the timeout
+    writing = threading.Event()
+    proceed = threading.Event()
+
+    def slow_session():
+        writing.set()
+        proceed.wait()
+        return TestingSessionLocal()
+
+    def release_after_timeout():
+        writing.wait()
+        time.sleep(0.2)
+        proceed.set()
+
+    writer = group_commit.GroupCommitWriter(slow_session)
+    writer.start()
+    try:
+        threading.Thread(target=release_after_timeout).start()
+        result_id = writer.save(graded(), timeout=0.1)
+    finally:
+        writer.stop()
+    assert client.get(f"/results/{result_id}").status_code == 200
+    assert attempt_count() == before + 1
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_answer_key_cache(mock_generator_cls):
+    from sqlalchemy import event
+
+    from quli_quiz.api import models
+    from quli_quiz.api.answer_keys import answer_key_cache
+    from quli_quiz.api.cache import LRUCache
+
+    quiz_id = create_mock_quiz(mock_generator_cls, topic="Hot")
+    submission = {"answers": [{"question_index": 0, "answer": "b"}]}
+    assert client.post(f"/quizzes/{quiz_id}/submit", json=submission).json()["score"] == 50.0
+    assert answer_key_cache.get(quiz_id) is not None
+
+    # A cached quiz is graded without any reads
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert client.post(f"/quizzes/{quiz_id}/submit", json=submission).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert not [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+    # Changing a quiz's questions drops its cached key once committed
+    db = TestingSessionLocal()
+    try:
+        link = db.query(models.QuizQuestionLink).filter_by(quiz_id=quiz_id, position=0).one()
+        link.question.correct_answer = "3"
+        db.flush()
+        assert answer_key_cache.get(quiz_id) is not None
+        db.commit()
+        assert answer_key_cache.get(quiz_id) is None
+        link.question.correct_answer = "2"
+        db.commit()
+    finally:
+        db.close()
+
+    now = [0.0]
+    cache = LRUCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.put("a", 1)
+    now[0] = 9.0
+    assert cache.get("a") == 1
+    now[0] = 10.0
+    assert cache.get("a") is None
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_export_results(mock_generator_cls):
+    import csv
+    import io
+    import json
+    from datetime import timedelta
+
+    from quli_quiz.api import archive, exports, models
+
+    quiz_id = create_mock_quiz(mock_generator_cls, topic="Export Topic")
+    answers = [
+        {"question_index": 0, "answer": "2", "time_taken": 2.0},
+        {"question_index": 1, "answer": "True"},
+    ]
+    archived_id = client.post(f"/quizzes/{quiz_id}/submit", json={"answers": answers}).json()["id"]
+    db = TestingSessionLocal()
+    try:
+        archive.compact_results(db, models.utcnow() + timedelta(seconds=1))
+    finally:
+        db.close()
+    live_id = client.post(f"/quizzes/{quiz_id}/submit", json={"answers": answers[:1]}).json()["id"]
+
+    response = client.get("/exports/results", params={"topic": "export topic"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(r["result_id"], r["question_index"]) for r in rows] == [
+        (archived_id, 0),
+        (archived_id, 1),
+        (live_id, 0),
+    ]
+    assert rows[0]["answer"] == "2"
+    assert rows[0]["is_correct"] is True
+    assert rows[1]["time_taken"] is None
+
+    response = client.get("/exports/results", params={"topic": "Export Topic", "format": "csv"})
+    assert response.headers["content-type"].startswith("text/csv")
+    csv_rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["answer"] for row in csv_rows] == ["2", "True", "2"]
+
+    future = (models.utcnow() + timedelta(days=1)).isoformat()
+    response = client.get("/exports/results", params={"since": future, "format": "csv"})
+    assert response.text.strip() == ",".join(exports.COLUMNS)
+
+
+def test_export_cli_without_schema(tmp_path):
+    """Test that exporting from a database without tables fails cleanly, writing nothing."""
+    from click.testing import CliRunner
+
+    from quli_quiz.cli import export
+
+    empty = sessionmaker(bind=create_engine(f"sqlite:///{tmp_path / 'empty.db'}"))
+    output = tmp_path / "out.ndjson"
+    with patch("quli_quiz.api.database.SessionLocal", empty):
+        result = CliRunner().invoke(export, ["-o", str(output)])
+
+    assert result.exit_code == 1
+    assert "no such table" in result.output
+    assert "--init-db-only" in result.output
+    assert not output.exists()
+
+
+@patch("quli_quiz.api.routes.QuizGenerator")
+def test_trusted_adapters_match_validation(mock_generator_cls):
+    from quli_quiz.api import adapters, models, schemas
+    from quli_quiz.api.responses import dump_json
+
+    quiz_id = create_mock_quiz(mock_generator_cls, topic="Trusted")
+    db = TestingSessionLocal()
+    try:
+        row = db.get(models.QuizModel, quiz_id)
+        validated = Quiz(
+            topic=row.topic,
+            questions=[
+                Question(
+                    question_text=link.question.question_text,
+                    question_type=link.question.question_type,
+                    options=link.question.options,
+                    correct_answer=link.question.correct_answer,
+                    difficulty=link.question.difficulty,
+                    explanation=link.question.explanation,
+                )
+                for link in row.questions
+            ],
+            config=QuizConfig(**row.config),
+        )
+        trusted = adapters.quiz(row)
+        assert trusted == validated
+        assert dump_json(trusted) == dump_json(validated)
+        quiz_read = adapters.quiz_read(row)
+        assert dump_json(quiz_read) == dump_json(schemas.QuizRead.model_validate(quiz_read))
+    finally:
+        db.close()
+
+    # Configs stored before a field existed get its default
+    assert adapters.quiz_config({"topic": "Old"}) == QuizConfig(topic="Old")
+    assert (
+        adapters.quiz_config({"topic": "Old", "difficulty": "hard"}).difficulty is Difficulty.HARD
+    )
@@ -1,6 +1,12 @@
 """Tests for quiz engine."""
 
-from quli_quiz.engine import QuizEngine
+import hashlib
+import json
+
+import pytest
+
+from quli_quiz.checkpoint import Checkpoint, load_checkpoint
+from quli_quiz.engine import QuizEngine, quiz_fingerprint
 from quli_quiz.models import Difficulty, Question, QuestionType, Quiz, QuizConfig
 
 
@@ -68,6 +74,29 @@ def test_get_result():
     assert result.total_questions == 2
 
 
+def test_resubmitted_answer_replaces_previous():
+    """Test that answering a question again overwrites its answer and tallies."""
+    engine = QuizEngine(create_sample_quiz())
+    engine.start()
+
+    engine.submit_answer("3", 0)
+    assert engine.is_answered(0)
+    assert not engine.is_answered(1)
+    assert engine.correct_count == 0
+
+    engine.submit_answer("4", 0)
+    assert engine.get_answer(0).answer == "4"
+    assert engine.answered_count == 1
+    assert engine.correct_count == 1
+    assert engine.current_question_index == 1
+
+    engine.submit_answer("True", 1)
+    result = engine.get_result()
+    assert [a.question_index for a in result.answers] == [0, 1]
+    assert result.correct_answers == 2
+    assert result.score == 100.0
+
+
 def test_answer_validation():
     """Test answer validation logic."""
     quiz = create_sample_quiz()
@@ -86,3 +115,125 @@ def test_answer_validation():
     answer = engine2.submit_answer("4")
     assert answer.is_correct
 
+
+def test_per_question_timing():
+    """Test that each answer is timed from its presentation on a monotonic clock."""
+    now = [100.0]
+    engine = QuizEngine(create_sample_quiz(), clock=lambda: now[0])
+    engine.start()
+
+    now[0] = 103.0
+    engine.present_question()
+    now[0] = 105.0
+    first = engine.submit_answer("4")
+    assert first.time_taken == 2.0
+    assert first.cumulative_time == 5.0
+
+    # Not presented explicitly: timed from the previous answer
+    now[0] = 112.0
+    second = engine.submit_answer("True")
+    assert second.time_taken == 7.0
+    assert second.cumulative_time == 12.0
+    assert engine.get_result().time_taken == 12.0
+
+
+def test_batch_timing():
+    """Test timing of answers chosen earlier and submitted together."""
+    now = [0.0]
+    engine = QuizEngine(create_sample_quiz(), clock=lambda: now[0])
+    engine.start()
+    for index, (shown, answered) in enumerate([(0.0, 4.0), (4.5, 6.0)]):
+        now[0] = shown
+        engine.present_question(index)
+        now[0] = answered
+        engine.mark_answered(index)
+
+    now[0] = 30.0
+    answers = [engine.submit_answer("4", 0), engine.submit_answer("True", 1)]
+    assert [a.time_taken for a in answers] == [4.0, 1.5]
+    assert [a.cumulative_time for a in answers] == [4.0, 6.0]
+
+
+def test_snapshot_and_restore():
+    """Test that a restored engine continues with the same answers and clock."""
+    now = [0.0]
+    quiz = create_sample_quiz()
+    engine = QuizEngine(quiz, clock=lambda: now[0])
+    engine.start()
+    now[0] = 5.0
+    engine.submit_answer("4")
+    snapshot = engine.snapshot()
+
+    now[0] = 1000.0
+    restored = QuizEngine.restore(quiz, snapshot, clock=lambda: now[0])
+    assert restored.answers == engine.answers
+    assert restored.current_question_index == 1
+
+    now[0] = 1003.0
+    answer = restored.submit_answer("True")
+    assert answer.time_taken == 3.0
+    assert answer.cumulative_time == 8.0
+    assert restored.get_result().score == 100.0
+
+    other = create_sample_quiz()
+    other.topic = "Other"
+    with pytest.raises(ValueError):
+        QuizEngine.restore(other, snapshot)
+
+
+def test_quiz_fingerprint():
+    """Test that the quiz digest is stable and covers what sessions share."""
+    quiz = create_sample_quiz()
+    # Pinned: snapshots and checkpoints store it, so it must never change
+    assert quiz_fingerprint(quiz) == (
+        "9c57c291ca72f5d94872166627ab40a5475f433aa6234c7ad24ba55be050bff3"
+    )
+    assert quiz_fingerprint(create_sample_quiz()) == quiz_fingerprint(quiz)
+
+    quiz.questions[0] = quiz.questions[0].model_copy(update={"explanation": "Because."})
+    assert quiz_fingerprint(quiz) != quiz_fingerprint(create_sample_quiz())
+
+
+def test_restore_version_1_snapshot():
+    """Test that snapshots saved before pending time and stable digests still restore."""
+    now = [0.0]
+    quiz = create_sample_quiz()
+    engine = QuizEngine(quiz, clock=lambda: now[0])
+    engine.start()
+    now[0] = 5.0
+    engine.submit_answer("4")
+    state = json.loads(engine.snapshot())
+    state["v"] = 1
+    del state["pending"]
+    state["quiz"] = hashlib.sha256(quiz.model_dump_json().encode()).hexdigest()
+
+    now[0] = 1000.0
+    restored = QuizEngine.restore(quiz, json.dumps(state).encode(), clock=lambda: now[0])
+    now[0] = 1002.0
+    answer = restored.submit_answer("True")
+    assert answer.time_taken == 2.0
+    assert answer.cumulative_time == 7.0
+
+    state["v"] = 99
+    with pytest.raises(ValueError):
+        QuizEngine.restore(quiz, json.dumps(state).encode())
+
+
+def test_checkpoint_file(tmp_path):
+    """Test saving, loading and clearing a checkpoint file."""
+    path = tmp_path / "checkpoint.json"
+    assert load_checkpoint(path) is None
+
+    engine = QuizEngine(create_sample_quiz())
+    engine.start()
+    checkpoint = Checkpoint(engine, path)
+    engine.submit_answer("3")
+    checkpoint.save()
+
+    restored = load_checkpoint(path)
+    assert restored.quiz == engine.quiz
+    assert [a.answer for a in restored.answers] == ["3"]
+    assert not restored.is_complete()
+
+    checkpoint.clear()
+    assert not path.exists()
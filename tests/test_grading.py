@@ -0,0 +1,97 @@
+"""Tests for answer grading."""
+
+from quli_quiz.grading import (
+    MULTIPLE_CHOICE,
+    TRUE_FALSE,
+    UNANSWERED,
+    UNKNOWN,
+    AnswerKey,
+    compile_question,
+    grade_batch,
+)
+from quli_quiz.models import Difficulty, Question, QuestionType, Quiz, QuizConfig
+
+
+def test_multiple_choice_aliases():
+    """Test that the answer, its letter and its number are accepted."""
+    question = compile_question("multiple_choice", ["Paris", "Rome", "Oslo"], " rome ", "easy")
+    assert question.type_code == MULTIPLE_CHOICE
+    assert question.correct_option == 1
+    for answer in ["Rome", "ROME ", "b", "B", "2"]:
+        assert question.is_correct(answer)
+    for answer in ["Paris", "a", "1", "c", ""]:
+        assert not question.is_correct(answer)
+
+
+def test_numeric_options_have_no_number_aliases():
+    """Test that numbers are not aliases when options are numbers themselves."""
+    question = compile_question("multiple_choice", ["3", "4", "5", "6"], "4", "easy")
+    assert question.is_correct("4")
+    assert question.is_correct("b")
+    assert not question.is_correct("2")
+
+
+def test_true_false_and_answer_key():
+    """Test true/false grading through a compiled quiz."""
+    quiz = Quiz(
+        topic="Test",
+        config=QuizConfig(topic="Test", num_questions=1),
+        questions=[
+            Question(
+                question_text="Python is a programming language.",
+                question_type=QuestionType.TRUE_FALSE,
+                options=["True", "False"],
+                correct_answer="True",
+                difficulty=Difficulty.MEDIUM,
+            )
+        ],
+    )
+    key = AnswerKey.from_quiz(quiz)
+    assert len(key) == 1
+    assert key.questions[0].type_code == TRUE_FALSE
+    assert key.questions[0].difficulty == "medium"
+    assert key.is_correct(0, "true")
+    assert not key.is_correct(0, "a")
+
+
+def test_grade_batch():
+    """Test bulk grading against per-answer grading."""
+    quiz = Quiz(
+        topic="Test",
+        config=QuizConfig(topic="Test", num_questions=2),
+        questions=[
+            Question(
+                question_text="What is 2+2?",
+                question_type=QuestionType.MULTIPLE_CHOICE,
+                options=["3", "4", "5", "6"],
+                correct_answer="4",
+                difficulty=Difficulty.EASY,
+            ),
+            Question(
+                question_text="Python is a programming language.",
+                question_type=QuestionType.TRUE_FALSE,
+                options=["True", "False"],
+                correct_answer="True",
+                difficulty=Difficulty.HARD,
+            ),
+        ],
+    )
+    sheets = [["4", "true"], ["b", "False"], ["x", None], ["3"], []]
+    grades = grade_batch(quiz, sheets)
+
+    key = AnswerKey.from_quiz(quiz)
+    expected = [
+        [answer is not None and key.is_correct(i, answer) for i, answer in enumerate(sheet)]
+        + [False] * (2 - len(sheet))
+        for sheet in sheets
+    ]
+    assert grades.correct.tolist() == expected
+    assert grades.codes[2].tolist() == [UNKNOWN, UNANSWERED]
+    assert grades.scores.tolist() == [100.0, 50.0, 0.0, 0.0, 0.0]
+    assert grades.answered_counts.tolist() == [4, 2]
+    assert grades.question_accuracy.tolist() == [50.0, 50.0]
+    assert grades.difficulty_accuracy == {"easy": 50.0, "hard": 50.0}
+
+    # Pre-encoded option codes grade the same
+    again = grade_batch(key, grades.codes)
+    assert again.correct.tolist() == expected
@@ -0,0 +1,138 @@
+"""Tests for upgrading databases created by earlier releases."""
+
+import json
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from quli_quiz.api import adapters, models
+from quli_quiz.api.database import init_db
+from quli_quiz.api.search import search_questions
+
+# The schema of the first release, as created by its models
+BASELINE_SCHEMA = [
+    """CREATE TABLE questions (id INTEGER NOT NULL, question_text VARCHAR,
+    question_type VARCHAR, options JSON, correct_answer VARCHAR, difficulty VARCHAR,
+    explanation VARCHAR, PRIMARY KEY (id))""",
+    "CREATE INDEX ix_questions_id ON questions (id)",
+    "CREATE INDEX ix_questions_question_text ON questions (question_text)",
+    "CREATE TABLE quizzes (id INTEGER NOT NULL, topic VARCHAR, config JSON, PRIMARY KEY (id))",
+    "CREATE INDEX ix_quizzes_id ON quizzes (id)",
+    "CREATE INDEX ix_quizzes_topic ON quizzes (topic)",
+    """CREATE TABLE quiz_question_links (quiz_id INTEGER NOT NULL,
+    question_id INTEGER NOT NULL, PRIMARY KEY (quiz_id, question_id),
+    FOREIGN KEY(quiz_id) REFERENCES quizzes (id),
+    FOREIGN KEY(question_id) REFERENCES questions (id))""",
+    """CREATE TABLE quiz_results (id INTEGER NOT NULL, quiz_id INTEGER, score FLOAT,
+    total_questions INTEGER, correct_answers INTEGER, time_taken FLOAT, PRIMARY KEY (id),
+    FOREIGN KEY(quiz_id) REFERENCES quizzes (id))""",
+    "CREATE INDEX ix_quiz_results_id ON quiz_results (id)",
+    """CREATE TABLE user_answers (id INTEGER NOT NULL, result_id INTEGER,
+    question_index INTEGER, answer VARCHAR, is_correct BOOLEAN, time_taken FLOAT,
+    PRIMARY KEY (id), FOREIGN KEY(result_id) REFERENCES quiz_results (id))""",
+    "CREATE INDEX ix_user_answers_id ON user_answers (id)",
+]
+
+
+def _question(question_id: int, text: str) -> dict:
+    return {
+        "id": question_id,
+        "question_text": text,
+        "question_type": "true_false",
+        "options": json.dumps(["True", "False"]),
+        "correct_answer": "True",
+        "difficulty": "easy",
+        "explanation": None,
+    }
+
+
+@pytest.fixture
+def baseline_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    config = json.dumps({"topic": "Space", "num_questions": 2})
+    with engine.begin() as connection:
+        for statement in BASELINE_SCHEMA:
+            connection.exec_driver_sql(statement)
+        connection.execute(
+            text(
+                "INSERT INTO questions VALUES (:id, :question_text, :question_type, :options,"
+                " :correct_answer, :difficulty, :explanation)"
+            ),
+            [
+                _question(1, "The Moon orbits the Earth."),
+                _question(2, "Mars is red."),
+                _question(3, "the moon  orbits the earth."),  # Duplicate of 1
+                _question(4, "Venus is hot."),
+            ],
+        )
+        connection.execute(
+            text("INSERT INTO quizzes VALUES (:id, 'Space', :config)"),
+            [{"id": 1, "config": config}, {"id": 2, "config": config}],
+        )
+        # Inserted out of id order: quizzes were served in question id order regardless
+        connection.execute(
+            text("INSERT INTO quiz_question_links VALUES (:quiz_id, :question_id)"),
+            [
+                {"quiz_id": 1, "question_id": 2},
+                {"quiz_id": 1, "question_id": 1},
+                {"quiz_id": 2, "question_id": 4},
+                {"quiz_id": 2, "question_id": 3},
+            ],
+        )
+        connection.exec_driver_sql("INSERT INTO quiz_results VALUES (1, 1, 50.0, 2, 1, 12.0)")
+        connection.exec_driver_sql(
+            "INSERT INTO user_answers VALUES (1, 1, 0, 'True', 1, 6.0), (2, 1, 1, 'x', 0, 6.0)"
+        )
+    yield engine
+    engine.dispose()
+
+
+def test_init_db_upgrades_baseline_schema(baseline_engine):
+    """Test that an old database is upgraded in place, keeping its data."""
+    init_db(bind=baseline_engine)
+    init_db(bind=baseline_engine)  # Upgrading is idempotent
+
+    inspector = inspect(baseline_engine)
+    assert "content_hash" in {c["name"] for c in inspector.get_columns("quizzes")}
+    assert "created_at" in {c["name"] for c in inspector.get_columns("quiz_results")}
+    assert inspector.get_pk_constraint("quiz_question_links")["constrained_columns"] == [
+        "quiz_id",
+        "position",
+    ]
+    question_indexes = {index["name"]: index for index in inspector.get_indexes("questions")}
+    assert "ix_questions_question_text" not in question_indexes
+    assert question_indexes["ix_questions_content_hash"]["unique"]
+
+    with Session(baseline_engine) as db:
+        quizzes = {row.id: adapters.quiz(row) for row in db.query(models.QuizModel)}
+        assert [q.question_text for q in quizzes[1].questions] == [
+            "The Moon orbits the Earth.",
+            "Mars is red.",
+        ]
+        # The duplicate question was merged into the first copy, keeping its position
+        assert [q.question_text for q in quizzes[2].questions] == [
+            "The Moon orbits the Earth.",
+            "Venus is hot.",
+        ]
+        assert db.query(models.QuestionModel).count() == 3
+        assert all(row.content_hash for row in db.query(models.QuestionModel))
+
+        result = db.get(models.QuizResultModel, 1)
+        assert result.created_at is None
+        assert len(result.answers) == 2
+
+        hits = search_questions(db, "moon")
+        assert [row.id for row, _ in hits] == [1]
+
+
+def test_init_db_on_current_schema_is_noop(tmp_path):
+    """Test that upgrading a freshly created database changes nothing."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+    init_db(bind=engine)
+    schema = engine.connect().exec_driver_sql("SELECT sql FROM sqlite_master").all()
+
+    init_db(bind=engine)
+
+    assert engine.connect().exec_driver_sql("SELECT sql FROM sqlite_master").all() == schema
+    engine.dispose()
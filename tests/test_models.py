@@ -113,3 +113,71 @@ def test_quiz_result():
     assert result.correct_answers == 1
     assert result.total_questions == 2
 
+
+def test_question_fingerprint():
+    """Test the stable content fingerprint of a question."""
+    question = Question(
+        question_text="What is 2+2?",
+        question_type=QuestionType.MULTIPLE_CHOICE,
+        options=["3", "4", "5", "6"],
+        correct_answer="4",
+        difficulty=Difficulty.EASY,
+    )
+
+    # Pinned: fingerprints key stored rows, so they must never change
+    assert question.fingerprint() == (
+        "24e2ebd88456ff960133d9d4eb55865c1ce43519d7c4d18154f5b08365ac2424"
+    )
+    same = question.model_copy(
+        update={
+            "question_text": "  what IS   2+2? ",
+            "difficulty": Difficulty.HARD,
+            "explanation": "Arithmetic.",
+        }
+    )
+    assert same.fingerprint() == question.fingerprint()
+    assert same != question
+
+    reordered = question.model_copy(update={"options": ["4", "3", "5", "6"]})
+    assert reordered.fingerprint() != question.fingerprint()
+
+
+def test_fingerprint_cache():
+    """Test that the cached fingerprint follows assignments and leaves equality alone."""
+    question = Question(
+        question_text="Is water wet?",
+        question_type=QuestionType.TRUE_FALSE,
+        options=["True", "False"],
+        correct_answer="True",
+        difficulty=Difficulty.EASY,
+    )
+    fresh = question.model_copy()
+    fingerprint = question.fingerprint()
+
+    assert question == fresh
+    assert question.model_dump() == fresh.model_dump()
+
+    question.correct_answer = "False"
+    assert question.fingerprint() != fingerprint
+
+
+def test_quiz_config_fingerprint():
+    """Test the stable content fingerprint of a quiz config."""
+    config = QuizConfig(topic="Python", num_questions=5)
+
+    assert config.fingerprint() == (
+        "a0fcb6b9496e065eaf79716afc8a0c18e00ae5810e96a9f56959f20bf04db1e3"
+    )
+    same = QuizConfig(
+        topic=" python ",
+        question_types=[QuestionType.TRUE_FALSE, QuestionType.MULTIPLE_CHOICE],
+    )
+    assert same.fingerprint() == config.fingerprint()
+
+    for other in (
+        QuizConfig(topic="Python", num_questions=6),
+        QuizConfig(topic="Python", difficulty=Difficulty.EASY),
+        QuizConfig(topic="Python", question_types=[QuestionType.TRUE_FALSE]),
+        QuizConfig(topic="Rust"),
+    ):
+        assert other.fingerprint() != config.fingerprint()
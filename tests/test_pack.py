@@ -0,0 +1,64 @@
+"""Tests for packed question pools."""
+
+import random
+
+import pytest
+
+from quli_quiz.models import Difficulty, Question, QuestionType
+from quli_quiz.pack import QuestionPack
+
+
+def create_questions() -> list[Question]:
+    """Create questions sharing some strings."""
+    return [
+        Question(
+            question_text="Capital of France?",
+            question_type=QuestionType.MULTIPLE_CHOICE,
+            options=["Paris", "Rome", "Oslo", "Bern"],
+            correct_answer="Paris",
+            difficulty=Difficulty.EASY,
+            explanation="Paris has been the capital since 987.",
+        ),
+        Question(
+            question_text="Oslo is in Norway.",
+            question_type=QuestionType.TRUE_FALSE,
+            options=["True", "False"],
+            correct_answer="True",
+            difficulty=Difficulty.MEDIUM,
+        ),
+        Question(
+            question_text="Ünïcode café?",
+            question_type=QuestionType.MULTIPLE_CHOICE,
+            options=["Rome", "Oslo", ""],
+            correct_answer="Oslo",
+            difficulty=Difficulty.HARD,
+        ),
+    ]
+
+
+def test_pack_round_trip():
+    """Test that packed questions are materialized unchanged."""
+    questions = create_questions()
+    pack = QuestionPack.from_questions(questions)
+    assert len(pack) == 3
+    assert list(pack) == questions
+    assert pack[-1] == questions[-1]
+    assert pack[1:] == questions[1:]
+    with pytest.raises(IndexError):
+        pack[3]
+
+    empty = QuestionPack.from_questions([])
+    assert len(empty) == 0
+    assert list(empty) == []
+
+
+def test_pack_select_and_sample():
+    """Test filtering and sampling packed questions."""
+    pack = QuestionPack.from_questions(create_questions())
+    assert pack.select(question_types=[QuestionType.MULTIPLE_CHOICE]).tolist() == [0, 2]
+    assert pack.select(difficulty=Difficulty.MEDIUM).tolist() == [1]
+
+    sample = pack.sample(2, question_types=[QuestionType.MULTIPLE_CHOICE], rng=random.Random(0))
+    assert sorted(q.question_text for q in sample) == ["Capital of France?", "Ünïcode café?"]
+    with pytest.raises(ValueError):
+        pack.sample(2, difficulty=Difficulty.HARD)
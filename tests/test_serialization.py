@@ -0,0 +1,157 @@
+"""Tests for the binary encoding of questions, quizzes and results."""
+
+import struct
+
+import pytest
+
+from quli_quiz import serialization
+from quli_quiz.models import (
+    Difficulty,
+    Question,
+    QuestionType,
+    Quiz,
+    QuizConfig,
+    QuizResult,
+    UserAnswer,
+)
+
+
+def create_quiz() -> Quiz:
+    """Create a quiz with shared, missing and non-ASCII strings."""
+    return Quiz(
+        topic="Géographie",
+        questions=[
+            Question(
+                question_text="Capital of France?",
+                question_type=QuestionType.MULTIPLE_CHOICE,
+                options=["Paris", "Rome", "Oslo", "Bern"],
+                correct_answer="Paris",
+                difficulty=Difficulty.EASY,
+                explanation="Paris has been the capital since 987.",
+            ),
+            Question(
+                question_text="Oslo is in Norway.",
+                question_type=QuestionType.TRUE_FALSE,
+                options=["True", "False"],
+                correct_answer="True",
+                difficulty=Difficulty.MEDIUM,
+            ),
+            Question(
+                question_text="Ünïcode café? 🌍",
+                question_type=QuestionType.TRUE_FALSE,
+                options=["True", "False"],
+                correct_answer="False",
+                difficulty=Difficulty.HARD,
+                explanation="",
+            ),
+        ],
+        config=QuizConfig(topic="Géographie", num_questions=3),
+    )
+
+
+def create_result() -> QuizResult:
+    """Create a result with timed, untimed and off-list answers."""
+    return QuizResult(
+        quiz=create_quiz(),
+        answers=[
+            UserAnswer(
+                question_index=0,
+                answer="Paris",
+                is_correct=True,
+                time_taken=1.25,
+                cumulative_time=1.25,
+            ),
+            UserAnswer(question_index=1, answer="yes", is_correct=False),
+            UserAnswer(question_index=2, answer="False", is_correct=True, time_taken=0.1),
+        ],
+        score=66.66666666666667,
+        total_questions=3,
+        correct_answers=2,
+    )
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [create_quiz().questions[0], create_quiz().questions[1], create_quiz(), create_result()],
+)
+def test_round_trip(obj):
+    """Test that decoding returns an equal model of the same type."""
+    decoded = serialization.loads(serialization.dumps(obj))
+
+    assert type(decoded) is type(obj)
+    assert decoded == obj
+    assert decoded.model_dump_json() == obj.model_dump_json()
+
+
+def test_round_trip_config_variants():
+    """Test fixed difficulty and restricted question types."""
+    quiz = create_quiz()
+    quiz.config = QuizConfig(
+        topic="Other",
+        num_questions=50,
+        difficulty=Difficulty.HARD,
+        question_types=[QuestionType.TRUE_FALSE],
+    )
+
+    assert serialization.loads(serialization.dumps(quiz)) == quiz
+
+
+def test_round_trip_empty_quiz():
+    """Test a quiz without questions and a result without answers."""
+    result = create_result()
+    result.quiz.questions = []
+    result.answers = []
+    result.time_taken = 0.0
+
+    assert serialization.loads(serialization.dumps(result)) == result
+
+
+def test_round_trip_many_strings():
+    """Test messages needing 4-byte string indexes."""
+    question = create_quiz().questions[0]
+    quiz = Quiz(
+        topic="Big",
+        questions=[
+            question.model_copy(update={"options": [f"{i}-{c}" for c in "abcd"]})
+            for i in range(20000)
+        ],
+        config=QuizConfig(topic="Big"),
+    )
+
+    data = serialization.dumps(quiz)
+
+    assert data[5] == 4
+    assert serialization.loads(data) == quiz
+
+
+def test_strings_are_stored_once():
+    """Test that repeated strings are interned and smaller than JSON."""
+    quiz = create_quiz()
+    quiz.questions = [quiz.questions[1]] * 100
+
+    data = serialization.dumps(quiz)
+
+    assert data.count(b"Oslo is in Norway.") == 1
+    assert len(data) < len(quiz.model_dump_json()) / 4
+
+
+def test_rejects_foreign_data():
+    """Test errors for bad magic, versions, kinds and truncation."""
+    data = serialization.dumps(create_result())
+
+    with pytest.raises(ValueError, match="Not a quli"):
+        serialization.loads(b"XYZ" + data[3:])
+    with pytest.raises(ValueError, match="version 99"):
+        serialization.loads(data[:3] + struct.pack("B", 99) + data[4:])
+    with pytest.raises(ValueError, match="kind"):
+        serialization.loads(data[:4] + struct.pack("B", 9) + data[5:])
+    with pytest.raises(ValueError, match="Truncated"):
+        serialization.loads(data[:8])
+    with pytest.raises(ValueError, match="Corrupt"):
+        serialization.loads(data[:-10])
+
+
+def test_dumps_rejects_other_types():
+    """Test that only questions, quizzes and results are encoded."""
+    with pytest.raises(TypeError):
+        serialization.dumps(create_quiz().config)
@@ -0,0 +1,121 @@
+"""Tests for the quiz session manager."""
+
+import threading
+
+import pytest
+
+from quli_quiz.sessions import DirectorySessionStore, MemorySessionStore, SessionManager
+from tests.test_engine import create_sample_quiz
+
+
+def test_spill_and_restore(tmp_path):
+    """Test that sessions over the cap are spilled and restored with their progress."""
+    now = [0.0]
+    manager = SessionManager(
+        max_live=1, store=DirectorySessionStore(tmp_path), clock=lambda: now[0]
+    )
+    first = manager.create(create_sample_quiz())
+    with manager.session(first) as engine:
+        now[0] = 2.0
+        engine.submit_answer("4")
+
+    now[0] = 3.0
+    second = manager.create(create_sample_quiz())
+    metrics = manager.metrics()
+    assert (metrics.live, metrics.spilled, metrics.quizzes) == (1, 1, 1)
+    assert (tmp_path / f"{first}.json").exists()
+
+    now[0] = 10.0
+    with manager.session(first) as engine:
+        assert engine.answered_count == 1
+        answer = engine.submit_answer("True")
+    # Time spent spilled still counts
+    assert answer.time_taken == 8.0
+    assert answer.cumulative_time == 10.0
+    assert engine.get_result().score == 100.0
+
+    metrics = manager.metrics()
+    assert (metrics.spills, metrics.restores, metrics.live) == (2, 1, 1)
+    assert second in manager
+
+    manager.close(first)
+    manager.close(second)
+    assert len(manager) == 0
+    assert manager.metrics().quizzes == 0
+    assert list(tmp_path.iterdir()) == []
+    with pytest.raises(KeyError), manager.session(first):
+        pass
+
+
+def test_idle_sessions_expire():
+    """Test that sessions unused for longer than the idle TTL are discarded."""
+    now = [0.0]
+    manager = SessionManager(idle_ttl=60.0, clock=lambda: now[0], sweep_interval=30.0)
+    idle = manager.create(create_sample_quiz())
+    now[0] = 50.0
+    active = manager.create(create_sample_quiz())
+
+    # Swept at most every 30s: the last sweep ran when the second session was created
+    now[0] = 85.0
+    with manager.session(active):
+        pass
+    assert idle not in manager
+    assert active in manager
+    assert manager.metrics().expired == 1
+
+
+def test_calls_on_a_session_are_serialized():
+    """Test that concurrent answers to one session are applied one at a time."""
+    manager = SessionManager()
+    session_id = manager.create(create_sample_quiz())
+
+    def answer(index: int) -> None:
+        for _ in range(200):
+            with manager.session(session_id) as engine:
+                engine.submit_answer("4" if index == 0 else "True", index)
+
+    threads = [threading.Thread(target=answer, args=(i % 2,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with manager.session(session_id) as engine:
+        assert engine.answered_count == 2
+        assert engine.correct_count == 2
+    assert manager.metrics().in_use == 0
+
+
+def test_store_io_does_not_block_other_sessions():
+    """Test that a slow spill only holds up the session being spilled."""
+
+    class SlowStore(MemorySessionStore):
+        def __init__(self):
+            super().__init__()
+            self.saving = threading.Event()
+            self.release = threading.Event()
+
+        def save(self, session_id: str, snapshot: bytes) -> None:
+            self.saving.set()
+            assert self.release.wait(5)
+            super().save(session_id, snapshot)
+
+    store = SlowStore()
+    manager = SessionManager(max_live=1, store=store)
+    first = manager.create(create_sample_quiz())
+    spiller = threading.Thread(target=manager.create, args=(create_sample_quiz(),))
+    spiller.start()
+    try:
+        assert store.saving.wait(5)
+        # The manager lock is free while the first session is being saved
+        assert len(manager) == 2
+        assert manager.metrics().spills == 0
+        assert first in manager
+    finally:
+        store.release.set()
+        spiller.join()
+
+    with manager.session(first) as engine:
+        assert engine.answered_count == 0
+    assert manager.metrics().spills == 2
+    assert manager.metrics().restores == 1